@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Optional, Self
 
 from src.apps.ads.application.helpers import create_image_url
+from src.apps.ads.infrastructure.images.storage import is_stored, webp_url
 from src.apps.ads import domain
 from src.core.application.dto import DTO
 
@@ -16,10 +17,25 @@ class AdDTO(DTO):
     title: str = None
     description: str = None
     image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     status: str = None
     category: str = None
     condition: str = None
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @property
+    def thumbnail_webp_url(self) -> Optional[str]:
+        return webp_url(self.thumbnail_url)
+
+    @property
+    def preview_url(self) -> Optional[str]:
+        """Card image: the thumbnail, or an external image we do not host."""
+        if self.thumbnail_url:
+            return self.thumbnail_url
+        if self.image_url and not is_stored(self.image_url):
+            return self.image_url
+        return None
 
     @classmethod
     def from_entity(cls, instance: domain.Ad) -> Self:
@@ -30,10 +46,12 @@ class AdDTO(DTO):
             title=instance.title,
             description=instance.description,
             image_url=instance.image_url,
+            thumbnail_url=instance.thumbnail_url,
             category=str(instance.category),
             status=str(instance.status),
             condition=str(instance.condition),
             created_at=instance.created_at,
+            updated_at=instance.updated_at,
         )
 
     @classmethod
@@ -49,12 +67,14 @@ class CreateAdDTO(DTO):
     category: str = "other"
     condition: str = "used"
     status: str = "active"
+    username: Optional[str] = None
 
     @classmethod
     def from_request(cls, request) -> Self:
         img = request.FILES.get("image")
         return cls(
             user_id=request.user.id,
+            username=request.user.username,
             title=request.POST.get("title"),
             description=request.POST.get("description"),
             image_url=create_image_url(img) if img else None,
@@ -99,3 +119,6 @@ class AdFilterDTO:
     condition: Optional[str] = None
     status: Optional[str] = "active"
     user_id: Optional[UUID] = None
+    search_mode: str = str(domain.SearchMode.RANKED)
+    cursor: Optional[str] = None
+    with_facets: bool = False
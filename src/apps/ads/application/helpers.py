@@ -1,13 +1,9 @@
-import os
-from uuid6 import uuid7
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
-from django.conf import settings
+from src.apps.ads.infrastructure.images.storage import image_path, save_image
+from src.apps.ads.infrastructure.repository.image_repo import ImageRepository
 
-def create_image_url(img):
-    file_name = f"{uuid7()}{os.path.splitext(img.name)[1]}"
-    path = f'ad_images/{file_name}'
-
-    default_storage.save(path, ContentFile(img.read()))
 
-    return os.path.join(settings.MEDIA_URL, path)
\ No newline at end of file
+def create_image_url(img):
+    path = image_path(img)
+    # registered first, so a collection of the same content finishes before the write
+    ImageRepository.register(path, img.size)
+    return save_image(img, path)
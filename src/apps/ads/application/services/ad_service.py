@@ -1,15 +1,36 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import partial
 from datetime import datetime, UTC
 from typing import Optional, Iterable
 
+from django.db import transaction
 from uuid6 import UUID
 
 from src.apps.ads import domain
+from src.apps.ads.infrastructure.images.pipeline import ImagePipeline
+from src.apps.ads.infrastructure.images.storage import is_stored
 from src.apps.ads.infrastructure.repository.ad_repo import AdRepository
+from src.apps.ads.infrastructure.repository.count import AdCounter
+from src.apps.ads.infrastructure.repository.facets import AdFacets
+from src.apps.ads.infrastructure.repository.image_repo import ImageRepository
+from src.apps.ads.infrastructure.repository.stats import AdStats
 from src.apps.ads.infrastructure.database import models
 from src.apps.ads.application.dto.ad import CreateAdDTO, UpdateAdDTO, AdFilterDTO, AdDTO
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
+from src.apps.exchanges.infrastructure.repository.stats import ExchangeStats
+from src.core.infrastructure.counters import CounterRepository, merge_deltas
 from src.core.infrastructure.exceptions import NotFoundError
 from src.core.application.exceptions import PermissionDeniedError
+from src.core.application.pagination import decode_cursor, encode_cursor
+
+# Columns an owner's edit writes; image_url and thumbnail_url only go along
+# when the image changes, so a thumbnail rendered meanwhile is kept
+EDITABLE_FIELDS = ("title", "description", "category", "condition", "status")
+IMAGE_FIELDS = ("image_url", "thumbnail_url")
+
+# Deeper keyset listings are only reachable through cursor links; relevance
+# ordered searches have no cursor, so they keep plain offset paging
+MAX_OFFSET_PAGE = 20
 
 
 @dataclass
@@ -18,6 +39,7 @@ class AdService:
     def create_ad(ad_dto: CreateAdDTO) -> AdDTO:
         ad = domain.Ad(
             user_id=ad_dto.user_id,
+            owner_username=ad_dto.username,
             title=ad_dto.title,
             description=ad_dto.description,
             image_url=ad_dto.image_url,
@@ -26,63 +48,133 @@ class AdService:
             status=domain.ItemStatus(ad_dto.status),
         )
 
-        return AdDTO.from_entity(AdRepository.create(ad))
+        with transaction.atomic():
+            created = AdRepository.create(ad)
+            CounterRepository.increment(AdStats.deltas(created))
+            ImageRepository.move_reference(None, created.image_url)
+            AdService.schedule_thumbnail(created)
+
+        return AdDTO.from_entity(created)
 
     @staticmethod
     def update_ad(ad_dto: UpdateAdDTO) -> AdDTO:
-        existing_ad: domain.Ad = AdRepository.find_by_id(ad_dto.ad_id)
-        if not existing_ad:
-            raise NotFoundError(str(ad_dto.ad_id))
-
-        if not existing_ad.is_owner(ad_dto.user_id):
-            raise PermissionDeniedError("Only the author of the ad can update it")
-
-        updated_ad = domain.Ad(
-            id=existing_ad.id,
-            user_id=existing_ad.user_id,
-            title=ad_dto.title or existing_ad.title,
-            owner_username=existing_ad.owner_username,
-            description=ad_dto.description or existing_ad.description,
-            image_url=ad_dto.image_url or existing_ad.image_url,
-            category=domain.ItemCategory(ad_dto.category or existing_ad.category),
-            condition=domain.ItemCondition(ad_dto.condition or existing_ad.condition),
-            created_at=existing_ad.created_at,
-            updated_at=datetime.now(UTC),
-        )
+        # the counter deltas are computed from existing_ad, so it must not
+        # change under us before the update commits
+        with transaction.atomic():
+            existing_ad: domain.Ad = AdRepository.lock_for_update(ad_dto.ad_id)
+            if not existing_ad:
+                raise NotFoundError(str(ad_dto.ad_id))
+
+            if not existing_ad.is_owner(ad_dto.user_id):
+                raise PermissionDeniedError("Only the author of the ad can update it")
+
+            # a re-upload of the same image gets the same content-addressed URL
+            image_url = ad_dto.image_url or existing_ad.image_url
+            image_changed = image_url != existing_ad.image_url
+
+            updated_ad = domain.Ad(
+                id=existing_ad.id,
+                user_id=existing_ad.user_id,
+                title=ad_dto.title or existing_ad.title,
+                owner_username=existing_ad.owner_username,
+                description=ad_dto.description or existing_ad.description,
+                image_url=image_url,
+                thumbnail_url=None if image_changed else existing_ad.thumbnail_url,
+                category=domain.ItemCategory(ad_dto.category or existing_ad.category),
+                condition=domain.ItemCondition(ad_dto.condition or existing_ad.condition),
+                created_at=existing_ad.created_at,
+                updated_at=datetime.now(UTC),
+            )
+
+            fields = EDITABLE_FIELDS
+            if image_changed:
+                fields += IMAGE_FIELDS
 
-        return AdDTO.from_entity(AdRepository.update(updated_ad))
+            saved_ad = AdRepository.update(updated_ad, fields=fields)
+            if saved_ad.title != existing_ad.title:
+                InboxRepository.rename_item(saved_ad.id, saved_ad.title)
+            CounterRepository.increment(AdStats.change(existing_ad, saved_ad))
+            ImageRepository.move_reference(existing_ad.image_url, saved_ad.image_url)
+            AdService.schedule_thumbnail(saved_ad)
+
+        return AdDTO.from_entity(saved_ad)
 
     @staticmethod
     def update_ad_status(ad_id: UUID, status: domain.ItemStatus) -> AdDTO:
-        existing_ad: domain.Ad = AdRepository.find_by_id(ad_id)
-        if not existing_ad:
-            raise NotFoundError(str(ad_id))
+        with transaction.atomic():
+            existing_ad: domain.Ad = AdRepository.lock_for_update(ad_id)
+            if not existing_ad:
+                raise NotFoundError(str(ad_id))
 
-        existing_ad.status = status
+            updated = AdRepository.update(
+                replace(existing_ad, status=status), fields=("status",)
+            )
+            CounterRepository.increment(AdStats.change(existing_ad, updated))
 
-        return AdDTO.from_entity(AdRepository.update(existing_ad))
+        return AdDTO.from_entity(updated)
 
     @staticmethod
     def delete_ad(ad_id: UUID, user_id: UUID) -> bool:
-        existing_ad = AdRepository.find_by_id(ad_id)
-        if not existing_ad:
-            raise NotFoundError(f"Ad with ID {ad_id} not found")
+        with transaction.atomic():
+            existing_ad = AdRepository.lock_for_update(ad_id)
+            if not existing_ad:
+                raise NotFoundError(f"Ad with ID {ad_id} not found")
+
+            if not existing_ad.is_owner(user_id):
+                raise PermissionDeniedError("Only the author of the ad can update it")
+
+            # exchanges involving the ad are deleted with it
+            deltas = merge_deltas(
+                AdStats.deltas(existing_ad, -1),
+                ExchangeStats.from_entries(InboxRepository.entries_for_ad(ad_id)),
+            )
+            deleted = AdRepository.delete(ad_id)
+            CounterRepository.increment(deltas)
+            ImageRepository.move_reference(existing_ad.image_url, None)
+
+        return deleted
 
-        if not existing_ad.is_owner(user_id):
-            raise PermissionDeniedError("Only the author of the ad can update it")
+    @staticmethod
+    def schedule_thumbnail(ad: domain.Ad) -> None:
+        """Queues thumbnail rendering for a new image once the ad row is committed."""
+        if is_stored(ad.image_url) and not ad.thumbnail_url:
+            transaction.on_commit(partial(ImagePipeline.submit, ad.id, ad.image_url))
 
-        return AdRepository.delete(ad_id)
+    @staticmethod
+    def get_ad(ad_id: UUID, use_cache: bool = True) -> Optional[AdDTO]:
+        ad = AdRepository.find_by_id(ad_id, use_cache=use_cache)
+        if not ad:
+            raise NotFoundError(f"Ad with ID {ad_id} not found")
+        return AdDTO.from_entity(ad)
 
     @staticmethod
-    def get_ad(ad_id: UUID) -> Optional[AdDTO]:
-        ad = AdRepository.find_by_id(ad_id)
+    async def aget_ad(ad_id: UUID) -> Optional[AdDTO]:
+        ad = await AdRepository.afind_by_id(ad_id)
         if not ad:
             raise NotFoundError(f"Ad with ID {ad_id} not found")
         return AdDTO.from_entity(ad)
 
     @staticmethod
-    def get_user_ads(user_id: UUID) -> list[AdDTO]:
-        user_ads = AdRepository.find_user_ads(user_id=user_id)
+    def get_ad_last_modified(ad_id: UUID) -> Optional[datetime]:
+        # read fresh: it decides whether a cached copy of the ad is current
+        return AdRepository.last_modified(ad_id=ad_id, use_cache=False)
+
+    @staticmethod
+    def get_ads_last_modified(user_id: Optional[UUID] = None) -> Optional[datetime]:
+        return AdRepository.last_modified(user_id=user_id)
+
+    @staticmethod
+    def get_user_ads(user_id: UUID, limit: Optional[int] = None) -> list[AdDTO]:
+        user_ads = AdRepository.find_user_ads(user_id=user_id, limit=limit)
+        if not user_ads:
+            raise NotFoundError(f"Ads with user ID {user_id} not found")
+        return [AdDTO.from_entity(ad) for ad in user_ads]
+
+    @staticmethod
+    async def aget_user_ads(
+        user_id: UUID, limit: Optional[int] = None
+    ) -> list[AdDTO]:
+        user_ads = await AdRepository.afind_user_ads(user_id=user_id, limit=limit)
         if not user_ads:
             raise NotFoundError(f"Ads with user ID {user_id} not found")
         return [AdDTO.from_entity(ad) for ad in user_ads]
@@ -95,24 +187,87 @@ class AdService:
             status=filter.status,
             keyword=filter.keyword,
             user_id=filter.user_id,
+            search_mode=filter.search_mode,
         )
 
-        start = (filter.page - 1) * filter.page_size
-        end = start + filter.page_size
+        cursor = decode_cursor(filter.cursor)
+        keyset = AdService.supports_keyset(filter)
+
+        if cursor and keyset:
+            window = list(
+                AdRepository.seek(
+                    ads_query, cursor.created_at, cursor.id, backwards=cursor.backwards
+                )[: filter.page_size + 1]
+            )
+            has_more = len(window) > filter.page_size
+            paginated_ads = window[: filter.page_size]
+
+            if cursor.backwards:
+                paginated_ads.reverse()
+                has_next, has_previous = True, has_more
+            else:
+                has_next, has_previous = has_more, True
+
+            page = None
+        else:
+            page = max(filter.page, 1)
+            if keyset:
+                page = min(page, MAX_OFFSET_PAGE)
+            start = (page - 1) * filter.page_size
+            end = start + filter.page_size
+
+            if keyset:
+                ads_query = AdRepository.seek(ads_query)
 
-        paginated_ads = ads_query[start:end]
+            paginated_ads = list(ads_query[start:end])
 
-        total_items = ads_query.count()
+        count = AdCounter.count(
+            ads_query,
+            filter_key=(
+                filter.keyword,
+                filter.category,
+                filter.condition,
+                filter.status,
+                filter.user_id,
+                filter.search_mode,
+            ),
+        )
+        total_items = count.value
         total_pages = (total_items + filter.page_size - 1) // filter.page_size
+        last_page = min(total_pages, MAX_OFFSET_PAGE) if keyset else total_pages
+
+        if page is not None:
+            has_next = page < total_pages
+            has_previous = page > 1
+
+        next_cursor = previous_cursor = None
+        if keyset and paginated_ads:
+            if has_next:
+                next_cursor = encode_cursor(
+                    paginated_ads[-1].created_at, paginated_ads[-1].id
+                )
+            if has_previous:
+                previous_cursor = encode_cursor(
+                    paginated_ads[0].created_at, paginated_ads[0].id, backwards=True
+                )
+
+        facets = None
+        if filter.with_facets:
+            facets = AdService.get_facets(filter)
+
+        suggestions = []
+        if filter.keyword and total_items == 0:
+            suggestions = AdService.suggest_titles(filter.keyword, status=filter.status)
 
         ads = [
             AdDTO(
                 id=ad.id,
-                user_id=ad.user.id,
+                user_id=ad.user_id,
                 username=ad.user.username,
                 title=ad.title,
                 description=ad.description,
                 image_url=ad.image_url,
+                thumbnail_url=ad.thumbnail_url,
                 status=ad.status,
                 category=ad.category,
                 condition=ad.condition,
@@ -125,5 +280,74 @@ class AdService:
             "ads": ads,
             "page_size": filter.page_size,
             "total_items": total_items,
+            "total_items_approximate": count.approximate,
             "total_pages": total_pages,
+            "last_page": last_page,
+            "page": page,
+            "has_next": has_next,
+            "has_previous": has_previous,
+            "next_cursor": next_cursor,
+            "previous_cursor": previous_cursor,
+            "suggestions": suggestions,
+            "facets": facets,
+        }
+
+    @staticmethod
+    def get_facets(filter: AdFilterDTO) -> dict[str, dict[str, int]]:
+        """
+        Counts for every category, condition and status under the keyword and
+        owner filters; the category, condition and status filters are ignored
+        so each option shows what selecting it would return.
+        """
+        queryset = AdRepository.search(
+            keyword=filter.keyword,
+            category=None,
+            condition=None,
+            status=None,
+            user_id=filter.user_id,
+            search_mode=filter.search_mode,
+        )
+        counts = AdFacets.facets(
+            queryset, filter_key=(filter.keyword, filter.user_id, filter.search_mode)
+        )
+
+        return {
+            "category": {
+                category: counts["category"].get(category, 0)
+                for category in domain.ItemCategory.get_categories()
+            },
+            "condition": {
+                condition: counts["condition"].get(condition, 0)
+                for condition in domain.ItemCondition.get_conditions()
+            },
+            "status": {
+                status: counts["status"].get(status, 0)
+                for status in domain.ItemStatus.get_statuses()
+            },
         }
+
+    @staticmethod
+    def supports_keyset(filter: AdFilterDTO) -> bool:
+        """Relevance-ordered searches have no stable key to seek on."""
+        if not filter.keyword:
+            return True
+        return filter.search_mode in (
+            str(domain.SearchMode.PREFIX),
+            str(domain.SearchMode.PHRASE),
+        )
+
+    @staticmethod
+    def suggest_titles(
+        keyword: str, limit: int = 5, status: Optional[str] = None
+    ) -> list[str]:
+        if not keyword:
+            return []
+        return AdRepository.suggest_titles(keyword, limit=limit, status=status)
+
+    @staticmethod
+    async def asuggest_titles(
+        keyword: str, limit: int = 5, status: Optional[str] = None
+    ) -> list[str]:
+        if not keyword:
+            return []
+        return await AdRepository.asuggest_titles(keyword, limit=limit, status=status)
@@ -2,5 +2,6 @@ from src.apps.ads.domain.entity import Ad
 from src.apps.ads.domain.values.condition import ItemCondition
 from src.apps.ads.domain.values.category import ItemCategory
 from src.apps.ads.domain.values.status import ItemStatus
+from src.apps.ads.domain.values.search_mode import SearchMode
 
-__all__ = ("Ad", "ItemCondition", "ItemCategory", "ItemStatus")
\ No newline at end of file
+__all__ = ("Ad", "ItemCondition", "ItemCategory", "ItemStatus", "SearchMode")
\ No newline at end of file
@@ -18,6 +18,7 @@ class Ad(BaseEntity):
     status: ItemStatus = field(default=ItemStatus.ACTIVE)
     condition: ItemCondition = field(default=ItemCondition.USED)
     image_url: Optional[str] = field(default=None)
+    thumbnail_url: Optional[str] = field(default=None)
 
     def is_owner(self, user_id: UUID) -> bool:
         return self.user_id == user_id
@@ -30,6 +31,7 @@ class Ad(BaseEntity):
             'title': self.title,
             'description': self.description,
             'image_url': self.image_url,
+            'thumbnail_url': self.thumbnail_url,
             'category': str(self.category),
             'condition': str(self.condition),
             'status': str(self.status),
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from enum import Enum
+
+
+@dataclass(frozen=True, eq=False)
+class SearchMode(Enum):
+    RANKED = "ranked"
+    PREFIX = "prefix"
+    PHRASE = "phrase"
+    FUZZY = "fuzzy"
+
+    @classmethod
+    def get_modes(cls) -> list[str]:
+        return [mode.value for mode in cls]
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SearchMode):
+            return self.value == other.value
+        return False
+
+    def __hash__(self) -> int:
+        return hash(self.value)
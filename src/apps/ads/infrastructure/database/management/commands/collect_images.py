@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from src.apps.ads.infrastructure.images.storage import list_images
+from src.apps.ads.infrastructure.repository.image_repo import ImageRepository
+
+
+class Command(BaseCommand):
+    help = "Delete stored ad images that no ad references any more"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep unreferenced images this long, uploads may still get their ad",
+        )
+        parser.add_argument(
+            "--adopt",
+            action="store_true",
+            help="First register stored files the registry does not know and recount references",
+        )
+
+    def handle(self, *args, **options):
+        if options["adopt"]:
+            images = list(list_images())
+            ImageRepository.adopt(images)
+            self.stdout.write(f"Scanned {len(images)} stored images")
+
+        older_than = timezone.now() - timedelta(hours=options["grace_hours"])
+        deleted = 0
+
+        while paths := ImageRepository.collect(older_than, limit=options["batch_size"]):
+            deleted += len(paths)
+            self.stdout.write(f"Deleted {deleted} images")
+
+        self.stdout.write(self.style.SUCCESS(f"Collected {deleted} unreferenced images"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.ads.infrastructure.images.pipeline import ImagePipeline
+from src.apps.ads.infrastructure.repository.ad_repo import AdRepository
+
+
+class Command(BaseCommand):
+    help = "Render thumbnails for stored ad images that do not have one yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        rendered = failed = 0
+        last_id = None
+
+        while batch := AdRepository.find_missing_thumbnails(
+            after_id=last_id, limit=options["batch_size"]
+        ):
+            for ad_id, image_url in batch:
+                try:
+                    ImagePipeline.process(ad_id, image_url)
+                    rendered += 1
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f"Ad {ad_id}: {error}")
+            last_id = batch[-1][0]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rendered {rendered} thumbnails, {failed} failed")
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ad', '0006_ad_last_modified_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ad',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, null=True),
+        ),
+    ]
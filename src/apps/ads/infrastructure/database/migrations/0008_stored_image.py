@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ad', '0007_ad_thumbnail_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImage',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('path', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'stored_image',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ad',
+            index=models.Index(fields=['image_url'], name='ad_image_url_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storedimage',
+            index=models.Index(condition=models.Q(('ref_count__lte', 0)), fields=['updated_at'], name='stored_image_orphan_idx'),
+        ),
+    ]
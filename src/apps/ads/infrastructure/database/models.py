@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from uuid6 import uuid7
 from src.core.infrastructure.database.models import TimedBaseModel, User
@@ -9,6 +11,7 @@ class Ad(TimedBaseModel):
     title = models.CharField(max_length=200)
     description = models.TextField(null=True)
     image_url = models.URLField(blank=True, null=True)
+    thumbnail_url = models.URLField(blank=True, null=True)
     category_choices = [
         ('electronics', 'electronics'),
         ('clothes', 'clothes'),
@@ -44,6 +47,14 @@ class Ad(TimedBaseModel):
         choices=status_choices,
         default='active',
     )
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('description', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     def __str__(self):
         return self.title
@@ -54,3 +65,63 @@ class Ad(TimedBaseModel):
         verbose_name = 'Ad'
         verbose_name_plural = 'Ads'
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='ad_search_vector_gin'),
+            GinIndex(
+                fields=['title'],
+                name='ad_title_trgm_gin',
+                opclasses=['gin_trgm_ops'],
+            ),
+            models.Index(
+                fields=['status', 'category', '-created_at'],
+                name='ad_status_category_created_idx',
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='ad_active_created_idx',
+                condition=models.Q(status='active'),
+            ),
+            models.Index(
+                fields=['user', '-created_at'],
+                name='ad_user_created_idx',
+            ),
+            # covering indexes for the conditional GET validators
+            models.Index(
+                fields=['id'],
+                include=['updated_at'],
+                name='ad_id_updated_covering_idx',
+            ),
+            models.Index(
+                fields=['user', 'updated_at'],
+                name='ad_user_updated_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                name='ad_updated_idx',
+            ),
+            models.Index(
+                fields=['image_url'],
+                name='ad_image_url_idx',
+            ),
+        ]
+
+
+class StoredImage(TimedBaseModel):
+    """An original in the content-addressed image storage and how many ads show it."""
+    path = models.CharField(max_length=255, primary_key=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return self.path
+
+    class Meta:
+        db_table = 'stored_image'
+        app_label = 'ad'
+        indexes = [
+            models.Index(
+                fields=['updated_at'],
+                name='stored_image_orphan_idx',
+                condition=models.Q(ref_count__lte=0),
+            ),
+        ]
@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import getLogger
+from typing import ClassVar, Optional
+
+from django.conf import settings
+from django.db import connection
+from uuid6 import UUID
+
+from src.apps.ads.infrastructure.images.storage import render_thumbnails
+from src.apps.ads.infrastructure.repository.ad_repo import AdRepository
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class ImagePipeline:
+    """
+    Thumbnails are rendered off the request by a small pool of worker threads
+    fed from the executor's local queue. Pillow releases the GIL while it
+    decodes, resizes and encodes, so threads are enough to use several cores.
+    """
+
+    executor: ClassVar[Optional[ThreadPoolExecutor]] = None
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def submit(ad_id: UUID, image_url: str) -> None:
+        options = getattr(settings, "AD_IMAGES", {})
+        if not options.get("ASYNC", True):
+            ImagePipeline.run(ad_id, image_url)
+            return
+
+        ImagePipeline.get_executor(options.get("WORKERS", 2)).submit(
+            ImagePipeline.work, ad_id, image_url
+        )
+
+    @staticmethod
+    def get_executor(workers: int) -> ThreadPoolExecutor:
+        # created on first use so forked server workers each get their own pool
+        with ImagePipeline.lock:
+            if ImagePipeline.executor is None:
+                ImagePipeline.executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="ad-images"
+                )
+            return ImagePipeline.executor
+
+    @staticmethod
+    def work(ad_id: UUID, image_url: str) -> None:
+        try:
+            ImagePipeline.run(ad_id, image_url)
+        finally:
+            # worker threads own their connection, nothing else would close it
+            connection.close()
+
+    @staticmethod
+    def run(ad_id: UUID, image_url: str) -> None:
+        # the ad is saved already, a broken image only leaves it without a thumbnail
+        try:
+            ImagePipeline.process(ad_id, image_url)
+        except Exception:
+            logger.exception(f"Thumbnail generation failed for ad {ad_id}")
+
+    @staticmethod
+    def process(ad_id: UUID, image_url: str) -> bool:
+        thumbnail_url = render_thumbnails(image_url)
+        return AdRepository.set_thumbnail(ad_id, image_url, thumbnail_url)
@@ -0,0 +1,167 @@
+import hashlib
+import os
+from io import BytesIO
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+IMAGES_DIR = "ad_images"
+THUMBNAILS_DIR = f"{IMAGES_DIR}/thumbs"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Bounding box of list and profile card images
+THUMBNAIL_SIZE = (480, 480)
+THUMBNAIL_FORMATS = (
+    (".jpg", "JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+    (".webp", "WEBP", {"quality": 80, "method": 4}),
+)
+
+# One extension per format, so the same bytes uploaded as photo.jpeg and
+# photo.JPG end up as a single stored object
+FORMAT_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "GIF": ".gif",
+    "WEBP": ".webp",
+    "BMP": ".bmp",
+    "TIFF": ".tif",
+}
+EXTENSION_ALIASES = {".jpeg": ".jpg", ".jpe": ".jpg", ".tiff": ".tif"}
+
+
+def media_url(path: str) -> str:
+    return os.path.join(settings.MEDIA_URL, path)
+
+
+def storage_path(url: str) -> str:
+    return url.removeprefix(settings.MEDIA_URL).lstrip("/")
+
+
+def is_stored(url: Optional[str]) -> bool:
+    """Ads may also point at external images, which are never processed."""
+    return bool(url) and url.startswith(settings.MEDIA_URL)
+
+
+def webp_url(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    return f"{os.path.splitext(url)[0]}.webp"
+
+
+def content_hash(upload) -> str:
+    digest = hashlib.sha256()
+    for chunk in upload.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    upload.seek(0)
+    return digest.hexdigest()
+
+
+def shard(directory: str, name: str) -> str:
+    """Two levels of two-character directories keep every listing small."""
+    return f"{directory}/{name[:2]}/{name[2:4]}/{name}"
+
+
+def image_extension(upload) -> str:
+    """
+    Extension of the format the upload decodes as, whatever it was named.
+    Pillow only reads the header here. Uploads it cannot identify keep their
+    own extension, lowercased and with aliases folded together.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(upload) as image:
+            image_format = image.format
+    except UnidentifiedImageError:
+        image_format = None
+    finally:
+        upload.seek(0)
+
+    if image_format:
+        return FORMAT_EXTENSIONS.get(image_format, f".{image_format.lower()}")
+    extension = os.path.splitext(upload.name)[1].lower()
+    return EXTENSION_ALIASES.get(extension, extension)
+
+
+def image_path(upload) -> str:
+    """Content-addressed storage path of an upload."""
+    return shard(IMAGES_DIR, f"{content_hash(upload)}{image_extension(upload)}")
+
+
+def save_image(upload, path: str) -> str:
+    """
+    Stores an upload at its content-addressed ``path`` and returns its URL, so
+    identical re-uploads reuse the stored object. New content is copied by the
+    storage chunk by chunk, or moved when the upload was spooled to a temporary
+    file; the upload is never read into memory as a whole.
+    """
+    if default_storage.exists(path):
+        return media_url(path)
+
+    saved = default_storage.save(path, upload)
+    if saved != path:
+        # a concurrent upload of the same content won the name
+        default_storage.delete(saved)
+    return media_url(path)
+
+
+def thumbnail_paths(path: str) -> list[str]:
+    """Named after the whole stored name, so each original owns its thumbnails."""
+    name = os.path.basename(path)
+    return [
+        shard(THUMBNAILS_DIR, f"{name}{extension}")
+        for extension, _, _ in THUMBNAIL_FORMATS
+    ]
+
+
+def delete_image(path: str) -> None:
+    for stored in (path, *thumbnail_paths(path)):
+        default_storage.delete(stored)
+
+
+def list_images(directory: str = IMAGES_DIR) -> Iterator[tuple[str, int]]:
+    """Walks the stored originals, yielding ``(path, size)``; thumbnails are skipped."""
+    directories, files = default_storage.listdir(directory)
+    for name in files:
+        path = f"{directory}/{name}"
+        yield path, default_storage.size(path)
+    for name in directories:
+        if f"{directory}/{name}" != THUMBNAILS_DIR:
+            yield from list_images(f"{directory}/{name}")
+
+
+def render_thumbnails(image_url: str) -> str:
+    """
+    Writes the JPEG and WebP thumbnails of a stored image and returns the JPEG
+    URL; the WebP one sits next to it (see ``webp_url``).
+    """
+    # Pillow is only needed by the image workers
+    from PIL import Image, ImageOps
+
+    path = storage_path(image_url)
+    targets = thumbnail_paths(path)
+
+    # images are stored by content, so another ad may have rendered these already
+    if all(default_storage.exists(target) for target in targets):
+        return media_url(targets[0])
+
+    with default_storage.open(path, "rb") as source, Image.open(source) as image:
+        # JPEG decoders can scale down while decoding, which keeps phone
+        # photos from being expanded to full size in memory
+        image.draft("RGB", THUMBNAIL_SIZE)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(THUMBNAIL_SIZE)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        for target, (_, image_format, options) in zip(targets, THUMBNAIL_FORMATS):
+            buffer = BytesIO()
+            image.save(buffer, image_format, **options)
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            default_storage.save(target, ContentFile(buffer.getvalue()))
+
+    return media_url(targets[0])
@@ -1,53 +1,228 @@
-from typing import List, Optional, Iterable
-from logging import getLogger
+import re
+from datetime import datetime
+from typing import ClassVar, List, Optional, Iterable
 from uuid6 import UUID
 from dataclasses import dataclass
-from django.db.models import Q
-from src.apps.ads.domain.entity import Ad
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Max, QuerySet
+from django.utils import timezone
 from src.apps.ads import domain
 from src.apps.ads.infrastructure.database import models
+from src.apps.ads.infrastructure.repository.cache import AdCache, TieredAdCache
+from src.apps.ads.infrastructure.repository.count import (
+    ADS_CACHE_NAMESPACE,
+    COUNT_CACHE_TIMEOUT,
+)
 from src.apps.ads.infrastructure.repository.mapper import AdMapper
+from src.core.infrastructure.cache import bump_namespace_version, versioned_key
+from src.core.infrastructure.database.routers import read_db
 from src.core.infrastructure.exceptions import NotFoundError
+from src.core.infrastructure.pagination import seek
+
+
+SEARCH_CONFIG = "english"
 
 
 @dataclass
 class AdRepository:
+    cache: ClassVar[AdCache] = TieredAdCache.from_settings()
+
     @staticmethod
     def create(ad: domain.Ad) -> domain.Ad:
         ad_model: models.Ad = AdMapper.from_entity(ad)
-        ad_model.save()
-        return AdRepository.find_by_id(ad.id)
+        ad_model.save(force_insert=True)
+        AdRepository._invalidate()
+        return AdMapper.from_saved(ad_model, ad)
 
     @staticmethod
-    def update(ad: domain.Ad) -> domain.Ad:
+    def update(ad: domain.Ad, fields: Optional[Iterable[str]] = None) -> domain.Ad:
+        """
+        Writes the whole row, or only ``fields`` (and ``updated_at``) when given,
+        leaving columns other writers own, like ``thumbnail_url``, untouched.
+        """
         updated_model: models.Ad = AdMapper.from_entity(ad)
+        updated_model.updated_at = timezone.now()
+
+        if fields is None:
+            columns = [
+                field.attname
+                for field in models.Ad._meta.concrete_fields
+                if not (field.primary_key or field.generated or field.name == "created_at")
+            ]
+        else:
+            columns = [models.Ad._meta.get_field(name).attname for name in fields]
+            columns.append("updated_at")
+
+        updated = models.Ad.objects.filter(pk=ad.id).update(
+            **{column: getattr(updated_model, column) for column in columns}
+        )
+        if not updated:
+            raise NotFoundError(f"Ad with ID {ad.id} not found")
 
-        # here we tell django that this model is not new
-        updated_model._state.adding = False
-        updated_model.save()
-        return AdRepository.find_by_id(ad.id)
+        AdRepository._invalidate(ad.id)
+        return AdMapper.from_saved(updated_model, ad)
 
     @staticmethod
     def delete(ad_id: UUID) -> bool:
         try:
             ad_model = models.Ad.objects.get(id=ad_id)
             ad_model.delete()
+            AdRepository._invalidate(ad_id)
             return True
         except models.Ad.DoesNotExist:
             raise NotFoundError(f"Ad with ID {ad_id} not found")
 
     @staticmethod
-    def find_by_id(ad_id: UUID) -> Optional[domain.Ad]:
+    def bulk_update_status(ad_ids: Iterable[UUID], status: domain.ItemStatus) -> int:
+        ad_ids = list(ad_ids)
+        updated = models.Ad.objects.filter(id__in=ad_ids).update(
+            status=str(status), updated_at=timezone.now()
+        )
+        AdRepository._invalidate(*ad_ids)
+        return updated
+
+    @staticmethod
+    def set_thumbnail(ad_id: UUID, image_url: str, thumbnail_url: str) -> bool:
+        """Only applies while the ad still shows the image the thumbnail was made from."""
+        updated = models.Ad.objects.filter(id=ad_id, image_url=image_url).update(
+            thumbnail_url=thumbnail_url, updated_at=timezone.now()
+        )
+        if updated:
+            AdRepository._invalidate(ad_id)
+        return bool(updated)
+
+    @staticmethod
+    def find_missing_thumbnails(
+        after_id: Optional[UUID] = None, limit: int = 100
+    ) -> list[tuple[UUID, str]]:
+        """Ads showing an image from our media storage that has no thumbnail yet."""
+        queryset = models.Ad.objects.filter(
+            image_url__startswith=settings.MEDIA_URL, thumbnail_url__isnull=True
+        )
+        if after_id:
+            queryset = queryset.filter(id__gt=after_id)
+        return list(queryset.order_by("id").values_list("id", "image_url")[:limit])
+
+    @staticmethod
+    def _invalidate(*ad_ids: UUID) -> None:
+        """
+        Drop cached state now and again on commit, so a read racing an open
+        transaction cannot put the pre-write row back into the cache.
+        """
+
+        def invalidate():
+            for ad_id in ad_ids:
+                AdRepository.cache.delete(ad_id)
+            bump_namespace_version(ADS_CACHE_NAMESPACE)
+
+        invalidate()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(invalidate)
+
+    @staticmethod
+    def find_by_id(ad_id: UUID, use_cache: bool = True) -> Optional[domain.Ad]:
+        if use_cache:
+            cached_ad = AdRepository.cache.get(ad_id)
+            if cached_ad is not None:
+                return cached_ad
+
         try:
-            ad_model = models.Ad.objects.get(id=ad_id)
-            return AdMapper.to_entity(ad_model)
+            ad_model = AdRepository._queryset().get(id=ad_id)
         except models.Ad.DoesNotExist:
             return None
 
+        ad = AdMapper.to_entity(ad_model)
+        AdRepository.cache.set(ad)
+        return ad
+
+    @staticmethod
+    def lock_for_update(ad_id: UUID) -> Optional[domain.Ad]:
+        """
+        Load the ad bypassing the cache and row-lock it until the surrounding
+        transaction ends, so concurrent writers apply their changes in turn.
+        """
+        try:
+            ad_model = AdRepository._queryset().select_for_update(of=("self",)).get(id=ad_id)
+        except models.Ad.DoesNotExist:
+            return None
+        return AdMapper.to_entity(ad_model)
+
+    @staticmethod
+    async def afind_by_id(ad_id: UUID, use_cache: bool = True) -> Optional[domain.Ad]:
+        if use_cache:
+            cached_ad = await AdRepository.cache.aget(ad_id)
+            if cached_ad is not None:
+                return cached_ad
+
+        try:
+            ad_model = await AdRepository._queryset().aget(id=ad_id)
+        except models.Ad.DoesNotExist:
+            return None
+
+        ad = AdMapper.to_entity(ad_model)
+        await AdRepository.cache.aset(ad)
+        return ad
+
+    @staticmethod
+    def find_user_ads(user_id: UUID, limit: Optional[int] = None) -> List[domain.Ad]:
+        return [
+            AdMapper.to_entity(model)
+            for model in AdRepository._user_ads_queryset(user_id, limit)
+        ]
+
+    @staticmethod
+    async def afind_user_ads(
+        user_id: UUID, limit: Optional[int] = None
+    ) -> List[domain.Ad]:
+        return [
+            AdMapper.to_entity(model)
+            async for model in AdRepository._user_ads_queryset(user_id, limit)
+        ]
+
+    @staticmethod
+    def _user_ads_queryset(user_id: UUID, limit: Optional[int] = None) -> QuerySet:
+        ad_models = (
+            AdRepository._queryset()
+            .using(read_db())
+            .filter(user_id=user_id)
+        )
+        if limit is not None:
+            ad_models = ad_models[:limit]
+        return ad_models
+
     @staticmethod
-    def find_user_ads(user_id: UUID) -> List[domain.Ad]:
-        ad_models = models.Ad.objects.filter(user_id=user_id)
-        return [AdMapper.to_entity(model) for model in ad_models]
+    def last_modified(
+        ad_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+        use_cache: bool = True,
+    ) -> Optional[datetime]:
+        """
+        Newest ``updated_at`` of one ad, of a user's ads or of every ad.
+        Each variant is answered by an index-only scan of a covering index,
+        and cached until the next ad write bumps the namespace version.
+        """
+        key = versioned_key(ADS_CACHE_NAMESPACE, "last_modified", ad_id, user_id)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached[0]
+
+        queryset = models.Ad.objects.all()
+        if ad_id:
+            queryset = queryset.filter(id=ad_id)
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        last_modified = queryset.aggregate(last_modified=Max("updated_at"))["last_modified"]
+
+        cache.set(key, (last_modified,), COUNT_CACHE_TIMEOUT)
+        return last_modified
 
     @staticmethod
     def search(
@@ -56,17 +231,16 @@ class AdRepository:
         status: str,
         condition: str,
         user_id: Optional[UUID] = None,
+        search_mode: str = str(domain.SearchMode.RANKED),
     ) -> Iterable[models.Ad]:
 
-        queryset = models.Ad.objects.all()
+        queryset = AdRepository._queryset().using(read_db())
 
         if user_id:
             queryset = queryset.filter(user_id=user_id)
 
         if keyword:
-            queryset = queryset.filter(
-                Q(title__icontains=keyword) | Q(description__icontains=keyword)
-            )
+            queryset = AdRepository._full_text_search(queryset, keyword, search_mode)
 
         if category:
             queryset = queryset.filter(category=category)
@@ -78,3 +252,94 @@ class AdRepository:
             queryset = queryset.filter(status=status)
 
         return queryset
+
+    @staticmethod
+    def _queryset() -> QuerySet:
+        """
+        Ads always come with their owner joined in, mappers read the username.
+        The search vector is only used inside WHERE clauses, so it is never fetched.
+        """
+        return models.Ad.objects.select_related("user").defer("search_vector")
+
+    @staticmethod
+    def seek(
+        queryset: QuerySet,
+        created_at: Optional[datetime] = None,
+        ad_id: Optional[UUID] = None,
+        backwards: bool = False,
+    ) -> QuerySet:
+        return seek(queryset, created_at, ad_id, backwards=backwards)
+
+    @staticmethod
+    def suggest_titles(
+        keyword: str, limit: int = 5, status: Optional[str] = None
+    ) -> List[str]:
+        titles = AdRepository._suggestions_queryset(keyword, limit, status)
+        return list(dict.fromkeys(titles))[:limit]
+
+    @staticmethod
+    async def asuggest_titles(
+        keyword: str, limit: int = 5, status: Optional[str] = None
+    ) -> List[str]:
+        titles = [
+            title
+            async for title in AdRepository._suggestions_queryset(keyword, limit, status)
+        ]
+        return list(dict.fromkeys(titles))[:limit]
+
+    @staticmethod
+    def _suggestions_queryset(
+        keyword: str, limit: int, status: Optional[str] = None
+    ) -> QuerySet:
+        queryset = models.Ad.objects.using(read_db()).filter(
+            title__trigram_word_similar=keyword
+        )
+
+        if status:
+            queryset = queryset.filter(status=status)
+
+        return (
+            queryset.annotate(similarity=TrigramWordSimilarity(keyword, "title"))
+            .order_by("-similarity")
+            .values_list("title", flat=True)[: limit * 2]
+        )
+
+    @staticmethod
+    def _full_text_search(
+        queryset: QuerySet, keyword: str, search_mode: str
+    ) -> QuerySet:
+        """
+        Match the keyword against the GIN-indexed ``search_vector`` column.
+        Ranked mode orders by relevance, the other modes keep the model ordering.
+        Fuzzy mode goes through the trigram index on ``title`` instead.
+        """
+        mode = domain.SearchMode(search_mode or str(domain.SearchMode.RANKED))
+
+        if mode == domain.SearchMode.FUZZY:
+            return (
+                queryset.filter(title__trigram_word_similar=keyword)
+                .annotate(similarity=TrigramWordSimilarity(keyword, "title"))
+                .order_by("-similarity", "-created_at")
+            )
+
+        if mode == domain.SearchMode.PREFIX:
+            terms = re.findall(r"\w+", keyword)
+            if not terms:
+                return queryset.none()
+            query = SearchQuery(
+                " & ".join(f"{term}:*" for term in terms),
+                search_type="raw",
+                config=SEARCH_CONFIG,
+            )
+            return queryset.filter(search_vector=query)
+
+        if mode == domain.SearchMode.PHRASE:
+            query = SearchQuery(keyword, search_type="phrase", config=SEARCH_CONFIG)
+            return queryset.filter(search_vector=query)
+
+        query = SearchQuery(keyword, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-created_at")
+        )
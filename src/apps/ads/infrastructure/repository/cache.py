@@ -0,0 +1,170 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from uuid6 import UUID
+
+from src.apps.ads import domain
+
+
+class AdCache(ABC):
+    @abstractmethod
+    def get(self, ad_id: UUID) -> Optional[domain.Ad]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, ad: domain.Ad) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, ad_id: UUID) -> None:
+        raise NotImplementedError
+
+    # in-process tiers never block, so they can answer async callers directly
+    async def aget(self, ad_id: UUID) -> Optional[domain.Ad]:
+        return self.get(ad_id)
+
+    async def aset(self, ad: domain.Ad) -> None:
+        self.set(ad)
+
+
+class NullAdCache(AdCache):
+    def get(self, ad_id: UUID) -> Optional[domain.Ad]:
+        return None
+
+    def set(self, ad: domain.Ad) -> None:
+        pass
+
+    def delete(self, ad_id: UUID) -> None:
+        pass
+
+
+class LocalAdCache(AdCache):
+    """
+    Per-process LRU. Entries expire after ``ttl`` seconds because writes made
+    by other processes can only invalidate the shared tier.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, domain.Ad]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ad_id: UUID) -> Optional[domain.Ad]:
+        key = str(ad_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, ad = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        # entities are mutable, callers must not share the cached instance
+        return replace(ad)
+
+    def set(self, ad: domain.Ad) -> None:
+        key = str(ad.id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, replace(ad))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, ad_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(str(ad_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoAdCache(AdCache):
+    def __init__(self, alias: str = "default", timeout: int = 300):
+        self.alias = alias
+        self.timeout = timeout
+
+    @staticmethod
+    def _key(ad_id: UUID) -> str:
+        return f"ads:entity:{ad_id}"
+
+    def get(self, ad_id: UUID) -> Optional[domain.Ad]:
+        return caches[self.alias].get(self._key(ad_id))
+
+    def set(self, ad: domain.Ad) -> None:
+        caches[self.alias].set(self._key(ad.id), ad, self.timeout)
+
+    def delete(self, ad_id: UUID) -> None:
+        caches[self.alias].delete(self._key(ad_id))
+
+    async def aget(self, ad_id: UUID) -> Optional[domain.Ad]:
+        return await caches[self.alias].aget(self._key(ad_id))
+
+    async def aset(self, ad: domain.Ad) -> None:
+        await caches[self.alias].aset(self._key(ad.id), ad, self.timeout)
+
+
+class TieredAdCache(AdCache):
+    """Reads fall through the tiers in order and refill the faster ones on a hit."""
+
+    def __init__(self, *tiers: AdCache):
+        self.tiers = tiers
+
+    def get(self, ad_id: UUID) -> Optional[domain.Ad]:
+        for index, tier in enumerate(self.tiers):
+            ad = tier.get(ad_id)
+            if ad is not None:
+                for faster_tier in self.tiers[:index]:
+                    faster_tier.set(ad)
+                return ad
+        return None
+
+    def set(self, ad: domain.Ad) -> None:
+        for tier in self.tiers:
+            tier.set(ad)
+
+    def delete(self, ad_id: UUID) -> None:
+        for tier in self.tiers:
+            tier.delete(ad_id)
+
+    async def aget(self, ad_id: UUID) -> Optional[domain.Ad]:
+        for index, tier in enumerate(self.tiers):
+            ad = await tier.aget(ad_id)
+            if ad is not None:
+                for faster_tier in self.tiers[:index]:
+                    await faster_tier.aset(ad)
+                return ad
+        return None
+
+    async def aset(self, ad: domain.Ad) -> None:
+        for tier in self.tiers:
+            await tier.aset(ad)
+
+    @classmethod
+    def from_settings(cls) -> AdCache:
+        options = getattr(settings, "AD_CACHE", {})
+        if not options.get("ENABLED", True):
+            return NullAdCache()
+
+        return cls(
+            LocalAdCache(
+                maxsize=options.get("LOCAL_MAXSIZE", 1024),
+                ttl=options.get("LOCAL_TTL", 5),
+            ),
+            DjangoAdCache(
+                alias=options.get("ALIAS", "default"),
+                timeout=options.get("TIMEOUT", 300),
+            ),
+        )
@@ -0,0 +1,54 @@
+import json
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import QuerySet
+
+from src.core.infrastructure.cache import versioned_key
+
+ADS_CACHE_NAMESPACE = "ads"
+
+# Result sets up to this size are counted exactly
+EXACT_COUNT_LIMIT = 1000
+COUNT_CACHE_TIMEOUT = 300
+
+
+@dataclass(frozen=True)
+class CountResult:
+    value: int
+    approximate: bool = False
+
+
+@dataclass
+class AdCounter:
+    @staticmethod
+    def count(queryset: QuerySet, filter_key: tuple) -> CountResult:
+        """
+        Small result sets get an exact count bounded by ``EXACT_COUNT_LIMIT``,
+        larger ones fall back to the planner estimate. Both are cached per filter
+        until the next ad write bumps the namespace version.
+        """
+        key = versioned_key(ADS_CACHE_NAMESPACE, "count", *filter_key)
+        cached = cache.get(key)
+        if cached is not None:
+            return CountResult(*cached)
+
+        queryset = queryset.order_by()
+        bounded = queryset[: EXACT_COUNT_LIMIT + 1].count()
+
+        if bounded <= EXACT_COUNT_LIMIT:
+            result = CountResult(bounded)
+        else:
+            result = CountResult(
+                max(AdCounter.estimate(queryset), bounded), approximate=True
+            )
+
+        cache.set(key, (result.value, result.approximate), COUNT_CACHE_TIMEOUT)
+        return result
+
+    @staticmethod
+    def estimate(queryset: QuerySet) -> int:
+        plan = json.loads(queryset.explain(format="json"))
+        if isinstance(plan, list):
+            plan = plan[0]
+        return int(plan["Plan"]["Plan Rows"])
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+from src.apps.ads.infrastructure.repository.count import (
+    ADS_CACHE_NAMESPACE,
+    COUNT_CACHE_TIMEOUT,
+)
+from src.core.infrastructure.cache import versioned_key
+
+FACET_FIELDS = ("category", "condition", "status")
+
+FACETS_SQL = """
+    SELECT category, condition, status,
+           GROUPING(category), GROUPING(condition), COUNT(*)
+    FROM ({queryset}) AS filtered
+    GROUP BY GROUPING SETS ((category), (condition), (status))
+"""
+
+
+@dataclass
+class AdFacets:
+    @staticmethod
+    def facets(queryset: QuerySet, filter_key: tuple) -> dict[str, dict[str, int]]:
+        """
+        Ad counts per category, condition and status of ``queryset``, all
+        three from one GROUPING SETS scan. Cached like ``AdCounter.count``.
+        """
+        key = versioned_key(ADS_CACHE_NAMESPACE, "facets", *filter_key)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        sql, params = queryset.order_by().values(*FACET_FIELDS).query.sql_with_params()
+        facets = {field: {} for field in FACET_FIELDS}
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(FACETS_SQL.format(queryset=sql), params)
+            for category, condition, status, no_category, no_condition, total in cursor:
+                if not no_category:
+                    facets["category"][category] = total
+                elif not no_condition:
+                    facets["condition"][condition] = total
+                else:
+                    facets["status"][status] = total
+
+        cache.set(key, facets, COUNT_CACHE_TIMEOUT)
+        return facets
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from src.apps.ads.infrastructure.database import models
+from src.apps.ads.infrastructure.images.storage import (
+    delete_image,
+    is_stored,
+    storage_path,
+)
+
+
+RECOUNT_SQL = """
+    UPDATE stored_image SET ref_count = (
+        SELECT COUNT(*) FROM ad WHERE ad.image_url = %s || stored_image.path
+    ), updated_at = now()
+"""
+
+
+@dataclass
+class ImageRepository:
+    @staticmethod
+    def register(path: str, size: int) -> None:
+        """
+        Records a stored original. Registering an existing one refreshes its
+        orphan grace period, and waits while a collection holds its row.
+        """
+        models.StoredImage.objects.bulk_create(
+            [models.StoredImage(path=path, size=size)],
+            update_conflicts=True,
+            unique_fields=["path"],
+            update_fields=["updated_at"],
+        )
+
+    @staticmethod
+    def move_reference(before_url: Optional[str], after_url: Optional[str]) -> None:
+        """An ad stopped showing ``before_url`` and now shows ``after_url``."""
+        if before_url == after_url:
+            return
+
+        deltas = []
+        if is_stored(before_url):
+            deltas.append((storage_path(before_url), -1))
+        if is_stored(after_url):
+            deltas.append((storage_path(after_url), 1))
+
+        # a fixed order keeps concurrent swaps from deadlocking on the rows
+        for path, delta in sorted(deltas):
+            models.StoredImage.objects.filter(path=path).update(
+                ref_count=F("ref_count") + delta, updated_at=timezone.now()
+            )
+
+    @staticmethod
+    def adopt(images: Iterable[tuple[str, int]]) -> None:
+        """Registers stored files that predate the registry, then recounts."""
+        models.StoredImage.objects.bulk_create(
+            [models.StoredImage(path=path, size=size) for path, size in images],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+        ImageRepository.recount()
+
+    @staticmethod
+    def recount() -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(RECOUNT_SQL, [settings.MEDIA_URL])
+
+    @staticmethod
+    def collect(older_than: datetime, limit: int = 100) -> list[str]:
+        """
+        Deletes one batch of originals no ad has shown since ``older_than``,
+        with their thumbnails. The grace period covers uploads whose ad is not
+        committed yet; ads are checked directly as well, in case a count
+        drifted. Files are only deleted once the row deletion has committed,
+        and a path registered again by then keeps its files.
+        """
+        referenced = models.Ad.objects.filter(
+            image_url=Concat(Value(settings.MEDIA_URL), OuterRef("path"))
+        )
+
+        with transaction.atomic():
+            paths = list(
+                models.StoredImage.objects.select_for_update(skip_locked=True)
+                .filter(ref_count__lte=0, updated_at__lt=older_than)
+                .exclude(Exists(referenced))
+                .order_by("updated_at")
+                .values_list("path", flat=True)[:limit]
+            )
+
+            models.StoredImage.objects.filter(path__in=paths).delete()
+            transaction.on_commit(partial(ImageRepository._delete_files, paths))
+
+        return paths
+
+    @staticmethod
+    def _delete_files(paths: list[str]) -> None:
+        for path in paths:
+            # re-uploaded since the collection committed
+            if models.StoredImage.objects.filter(path=path).exists():
+                continue
+            delete_image(path)
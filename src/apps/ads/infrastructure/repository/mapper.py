@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 from src.apps.ads import domain
 from src.apps.ads.infrastructure.database import models
 
@@ -6,11 +8,12 @@ class AdMapper:
     def to_entity(instance: models.Ad) -> domain.Ad:
         return domain.Ad(
             id=instance.id,
-            user_id=instance.user.id,
+            user_id=instance.user_id,
             owner_username=instance.user.username,
             title=instance.title,
             description=instance.description,
             image_url=instance.image_url,
+            thumbnail_url=instance.thumbnail_url,
             category=domain.ItemCategory(instance.category),
             condition=domain.ItemCondition(instance.condition),
             status=domain.ItemStatus(instance.status),
@@ -18,6 +21,16 @@ class AdMapper:
             updated_at=instance.updated_at
         )
 
+    @staticmethod
+    def from_saved(instance: models.Ad, entity: domain.Ad) -> domain.Ad:
+        """Entity after a write, with the fields the save filled in on the model."""
+        return replace(
+            entity,
+            owner_username=entity.owner_username or instance.user.username,
+            created_at=instance.created_at,
+            updated_at=instance.updated_at,
+        )
+
     @staticmethod
     def from_entity(instance: domain.Ad) -> models.Ad:
         return models.Ad(
@@ -26,6 +39,7 @@ class AdMapper:
             title=instance.title,
             description=instance.description,
             image_url=instance.image_url,
+            thumbnail_url=instance.thumbnail_url,
             category=str(instance.category),
             condition=str(instance.condition),
             status=str(instance.status),
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+from django.db.models import Count
+
+from src.apps.ads import domain
+from src.apps.ads.infrastructure.database import models
+from src.core.infrastructure.counters import CounterKey, merge_deltas
+
+USER_ADS = "user_ads"
+CATEGORY_ADS = "category_ads"
+CONDITION_ADS = "condition_ads"
+
+
+@dataclass
+class AdStats:
+    """Counter deltas for ads, bucketed by ad status."""
+
+    @staticmethod
+    def deltas(ad: domain.Ad, sign: int = 1) -> dict[CounterKey, int]:
+        status = str(ad.status)
+        return {
+            (USER_ADS, str(ad.user_id), status): sign,
+            (CATEGORY_ADS, str(ad.category), status): sign,
+            (CONDITION_ADS, str(ad.condition), status): sign,
+        }
+
+    @staticmethod
+    def change(before: domain.Ad, after: domain.Ad) -> dict[CounterKey, int]:
+        return merge_deltas(AdStats.deltas(before, -1), AdStats.deltas(after))
+
+    @staticmethod
+    def recount() -> dict[CounterKey, int]:
+        counts = {}
+        for scope, field in (
+            (USER_ADS, "user_id"),
+            (CATEGORY_ADS, "category"),
+            (CONDITION_ADS, "condition"),
+        ):
+            rows = (
+                models.Ad.objects.order_by()
+                .values_list(field, "status")
+                .annotate(total=Count("id"))
+            )
+            counts.update(
+                {(scope, str(key), status): total for key, status, total in rows}
+            )
+        return counts
@@ -1,8 +1,16 @@
 from django.urls import path
-from .views import AdListView, AdDetailView, AdCreateView, AdUpdateView, AdDeleteView
+from .views import (
+    AdListView,
+    AdSuggestView,
+    AdDetailView,
+    AdCreateView,
+    AdUpdateView,
+    AdDeleteView,
+)
 
 urlpatterns = [
     path("", AdListView.as_view(), name="ad_list"),
+    path("suggest/", AdSuggestView.as_view(), name="ad_suggest"),
     path("user/<str:username>/", AdListView.as_view(), name="user_ad_list"),
     path("<uuid:ad_id>/", AdDetailView.as_view(), name="ad_detail"),
     path("create/", AdCreateView.as_view(), name="ad_create"),
@@ -1,31 +1,69 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 
 from src.apps.ads.application.dto.ad import AdFilterDTO, CreateAdDTO, UpdateAdDTO, AdDTO
 from src.apps.ads.application.services.ad_service import AdService
-from src.apps.ads.domain import ItemCondition, ItemStatus
+from src.apps.ads.domain import ItemCondition, SearchMode
 from src.apps.ads.domain import ItemCategory
+from src.apps.ads.infrastructure.repository.count import ADS_CACHE_NAMESPACE
+from src.core.infrastructure.cache import get_namespace_version, versioned_key
 from src.core.application.exceptions import PermissionDeniedError
 from src.core.infrastructure.database.models import User
+from src.core.presentation.mixins import ConditionalGetMixin
 
 ad_service = AdService()
 
 
-class AdListView(View):
+class AdListView(ConditionalGetMixin, View):
+    def get_validators(self, request, username=None):
+        # Facets and totals span every status, and deletes leave no updated_at
+        # behind, so the ETag also follows the ads namespace version that all
+        # ad writes bump.
+        user_profile = self.get_user_profile(username)
+        if username and user_profile is None:
+            return (), None
+
+        last_modified = ad_service.get_ads_last_modified(
+            user_id=user_profile.id if user_profile else None
+        )
+        parts = (
+            get_namespace_version(ADS_CACHE_NAMESPACE),
+            last_modified,
+            request.get_full_path(),
+        )
+        return parts, last_modified
+
+    def get_user_profile(self, username):
+        if not hasattr(self, "_user_profile"):
+            self._user_profile = (
+                User.objects.filter(username=username).first() if username else None
+            )
+        return self._user_profile
+
     def get(self, request, username=None):
         page = int(request.GET.get("page", 1))
         search = request.GET.get("search", "")
         category = request.GET.get("category", "")
         condition = request.GET.get("condition", "")
         status = request.GET.get("status", "active")
+        search_mode = request.GET.get("mode", str(SearchMode.RANKED))
+        cursor = request.GET.get("cursor") or None
+
+        if search_mode not in SearchMode.get_modes():
+            search_mode = str(SearchMode.RANKED)
 
         user_profile = None
         is_owner = False
 
         if username:
-            user_profile = User.objects.filter(username=username).first()
+            user_profile = self.get_user_profile(username)
             if user_profile is not None:
                 is_owner = (
                     request.user.id == user_profile.id
@@ -33,61 +71,136 @@ class AdListView(View):
                     else False
                 )
 
-        filter_dto = AdFilterDTO(
-            page=page,
-            page_size=12,
-            keyword=search if search else None,
-            category=category,
-            condition=condition,
-            status=status if not is_owner else "",
-            user_id=user_profile.id if user_profile else None,
-        )
-
-        result = ad_service.list_ads(filter_dto)
-
-        ads = result["ads"]
-        page_size = result["page_size"]
-        total_items = result["total_items"]
-        total_pages = result["total_pages"]
-
-        has_previous = page > 1
-        has_next = page < total_pages
-
-        pagination_range = range(max(1, page - 2), min(total_pages + 1, page + 3))
-
-        categories = ItemCategory.get_categories()
-        conditions = ItemCondition.get_conditions()
-        statuses = ItemStatus.get_statuses()
+        # The results fragment depends only on the query string and the
+        # profile, so it is shared by everyone except the owner, who sees
+        # every status and the owner controls.
+        cache_key = None
+        results = None
+        options = getattr(settings, "AD_CACHE", {})
+        if not is_owner and options.get("ENABLED", True):
+            cache_key = versioned_key(
+                ADS_CACHE_NAMESPACE,
+                "list_page",
+                page,
+                search,
+                category,
+                condition,
+                status,
+                username,
+                search_mode,
+                cursor,
+            )
+            results = cache.get(cache_key)
+
+        if results is None:
+            filter_dto = AdFilterDTO(
+                page=page,
+                page_size=12,
+                keyword=search if search else None,
+                category=category,
+                condition=condition,
+                status=status if not is_owner else "",
+                user_id=user_profile.id if user_profile else None,
+                search_mode=search_mode,
+                cursor=cursor,
+                with_facets=True,
+            )
+            results = render_to_string(
+                "ads/ad_list_results.html",
+                self.get_results_context(
+                    ad_service.list_ads(filter_dto),
+                    search=search,
+                    search_mode=search_mode,
+                    category=category,
+                    condition=condition,
+                    status=status,
+                    user_profile=user_profile,
+                    is_owner=is_owner,
+                    is_user_filter=username is not None,
+                ),
+            )
+            if cache_key is not None:
+                cache.set(cache_key, str(results), options.get("PAGE_TIMEOUT", 60))
 
         return render(
             request,
             "ads/ad_list.html",
             {
-                "ads": ads,
-                "categories": categories,
-                "conditions": conditions,
-                "statuses": statuses,
-                "search": search,
-                "selected_category": category,
-                "selected_condition": condition,
-                "selected_status": status,
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_items,
-                "total_pages": total_pages,
-                "has_previous": has_previous,
-                "has_next": has_next,
-                "pagination_range": pagination_range,
+                "results": mark_safe(results),
                 "user_profile": user_profile,
                 "is_owner": is_owner,
                 "is_user_filter": username is not None,
             },
         )
 
+    @staticmethod
+    def get_results_context(
+        result, search, search_mode, category, condition, status, **extra
+    ):
+        page = result["page"]
+        total_pages = result["total_pages"]
+
+        pagination_range = []
+        if page is not None:
+            pagination_range = range(
+                max(1, page - 2), min(result["last_page"] + 1, page + 3)
+            )
+
+        facets = result["facets"]
+
+        return {
+            "ads": result["ads"],
+            "categories": list(facets["category"].items()),
+            "conditions": list(facets["condition"].items()),
+            "statuses": list(facets["status"].items()),
+            "search_modes": SearchMode.get_modes(),
+            "search": search,
+            "selected_mode": search_mode,
+            "selected_category": category,
+            "selected_condition": condition,
+            "selected_status": status,
+            "page": page,
+            "page_size": result["page_size"],
+            "total_items": result["total_items"],
+            "total_items_approximate": result["total_items_approximate"],
+            "total_pages": total_pages,
+            "has_previous": result["has_previous"],
+            "has_next": result["has_next"],
+            "pagination_range": pagination_range,
+            "next_cursor": result["next_cursor"],
+            "previous_cursor": result["previous_cursor"],
+            "suggestions": result["suggestions"],
+            **extra,
+        }
+
+
+class AdSuggestView(View):
+    async def get(self, request):
+        keyword = request.GET.get("q", "").strip()
+        suggestions = await ad_service.asuggest_titles(keyword, status="active")
+
+        return JsonResponse({"suggestions": suggestions})
+
+
+class AdDetailView(ConditionalGetMixin, View):
+    last_modified = None
+
+    def get_validators(self, request, ad_id):
+        self.last_modified = ad_service.get_ad_last_modified(ad_id)
+        if self.last_modified is None:
+            return (), None
+        return (ad_id, self.last_modified), self.last_modified
+
+    def get_ad(self, ad_id) -> AdDTO:
+        # The local cache tier may still hold an older copy in this process;
+        # it is only served when it is the version the validators describe.
+        ad = ad_service.get_ad(ad_id)
+        if self.last_modified is not None and ad.updated_at != self.last_modified:
+            ad = ad_service.get_ad(ad_id, use_cache=False)
+        return ad
 
-class AdDetailView(View):
     def get(self, request, ad_id):
-        ad: AdDTO = ad_service.get_ad(ad_id)
+        ad = self.get_ad(ad_id)
 
         context = {"ad": ad, "is_owner": ad.user_id == request.user.id}
 
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Self
+from typing import Any, Optional, Self
 
 from uuid6 import UUID
 
@@ -21,6 +21,8 @@ class ExchangeDTO(DTO):
     receiver_username: str = None
     sender_item: str = None
     receiver_item: str = None
+    sender_user_id: UUID = None
+    receiver_user_id: UUID = None
 
     @classmethod
     def from_request(cls, request: Any) -> Self: ...
@@ -88,3 +90,12 @@ class UpdateExchangeStatusDTO(DTO):
             user_id=request.user.id,
             status=ExchangeStatus(request.POST.get("status")),
         )
+
+
+@dataclass(frozen=True)
+class ExchangeFilterDTO:
+    user_id: UUID
+    status: Optional[str] = None
+    direction: str = str(domain.ExchangeDirection.ALL)
+    cursor: Optional[str] = None
+    page_size: int = 20
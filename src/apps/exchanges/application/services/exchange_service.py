@@ -1,10 +1,12 @@
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, replace
 from typing import Optional
 
+from asgiref.sync import sync_to_async
+from django.db import transaction
 from uuid6 import UUID
 
 from src.apps.ads.application.dto.ad import AdDTO
-from src.apps.ads.application.services.ad_service import AdService
 from src.apps.ads.domain import ItemStatus
 from src.apps.exchanges import domain
 from src.apps.ads.domain.entity import Ad
@@ -12,13 +14,19 @@ from src.apps.exchanges.application.dto.exchange import (
     CreateExchangeDTO,
     UpdateExchangeStatusDTO,
     ExchangeDTO,
+    ExchangeFilterDTO,
 )
 from src.apps.exchanges.infrastructure.repository.exchange_repo import (
     ExchangeRepository,
 )
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
 from src.apps.ads.infrastructure.repository.ad_repo import AdRepository
+from src.apps.ads.infrastructure.repository.stats import AdStats
+from src.apps.exchanges.infrastructure.repository.stats import ExchangeStats
+from src.core.infrastructure.counters import CounterRepository, merge_deltas
 from src.core.infrastructure.exceptions import NotFoundError
 from src.core.application.exceptions import PermissionDeniedError
+from src.core.application.pagination import Cursor, decode_cursor, encode_cursor
 
 """
 flex - 01974431-c8e4-72a7-a420-f5c4f7dffa0d
@@ -51,48 +59,91 @@ class ExchangeService:
             comment=proposal_data.comment,
         )
 
-        return ExchangeDTO.from_entity(ExchangeRepository.create(proposal))
+        with transaction.atomic():
+            created = ExchangeRepository.create(proposal)
+            CounterRepository.increment(
+                ExchangeStats.deltas(
+                    [ad_sender.user_id, ad_receiver.user_id], created.status.value
+                )
+            )
+
+        return ExchangeDTO.from_entity(created)
+
+    @staticmethod
+    async def acreate_proposal(proposal_data: CreateExchangeDTO) -> ExchangeDTO:
+        # transactions are bound to one connection, so writes keep the sync path
+        return await sync_to_async(ExchangeService.create_proposal)(proposal_data)
 
     @staticmethod
     def update_proposal_status(proposal_data: UpdateExchangeStatusDTO) -> ExchangeDTO:
-        proposal = ExchangeRepository.find_by_id(proposal_data.exchange_id)
-        if not proposal:
-            raise NotFoundError(
-                f"An exchange proposal with ID {proposal_data.exchange_id} not found"
-            )
+        with transaction.atomic():
+            locked = ExchangeRepository.lock_for_resolution(proposal_data.exchange_id)
+            if not locked:
+                raise NotFoundError(
+                    f"An exchange proposal with ID {proposal_data.exchange_id} not found"
+                )
 
-        ad_receiver = AdRepository.find_by_id(proposal.ad_receiver_id)
-        if not ad_receiver:
-            raise NotFoundError(
-                f"Ad receiver with ID {proposal.ad_receiver_id} not found"
-            )
+            proposal, ad_sender, ad_receiver = locked
 
-        if not ad_receiver.is_owner(proposal_data.user_id):
-            raise PermissionDeniedError(
-                "Only the author of the ad receiver can update the proposal"
-            )
+            if not ad_receiver.is_owner(proposal_data.user_id):
+                raise PermissionDeniedError(
+                    "Only the author of the ad receiver can update the proposal"
+                )
 
-        status = proposal_data.status.value
+            if proposal.status != domain.ExchangeStatus.PENDING:
+                raise PermissionDeniedError("Only pending exchanges can be updated")
 
-        if status == "accepted":
-            proposal.accept()
+            if proposal_data.status == domain.ExchangeStatus.ACCEPTED:
+                if (
+                    ad_sender.status != ItemStatus.ACTIVE
+                    or ad_receiver.status != ItemStatus.ACTIVE
+                ):
+                    raise PermissionDeniedError(
+                        "Both ads must be active to accept the exchange"
+                    )
 
-            ad_service = AdService()
-            ad_service.update_ad_status(proposal.ad_sender_id, ItemStatus.TRADED)
-            ad_service.update_ad_status(proposal.ad_receiver_id, ItemStatus.TRADED)
-        else:
-            proposal.reject()
+                proposal.accept()
+                deltas = merge_deltas(
+                    AdStats.change(ad_sender, replace(ad_sender, status=ItemStatus.TRADED)),
+                    AdStats.change(
+                        ad_receiver, replace(ad_receiver, status=ItemStatus.TRADED)
+                    ),
+                    ExchangeStats.from_entries(
+                        InboxRepository.competing(proposal),
+                        status=domain.ExchangeStatus.REJECTED.value,
+                    ),
+                )
+
+                AdRepository.bulk_update_status(
+                    [ad_sender.id, ad_receiver.id], ItemStatus.TRADED
+                )
+                ExchangeRepository.reject_competing(proposal)
+                InboxRepository.reject_competing(proposal)
+            else:
+                proposal.reject()
+                deltas = {}
 
-        return ExchangeDTO.from_entity(ExchangeRepository.update_status(proposal))
+            CounterRepository.increment(
+                merge_deltas(
+                    deltas,
+                    ExchangeStats.change(
+                        [ad_sender.user_id, ad_receiver.user_id],
+                        domain.ExchangeStatus.PENDING.value,
+                        proposal.status.value,
+                    ),
+                )
+            )
+            InboxRepository.update_status(proposal)
+            return ExchangeDTO.from_entity(ExchangeRepository.update_status(proposal))
 
     @staticmethod
     def delete_exchange(exchange_id: UUID, user_id: UUID) -> bool:
         exchange = ExchangeRepository.find_by_id(exchange_id)
-        ad_sender = AdRepository.find_by_id(exchange.ad_sender_id)
-
         if not exchange:
             raise NotFoundError(f"An exchange proposal with ID {exchange_id} not found")
 
+        ad_sender = AdRepository.find_by_id(exchange.ad_sender_id)
+
         if not ad_sender.is_owner(user_id):
             raise PermissionDeniedError(
                 "You do not have permission to cancel this exchange"
@@ -101,7 +152,12 @@ class ExchangeService:
         if exchange.status.value != "pending":
             raise PermissionDeniedError("Only pending exchanges can be deleted")
 
-        return ExchangeRepository.delete(exchange_id)
+        with transaction.atomic():
+            deltas = ExchangeStats.from_entries(InboxRepository.entries(exchange_id))
+            deleted = ExchangeRepository.delete(exchange_id)
+            CounterRepository.increment(deltas)
+
+        return deleted
 
     @staticmethod
     def get_exchange(exchange_id: UUID) -> Optional[ExchangeDTO]:
@@ -110,6 +166,13 @@ class ExchangeService:
             raise NotFoundError(f"An exchange proposal with ID {exchange_id} not found")
         return ExchangeDTO.from_entity(exchange)
 
+    @staticmethod
+    async def aget_exchange(exchange_id: UUID) -> Optional[ExchangeDTO]:
+        exchange = await ExchangeRepository.afind_by_id(exchange_id)
+        if not exchange:
+            raise NotFoundError(f"An exchange proposal with ID {exchange_id} not found")
+        return ExchangeDTO.from_entity(exchange)
+
     @staticmethod
     def get_user_proposals(user_id: UUID) -> Optional[list[ExchangeDTO]]:
         exchanges = ExchangeRepository.find_user_proposals(user_id)
@@ -119,6 +182,15 @@ class ExchangeService:
             )
         return [ExchangeDTO.from_entity(exchange) for exchange in exchanges]
 
+    @staticmethod
+    async def aget_user_proposals(user_id: UUID) -> Optional[list[ExchangeDTO]]:
+        exchanges = await ExchangeRepository.afind_user_proposals(user_id)
+        if not exchanges:
+            raise NotFoundError(
+                f"An exchange proposal with user ID {user_id} not found"
+            )
+        return [ExchangeDTO.from_entity(exchange) for exchange in exchanges]
+
     @staticmethod
     def get_proposals_by_sender_ad_id(ad_id: UUID) -> Optional[list[ExchangeDTO]]:
         exchanges = ExchangeRepository.find_by_sender_ad_id(ad_id)
@@ -149,11 +221,94 @@ class ExchangeService:
             raise NotFoundError(f"An exchange proposal with ID {user_id} not found")
         return exchange_dtos
 
+    @staticmethod
+    def list_user_proposals(filter: ExchangeFilterDTO) -> dict:
+        cursor = decode_cursor(filter.cursor)
+        window = InboxRepository.filter(
+            filter.user_id, **ExchangeService._window(filter, cursor)
+        )
+        return ExchangeService._proposals_page(filter, cursor, window)
+
+    @staticmethod
+    async def alist_user_proposals(filter: ExchangeFilterDTO) -> dict:
+        cursor = decode_cursor(filter.cursor)
+        window = await InboxRepository.afilter(
+            filter.user_id, **ExchangeService._window(filter, cursor)
+        )
+        return ExchangeService._proposals_page(filter, cursor, window)
+
+    @staticmethod
+    def _window(filter: ExchangeFilterDTO, cursor: Optional[Cursor]) -> dict:
+        """One entry past the page tells whether another page follows."""
+        return {
+            "statuses": [filter.status] if filter.status else [],
+            "direction": filter.direction,
+            "created_at": cursor.created_at if cursor else None,
+            "exchange_id": cursor.id if cursor else None,
+            "backwards": bool(cursor and cursor.backwards),
+            "limit": filter.page_size + 1,
+        }
+
+    @staticmethod
+    def _proposals_page(
+        filter: ExchangeFilterDTO, cursor: Optional[Cursor], window: list[ExchangeDTO]
+    ) -> dict:
+        backwards = bool(cursor and cursor.backwards)
+        has_more = len(window) > filter.page_size
+        exchanges = window[: filter.page_size]
+
+        if backwards:
+            exchanges.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        next_cursor = previous_cursor = None
+        if exchanges:
+            if has_next:
+                next_cursor = encode_cursor(exchanges[-1].created_at, exchanges[-1].id)
+            if has_previous:
+                previous_cursor = encode_cursor(
+                    exchanges[0].created_at, exchanges[0].id, backwards=True
+                )
+
+        return {
+            "exchanges": exchanges,
+            "has_next": has_next,
+            "has_previous": has_previous,
+            "next_cursor": next_cursor,
+            "previous_cursor": previous_cursor,
+        }
+
+    @staticmethod
+    def get_recent_user_proposals(user_id: UUID, limit: int = 5) -> dict:
+        pending = domain.ExchangeStatus.PENDING.value
+        completed = domain.ExchangeStatus.get_exchange_statuses() - {pending}
+
+        return {
+            "pending": InboxRepository.filter(user_id, statuses=[pending], limit=limit),
+            "completed": InboxRepository.filter(
+                user_id, statuses=sorted(completed), limit=limit
+            ),
+        }
+
     @staticmethod
     def get_exchange_participants(exchange: ExchangeDTO, user_id: UUID):
         sender_ad = AdRepository.find_by_id(exchange.ad_sender_id)
         receiver_ad = AdRepository.find_by_id(exchange.ad_receiver_id)
+        return ExchangeService._participants(sender_ad, receiver_ad, user_id)
+
+    @staticmethod
+    async def aget_exchange_participants(exchange: ExchangeDTO, user_id: UUID):
+        # the two ads are independent, cache hits resolve without waiting on each other
+        sender_ad, receiver_ad = await asyncio.gather(
+            AdRepository.afind_by_id(exchange.ad_sender_id),
+            AdRepository.afind_by_id(exchange.ad_receiver_id),
+        )
+        return ExchangeService._participants(sender_ad, receiver_ad, user_id)
 
+    @staticmethod
+    def _participants(sender_ad: Ad, receiver_ad: Ad, user_id: UUID):
         if not sender_ad.is_owner(user_id) and not receiver_ad.is_owner(user_id):
             raise PermissionDeniedError(
                 "You do not have permission to view this exchange"
@@ -1,7 +1,9 @@
 from src.apps.exchanges.domain.entity import Exchange
+from src.apps.exchanges.domain.values.direction import ExchangeDirection
 from src.apps.exchanges.domain.values.status import ExchangeStatus
 
 __all__ = (
     "Exchange",
+    "ExchangeDirection",
     "ExchangeStatus",
-)
\ No newline at end of file
+)
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from enum import Enum
+
+
+@dataclass(frozen=True, eq=False)
+class ExchangeDirection(Enum):
+    ALL = "all"
+    SENT = "sent"
+    RECEIVED = "received"
+
+    @classmethod
+    def get_directions(cls) -> list[str]:
+        return [direction.value for direction in cls]
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ExchangeDirection):
+            return self.value == other.value
+        return False
+
+    def __hash__(self) -> int:
+        return hash(self.value)
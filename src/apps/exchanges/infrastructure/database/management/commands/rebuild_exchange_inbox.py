@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from uuid6 import UUID
+
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
+
+
+class Command(BaseCommand):
+    help = "Rebuild the exchange inbox projection from the exchange table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=UUID,
+            help="Only rebuild the entries of exchanges this user takes part in",
+        )
+
+    def handle(self, *args, **options):
+        rows = InboxRepository.rebuild(user_id=options["user"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} exchange inbox entries"))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ad', '0005_ad_query_indexes'),
+        ('exchange', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exchange',
+            index=models.Index(fields=['ad_receiver', 'status', '-created_at'], name='exchange_receiver_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exchange',
+            index=models.Index(fields=['ad_sender', 'status', '-created_at'], name='exchange_sender_status_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+BACKFILL_SQL = """
+    INSERT INTO exchange_inbox (
+        exchange_id, user_id, direction, status,
+        ad_sender_id, ad_receiver_id, sender_user_id, receiver_user_id,
+        sender_username, receiver_username, sender_item, receiver_item,
+        comment, created_at, updated_at
+    )
+    SELECT
+        e.id, owner.user_id, owner.direction, e.status,
+        e.ad_sender_id, e.ad_receiver_id, sa.user_id, ra.user_id,
+        su.username, ru.username, sa.title, ra.title,
+        e.comment, e.created_at, now()
+    FROM exchange e
+    JOIN ad sa ON sa.id = e.ad_sender_id
+    JOIN "user" su ON su.id = sa.user_id
+    JOIN ad ra ON ra.id = e.ad_receiver_id
+    JOIN "user" ru ON ru.id = ra.user_id
+    CROSS JOIN LATERAL (
+        VALUES (sa.user_id, 'sent'), (ra.user_id, 'received')
+    ) AS owner (user_id, direction)
+    WHERE owner.direction = 'sent' OR sa.user_id <> ra.user_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exchange', '0002_exchange_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('direction', models.CharField(choices=[('sent', 'sent'), ('received', 'received')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('accepted', 'accepted'), ('rejected', 'rejected')], max_length=20)),
+                ('ad_sender_id', models.UUIDField()),
+                ('ad_receiver_id', models.UUIDField()),
+                ('sender_user_id', models.UUIDField()),
+                ('receiver_user_id', models.UUIDField()),
+                ('sender_username', models.CharField(max_length=150)),
+                ('receiver_username', models.CharField(max_length=150)),
+                ('sender_item', models.CharField(max_length=200)),
+                ('receiver_item', models.CharField(max_length=200)),
+                ('comment', models.TextField(null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('exchange', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='inbox_entries', to='exchange.exchange')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='exchange_inbox', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Exchange inbox entry',
+                'verbose_name_plural': 'Exchange inbox',
+                'db_table': 'exchange_inbox',
+                'ordering': ['-created_at', '-exchange'],
+                'indexes': [models.Index(fields=['user', '-created_at', '-exchange'], name='inbox_user_created_idx'), models.Index(fields=['user', 'status', '-created_at', '-exchange'], name='inbox_user_status_idx'), models.Index(fields=['user', 'direction', 'status', '-created_at', '-exchange'], name='inbox_user_direction_idx'), models.Index(fields=['ad_sender_id'], name='inbox_ad_sender_idx'), models.Index(fields=['ad_receiver_id'], name='inbox_ad_receiver_idx')],
+                'constraints': [models.UniqueConstraint(fields=('exchange', 'direction'), name='inbox_exchange_direction_uniq')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from uuid6 import uuid7
-from src.core.infrastructure.database.models import TimedBaseModel
+from src.core.infrastructure.database.models import TimedBaseModel, User
 from src.apps.ads.infrastructure.database.models import Ad
 
 
@@ -33,4 +33,79 @@ class Exchange(TimedBaseModel):
         db_table = 'exchange'
         verbose_name = 'Exchange'
         verbose_name_plural = 'Exchanges'
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['ad_receiver', 'status', '-created_at'],
+                name='exchange_receiver_status_idx',
+            ),
+            models.Index(
+                fields=['ad_sender', 'status', '-created_at'],
+                name='exchange_sender_status_idx',
+            ),
+        ]
+
+
+class ExchangeInbox(models.Model):
+    """
+    Read-side projection of exchanges: one row per participant and direction,
+    with usernames and item titles copied in, so listings need no joins.
+    """
+    DIRECTION_CHOICES = [
+        ('sent', 'sent'),
+        ('received', 'received'),
+    ]
+    exchange = models.ForeignKey(
+        Exchange,
+        on_delete=models.CASCADE,
+        related_name='inbox_entries',
+        db_index=False,
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='exchange_inbox',
+        db_index=False,
+    )
+    direction = models.CharField(max_length=10, choices=DIRECTION_CHOICES)
+    status = models.CharField(max_length=20, choices=Exchange.STATUS_CHOICES)
+    ad_sender_id = models.UUIDField()
+    ad_receiver_id = models.UUIDField()
+    sender_user_id = models.UUIDField()
+    receiver_user_id = models.UUIDField()
+    sender_username = models.CharField(max_length=150)
+    receiver_username = models.CharField(max_length=150)
+    sender_item = models.CharField(max_length=200)
+    receiver_item = models.CharField(max_length=200)
+    comment = models.TextField(null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'exchange'
+        db_table = 'exchange_inbox'
+        verbose_name = 'Exchange inbox entry'
+        verbose_name_plural = 'Exchange inbox'
+        ordering = ['-created_at', '-exchange']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['exchange', 'direction'],
+                name='inbox_exchange_direction_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at', '-exchange'],
+                name='inbox_user_created_idx',
+            ),
+            models.Index(
+                fields=['user', 'status', '-created_at', '-exchange'],
+                name='inbox_user_status_idx',
+            ),
+            models.Index(
+                fields=['user', 'direction', 'status', '-created_at', '-exchange'],
+                name='inbox_user_direction_idx',
+            ),
+            models.Index(fields=['ad_sender_id'], name='inbox_ad_sender_idx'),
+            models.Index(fields=['ad_receiver_id'], name='inbox_ad_receiver_idx'),
+        ]
@@ -1,12 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 from uuid6 import UUID
+from src.apps.ads import domain as ads_domain
+from src.apps.ads.infrastructure.repository.mapper import AdMapper
 from src.apps.exchanges import domain
 from src.apps.exchanges.application.dto.exchange import ExchangeDTO
 from src.apps.exchanges.infrastructure.database import models
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
 from src.apps.exchanges.infrastructure.repository.mapper import ExchangeMapper
+from src.core.infrastructure.database.routers import read_db
+from src.core.infrastructure.exceptions import NotFoundError
 
 
 @dataclass
@@ -14,17 +21,63 @@ class ExchangeRepository:
     @staticmethod
     def create(exchange: domain.Exchange) -> domain.Exchange:
         proposal_model = ExchangeMapper.from_entity(exchange)
-        proposal_model.save()
-        return exchange
+        with transaction.atomic():
+            proposal_model.save(force_insert=True)
+            InboxRepository.add(proposal_model.id)
+        return ExchangeMapper.from_saved(proposal_model, exchange)
 
     @staticmethod
     def update_status(proposal: domain.Exchange) -> domain.Exchange:
-        proposal_model = ExchangeMapper.from_entity(proposal)
+        updated_at = timezone.now()
+        updated = models.Exchange.objects.filter(id=proposal.id).update(
+            status=proposal.status.value, updated_at=updated_at
+        )
+
+        if not updated:
+            raise NotFoundError(f"An exchange proposal with ID {proposal.id} not found")
+
+        proposal.updated_at = updated_at
+        return proposal
+
+    @staticmethod
+    def lock_for_resolution(
+        exchange_id: UUID,
+    ) -> Optional[Tuple[domain.Exchange, ads_domain.Ad, ads_domain.Ad]]:
+        """
+        Load the exchange with both ads in one query, row-locking the exchange
+        and the two ads until the surrounding transaction ends.
+        """
+        try:
+            exchange_model = (
+                models.Exchange.objects.select_related(
+                    "ad_sender__user", "ad_receiver__user"
+                )
+                .select_for_update(of=("self", "ad_sender", "ad_receiver"))
+                .get(id=exchange_id)
+            )
+        except models.Exchange.DoesNotExist:
+            return None
+
+        return (
+            ExchangeMapper.to_entity(exchange_model),
+            AdMapper.to_entity(exchange_model.ad_sender),
+            AdMapper.to_entity(exchange_model.ad_receiver),
+        )
 
-        # here we tell django that this model is not new
-        proposal_model._state.adding = False
-        proposal_model.save()
-        return ExchangeRepository.find_by_id(proposal.id)
+    @staticmethod
+    def reject_competing(proposal: domain.Exchange) -> int:
+        """Reject other pending proposals that involve either ad of ``proposal``."""
+        ad_ids = [proposal.ad_sender_id, proposal.ad_receiver_id]
+        return (
+            models.Exchange.objects.filter(
+                Q(ad_sender_id__in=ad_ids) | Q(ad_receiver_id__in=ad_ids),
+                status=domain.ExchangeStatus.PENDING.value,
+            )
+            .exclude(id=proposal.id)
+            .update(
+                status=domain.ExchangeStatus.REJECTED.value, updated_at=timezone.now()
+            )
+        )
 
     @staticmethod
     def delete(exchange_id: UUID) -> bool:
@@ -43,17 +96,43 @@ class ExchangeRepository:
         except models.Exchange.DoesNotExist:
             return None
 
+    @staticmethod
+    async def afind_by_id(exchange_id: UUID) -> Optional[domain.Exchange]:
+        try:
+            exchange_model = await models.Exchange.objects.aget(id=exchange_id)
+        except models.Exchange.DoesNotExist:
+            return None
+        return ExchangeMapper.to_entity(exchange_model)
+
     @staticmethod
     def find_user_proposals(user_id: UUID) -> list[domain.Exchange]:
-        user_ads = models.Ad.objects.filter(user_id=user_id).values_list(
-            "id", flat=True
-        )
+        return [
+            ExchangeMapper.to_entity(model)
+            for model in ExchangeRepository._user_proposals_queryset(user_id)
+        ]
 
-        proposal_models = models.Exchange.objects.filter(
-            Q(ad_sender_id__in=user_ads) | Q(ad_receiver_id__in=user_ads)
+    @staticmethod
+    async def afind_user_proposals(user_id: UUID) -> list[domain.Exchange]:
+        return [
+            ExchangeMapper.to_entity(model)
+            async for model in ExchangeRepository._user_proposals_queryset(user_id)
+        ]
+
+    @staticmethod
+    def _user_proposals_queryset(user_id: UUID) -> QuerySet:
+        """
+        Sent and received proposals as two index-driven branches glued with
+        UNION ALL. The received branch skips proposals between the user's own
+        ads, which the sent branch already returned.
+        """
+        sent = models.Exchange.objects.filter(ad_sender__user_id=user_id).order_by()
+        received = (
+            models.Exchange.objects.filter(ad_receiver__user_id=user_id)
+            .exclude(ad_sender__user_id=user_id)
+            .order_by()
         )
 
-        return [ExchangeMapper.to_entity(model) for model in proposal_models]
+        return sent.union(received, all=True).order_by("-created_at")
 
     @staticmethod
     def find_by_sender_ad_id(ad_id: UUID) -> list[domain.Exchange]:
@@ -105,34 +184,53 @@ class ExchangeRepository:
     @staticmethod
     def get_all_user_proposals_data(user_id: UUID) -> list[ExchangeDTO]:
         exchanges = (
-            models.Exchange.objects.filter(
-                Q(ad_sender__user_id=user_id) | Q(ad_receiver__user_id=user_id)
-            )
-            .select_related(
-                "ad_sender", "ad_receiver", "ad_sender__user", "ad_receiver__user"
-            )
-            .all()
+            ExchangeRepository._data_queryset()
+            .using(read_db())
+            .filter(Q(ad_sender__user_id=user_id) | Q(ad_receiver__user_id=user_id))
         )
 
-        return [
-            ExchangeDTO(
-                id=exchange.id,
-                ad_sender_id=exchange.ad_sender.id,
-                ad_receiver_id=exchange.ad_receiver.id,
-                comment=exchange.comment,
-                status=exchange.status,
-                created_at=exchange.created_at,
-                sender_username=exchange.ad_sender.user.username,
-                receiver_username=exchange.ad_receiver.user.username,
-                sender_item=exchange.ad_sender.title,
-                receiver_item=exchange.ad_receiver.title,
-            )
-            for exchange in exchanges
-        ]
+        return [ExchangeRepository._to_data(exchange) for exchange in exchanges]
+
+    @staticmethod
+    def _data_queryset():
+        """Exchanges joined to both ads and owners, fetching only what the DTO shows."""
+        return models.Exchange.objects.select_related(
+            "ad_sender__user", "ad_receiver__user"
+        ).only(
+            "id",
+            "ad_sender_id",
+            "ad_receiver_id",
+            "comment",
+            "status",
+            "created_at",
+            "ad_sender__title",
+            "ad_sender__user_id",
+            "ad_sender__user__username",
+            "ad_receiver__title",
+            "ad_receiver__user_id",
+            "ad_receiver__user__username",
+        )
+
+    @staticmethod
+    def _to_data(exchange: models.Exchange) -> ExchangeDTO:
+        return ExchangeDTO(
+            id=exchange.id,
+            ad_sender_id=exchange.ad_sender_id,
+            ad_receiver_id=exchange.ad_receiver_id,
+            comment=exchange.comment,
+            status=exchange.status,
+            created_at=exchange.created_at,
+            sender_username=exchange.ad_sender.user.username,
+            receiver_username=exchange.ad_receiver.user.username,
+            sender_item=exchange.ad_sender.title,
+            receiver_item=exchange.ad_receiver.title,
+            sender_user_id=exchange.ad_sender.user_id,
+            receiver_user_id=exchange.ad_receiver.user_id,
+        )
 
     @staticmethod
     def get_exchanges() -> list[ExchangeDTO]:
-        exchanges = models.Exchange.objects.all().select_related(
+        exchanges = models.Exchange.objects.using(read_db()).select_related(
             "ad_sender", "ad_receiver", "ad_sender__user", "ad_receiver__user"
         )
 
@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from uuid6 import UUID
+
+from src.apps.exchanges import domain
+from src.apps.exchanges.application.dto.exchange import ExchangeDTO
+from src.apps.exchanges.infrastructure.database import models
+from src.core.infrastructure.database.routers import read_db
+from src.core.infrastructure.pagination import seek
+
+
+# One row per participant: the sender's "sent" entry and, unless both ads
+# belong to the same user, the receiver's "received" entry.
+PROJECT_SQL = """
+    INSERT INTO exchange_inbox (
+        exchange_id, user_id, direction, status,
+        ad_sender_id, ad_receiver_id, sender_user_id, receiver_user_id,
+        sender_username, receiver_username, sender_item, receiver_item,
+        comment, created_at, updated_at
+    )
+    SELECT
+        e.id, owner.user_id, owner.direction, e.status,
+        e.ad_sender_id, e.ad_receiver_id, sa.user_id, ra.user_id,
+        su.username, ru.username, sa.title, ra.title,
+        e.comment, e.created_at, now()
+    FROM exchange e
+    JOIN ad sa ON sa.id = e.ad_sender_id
+    JOIN "user" su ON su.id = sa.user_id
+    JOIN ad ra ON ra.id = e.ad_receiver_id
+    JOIN "user" ru ON ru.id = ra.user_id
+    CROSS JOIN LATERAL (
+        VALUES (sa.user_id, 'sent'), (ra.user_id, 'received')
+    ) AS owner (user_id, direction)
+    WHERE (owner.direction = 'sent' OR sa.user_id <> ra.user_id) {condition}
+    ON CONFLICT (exchange_id, direction) DO NOTHING
+"""
+
+
+@dataclass
+class InboxRepository:
+    @staticmethod
+    def add(exchange_id: UUID) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(PROJECT_SQL.format(condition="AND e.id = %s"), [exchange_id])
+
+    @staticmethod
+    def update_status(proposal: domain.Exchange) -> int:
+        return InboxRepository.entries(proposal.id).update(
+            status=proposal.status.value, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def reject_competing(proposal: domain.Exchange) -> int:
+        """Mirror of ``ExchangeRepository.reject_competing`` on the projection."""
+        return InboxRepository.competing(proposal).update(
+            status=domain.ExchangeStatus.REJECTED.value, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def competing(proposal: domain.Exchange) -> QuerySet:
+        """Pending entries of other proposals that involve either ad of ``proposal``."""
+        ad_ids = [proposal.ad_sender_id, proposal.ad_receiver_id]
+        return models.ExchangeInbox.objects.filter(
+            Q(ad_sender_id__in=ad_ids) | Q(ad_receiver_id__in=ad_ids),
+            status=domain.ExchangeStatus.PENDING.value,
+        ).exclude(exchange_id=proposal.id)
+
+    @staticmethod
+    def entries(exchange_id: UUID) -> QuerySet:
+        return models.ExchangeInbox.objects.filter(exchange_id=exchange_id)
+
+    @staticmethod
+    def entries_for_ad(ad_id: UUID) -> QuerySet:
+        return models.ExchangeInbox.objects.filter(
+            Q(ad_sender_id=ad_id) | Q(ad_receiver_id=ad_id)
+        )
+
+    @staticmethod
+    def rename_item(ad_id: UUID, title: str) -> None:
+        now = timezone.now()
+        models.ExchangeInbox.objects.filter(ad_sender_id=ad_id).update(
+            sender_item=title, updated_at=now
+        )
+        models.ExchangeInbox.objects.filter(ad_receiver_id=ad_id).update(
+            receiver_item=title, updated_at=now
+        )
+
+    @staticmethod
+    def rebuild(user_id: Optional[UUID] = None) -> int:
+        """Recreate the projection from ``exchange``, for one user or everyone."""
+        with transaction.atomic():
+            entries = models.ExchangeInbox.objects.all()
+            condition, params = "", []
+
+            if user_id:
+                entries = entries.filter(
+                    Q(sender_user_id=user_id) | Q(receiver_user_id=user_id)
+                )
+                condition, params = "AND (sa.user_id = %s OR ra.user_id = %s)", [
+                    user_id,
+                    user_id,
+                ]
+
+            entries.delete()
+
+            with connection.cursor() as cursor:
+                cursor.execute(PROJECT_SQL.format(condition=condition), params)
+                return cursor.rowcount
+
+    @staticmethod
+    def filter(
+        user_id: UUID,
+        statuses: Iterable[str] = (),
+        direction: str = str(domain.ExchangeDirection.ALL),
+        created_at: Optional[datetime] = None,
+        exchange_id: Optional[UUID] = None,
+        backwards: bool = False,
+        limit: int = 20,
+    ) -> list[ExchangeDTO]:
+        entries = InboxRepository._filter_queryset(
+            user_id, statuses, direction, created_at, exchange_id, backwards, limit
+        )
+        return [InboxRepository._to_data(entry) for entry in entries]
+
+    @staticmethod
+    async def afilter(
+        user_id: UUID,
+        statuses: Iterable[str] = (),
+        direction: str = str(domain.ExchangeDirection.ALL),
+        created_at: Optional[datetime] = None,
+        exchange_id: Optional[UUID] = None,
+        backwards: bool = False,
+        limit: int = 20,
+    ) -> list[ExchangeDTO]:
+        entries = InboxRepository._filter_queryset(
+            user_id, statuses, direction, created_at, exchange_id, backwards, limit
+        )
+        return [InboxRepository._to_data(entry) async for entry in entries]
+
+    @staticmethod
+    def _filter_queryset(
+        user_id: UUID,
+        statuses: Iterable[str],
+        direction: str,
+        created_at: Optional[datetime],
+        exchange_id: Optional[UUID],
+        backwards: bool,
+        limit: int,
+    ) -> QuerySet:
+        queryset = models.ExchangeInbox.objects.using(read_db()).filter(user_id=user_id)
+
+        direction = domain.ExchangeDirection(direction)
+        if direction != domain.ExchangeDirection.ALL:
+            queryset = queryset.filter(direction=direction.value)
+
+        statuses = list(statuses)
+        if len(statuses) == 1:
+            queryset = queryset.filter(status=statuses[0])
+        elif statuses:
+            queryset = queryset.filter(status__in=statuses)
+
+        return seek(
+            queryset, created_at, exchange_id, backwards=backwards, pk_field="exchange_id"
+        )[:limit]
+
+    @staticmethod
+    def _to_data(entry: models.ExchangeInbox) -> ExchangeDTO:
+        return ExchangeDTO(
+            id=entry.exchange_id,
+            ad_sender_id=entry.ad_sender_id,
+            ad_receiver_id=entry.ad_receiver_id,
+            comment=entry.comment,
+            status=entry.status,
+            created_at=entry.created_at,
+            sender_username=entry.sender_username,
+            receiver_username=entry.receiver_username,
+            sender_item=entry.sender_item,
+            receiver_item=entry.receiver_item,
+            sender_user_id=entry.sender_user_id,
+            receiver_user_id=entry.receiver_user_id,
+        )
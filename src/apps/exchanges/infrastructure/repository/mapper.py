@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 from src.apps.exchanges import domain
 from src.apps.exchanges.infrastructure.database import models
 
@@ -6,13 +8,22 @@ class ExchangeMapper:
     def to_entity(instance: models.Exchange) -> domain.Exchange:
         return domain.Exchange(
             id=instance.id,
-            ad_sender_id=instance.ad_sender.id,
-            ad_receiver_id=instance.ad_receiver.id,
+            ad_sender_id=instance.ad_sender_id,
+            ad_receiver_id=instance.ad_receiver_id,
             comment=instance.comment,
             created_at=instance.created_at,
+            updated_at=instance.updated_at,
             status=domain.ExchangeStatus(instance.status)
         )
 
+    @staticmethod
+    def from_saved(instance: models.Exchange, entity: domain.Exchange) -> domain.Exchange:
+        return replace(
+            entity,
+            created_at=instance.created_at,
+            updated_at=instance.updated_at,
+        )
+
     @staticmethod
     def from_entity(entity: domain.Exchange) -> models.Exchange:
         return models.Exchange(
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.db.models import Count, F, QuerySet
+from uuid6 import UUID
+
+from src.apps.exchanges import domain
+from src.apps.exchanges.infrastructure.database import models
+from src.core.infrastructure.counters import CounterKey, merge_deltas
+
+USER_EXCHANGES = "user_exchanges"
+PENDING = "pending"
+COMPLETED = "completed"
+
+
+def bucket(status: str) -> str:
+    return PENDING if status == domain.ExchangeStatus.PENDING.value else COMPLETED
+
+
+@dataclass
+class ExchangeStats:
+    """Per-user counts of pending and completed (accepted or rejected) exchanges."""
+
+    @staticmethod
+    def deltas(
+        user_ids: Iterable[UUID], status: str, sign: int = 1
+    ) -> dict[CounterKey, int]:
+        return {
+            (USER_EXCHANGES, str(user_id), bucket(status)): sign
+            for user_id in set(user_ids)
+        }
+
+    @staticmethod
+    def change(
+        user_ids: Iterable[UUID], before: str, after: str
+    ) -> dict[CounterKey, int]:
+        user_ids = set(user_ids)
+        return merge_deltas(
+            ExchangeStats.deltas(user_ids, before, -1),
+            ExchangeStats.deltas(user_ids, after),
+        )
+
+    @staticmethod
+    def from_entries(
+        entries: QuerySet, sign: int = -1, status: str = None
+    ) -> dict[CounterKey, int]:
+        """
+        Deltas for the exchanges behind a set of inbox entries: removed when
+        ``status`` is None, otherwise moved to ``status``. Costs one query.
+        """
+        rows = (
+            entries.order_by().values_list("user_id", "status").annotate(total=Count("id"))
+        )
+
+        deltas = {}
+        for user_id, current, total in rows:
+            key = str(user_id)
+            if status is None:
+                deltas = merge_deltas(
+                    deltas, {(USER_EXCHANGES, key, bucket(current)): sign * total}
+                )
+            else:
+                deltas = merge_deltas(
+                    deltas,
+                    {
+                        (USER_EXCHANGES, key, bucket(current)): -total,
+                        (USER_EXCHANGES, key, bucket(status)): total,
+                    },
+                )
+        return deltas
+
+    @staticmethod
+    def recount() -> dict[CounterKey, int]:
+        sent = (
+            models.Exchange.objects.order_by()
+            .values_list("ad_sender__user_id", "status")
+            .annotate(total=Count("id"))
+        )
+        received = (
+            models.Exchange.objects.exclude(
+                ad_sender__user_id=F("ad_receiver__user_id")
+            )
+            .order_by()
+            .values_list("ad_receiver__user_id", "status")
+            .annotate(total=Count("id"))
+        )
+
+        counts = {}
+        for rows in (sent, received):
+            for user_id, status, total in rows:
+                counts = merge_deltas(
+                    counts, {(USER_EXCHANGES, str(user_id), bucket(status)): total}
+                )
+        return counts
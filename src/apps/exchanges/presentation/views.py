@@ -1,3 +1,5 @@
+import asyncio
+
 from django.shortcuts import render, redirect
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -7,50 +9,58 @@ from src.apps.exchanges.application.services.exchange_service import ExchangeSer
 from src.apps.exchanges.application.dto.exchange import (
     CreateExchangeDTO,
     UpdateExchangeStatusDTO,
+    ExchangeFilterDTO,
 )
+from src.apps.exchanges.domain.values.direction import ExchangeDirection
 from src.apps.exchanges.domain.values.status import ExchangeStatus
 from src.apps.ads.application.services.ad_service import AdService
+from src.core.presentation.mixins import AsyncLoginRequiredMixin
 
 exchange_service = ExchangeService()
 ad_service = AdService()
 
 
-class ExchangeListView(LoginRequiredMixin, View):
-    def get(self, request):
-        filter_type = request.GET.get("filter_type", "all")
+class ExchangeListView(AsyncLoginRequiredMixin, View):
+    async def get(self, request):
+        filter_type = request.GET.get("filter_type", str(ExchangeDirection.ALL))
         status_filter = request.GET.get("status", "")
+        cursor = request.GET.get("cursor") or None
 
-        user_ads = ad_service.get_user_ads(request.user.id)
-        user_ad_ids = [ad.id for ad in user_ads]
-
-        exchanges = exchange_service.get_all_user_proposals_data(request.user.id)
-
-        if status_filter:
-            exchanges = [e for e in exchanges if e.status == status_filter]
-
-        if filter_type == "sent":
-            exchanges = [e for e in exchanges if e.ad_sender_id in user_ad_ids]
-        elif filter_type == "received":
-            exchanges = [e for e in exchanges if e.ad_receiver_id in user_ad_ids]
+        if filter_type not in ExchangeDirection.get_directions():
+            filter_type = str(ExchangeDirection.ALL)
 
         statuses = ExchangeStatus.get_exchange_statuses()
+        if status_filter not in statuses:
+            status_filter = ""
+
+        result = await exchange_service.alist_user_proposals(
+            ExchangeFilterDTO(
+                user_id=request.user.id,
+                status=status_filter or None,
+                direction=filter_type,
+                cursor=cursor,
+            )
+        )
 
         context = {
-            "exchanges": exchanges,
-            "user_ads_ids": user_ad_ids,
+            "exchanges": result["exchanges"],
             "filter_type": filter_type,
             "status": status_filter,
             "statuses": statuses,
+            "has_next": result["has_next"],
+            "has_previous": result["has_previous"],
+            "next_cursor": result["next_cursor"],
+            "previous_cursor": result["previous_cursor"],
         }
 
         return render(request, "exchanges/exchange_list.html", context)
 
 
-class ExchangeDetailView(LoginRequiredMixin, View):
-    def get(self, request, exchange_id):
-        exchange = exchange_service.get_exchange(exchange_id)
+class ExchangeDetailView(AsyncLoginRequiredMixin, View):
+    async def get(self, request, exchange_id):
+        exchange = await exchange_service.aget_exchange(exchange_id)
 
-        sender_ad, receiver_ad = exchange_service.get_exchange_participants(
+        sender_ad, receiver_ad = await exchange_service.aget_exchange_participants(
             exchange, request.user.id
         )
 
@@ -65,11 +75,12 @@ class ExchangeDetailView(LoginRequiredMixin, View):
         return render(request, "exchanges/exchange_detail.html", context)
 
 
-class ExchangeCreateView(LoginRequiredMixin, View):
-    def get(self, request, ad_receiver_id):
-        receiver_ad = ad_service.get_ad(ad_receiver_id)
-
-        user_ads = ad_service.get_user_ads(request.user.id)
+class ExchangeCreateView(AsyncLoginRequiredMixin, View):
+    async def get(self, request, ad_receiver_id):
+        receiver_ad, user_ads = await asyncio.gather(
+            ad_service.aget_ad(ad_receiver_id),
+            ad_service.aget_user_ads(request.user.id),
+        )
 
         context = {
             "receiver_ad": receiver_ad,
@@ -79,11 +90,11 @@ class ExchangeCreateView(LoginRequiredMixin, View):
 
         return render(request, "exchanges/exchange_form.html", context)
 
-    def post(self, request, ad_receiver_id):
+    async def post(self, request, ad_receiver_id):
 
         dto = CreateExchangeDTO.from_request(request, ad_receiver_id)
 
-        exchange = exchange_service.create_proposal(dto)
+        exchange = await exchange_service.acreate_proposal(dto)
 
         messages.success(request, "Exchange proposal sent successfully!")
         return redirect("exchange_detail", exchange_id=exchange.id)
@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from uuid6 import UUID
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position of a row in a ``(-created_at, -id)`` ordered listing.
+    ``backwards`` cursors page towards newer rows.
+    """
+
+    created_at: datetime
+    id: UUID
+    backwards: bool = False
+
+
+def encode_cursor(created_at: datetime, id: UUID, backwards: bool = False) -> str:
+    payload = json.dumps(
+        {"c": created_at.isoformat(), "i": str(id), "b": int(backwards)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Cursor]:
+    if not token:
+        return None
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return Cursor(
+            created_at=datetime.fromisoformat(payload["c"]),
+            id=UUID(payload["i"]),
+            backwards=bool(payload.get("b", 0)),
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
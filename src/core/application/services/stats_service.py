@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+
+from django.db import transaction
+from uuid6 import UUID
+
+from src.apps.ads import domain
+from src.apps.ads.infrastructure.repository.stats import (
+    AdStats,
+    CATEGORY_ADS,
+    CONDITION_ADS,
+    USER_ADS,
+)
+from src.apps.exchanges.infrastructure.repository.stats import (
+    COMPLETED,
+    ExchangeStats,
+    PENDING,
+    USER_EXCHANGES,
+)
+from src.core.infrastructure.counters import (
+    CounterKey,
+    CounterRepository,
+    merge_deltas,
+)
+
+
+@dataclass
+class StatsService:
+    @staticmethod
+    def get_user_stats(user_id: UUID) -> dict:
+        key = str(user_id)
+        counters = CounterRepository.get(USER_ADS, USER_EXCHANGES, key=key)
+
+        ads_by_status = {
+            status: counters.get((USER_ADS, key, status), 0)
+            for status in domain.ItemStatus.get_statuses()
+        }
+
+        return {
+            "ads_by_status": ads_by_status,
+            "total_ads": sum(ads_by_status.values()),
+            "pending_exchanges": counters.get((USER_EXCHANGES, key, PENDING), 0),
+            "completed_exchanges": counters.get((USER_EXCHANGES, key, COMPLETED), 0),
+        }
+
+    @staticmethod
+    def get_facets(status: str = str(domain.ItemStatus.ACTIVE)) -> dict:
+        """Site-wide ad counts per category and per condition for one status."""
+        counters = CounterRepository.get(CATEGORY_ADS, CONDITION_ADS)
+
+        return {
+            "category": {
+                category: counters.get((CATEGORY_ADS, category, status), 0)
+                for category in domain.ItemCategory.get_categories()
+            },
+            "condition": {
+                condition: counters.get((CONDITION_ADS, condition, status), 0)
+                for condition in domain.ItemCondition.get_conditions()
+            },
+        }
+
+    @staticmethod
+    def reconcile(dry_run: bool = False) -> dict[CounterKey, tuple[int, int]]:
+        """
+        Recount every counter from the source tables and repair the ones that
+        drifted. Returns ``{key: (stored, actual)}`` for each repaired counter.
+        """
+        with transaction.atomic():
+            CounterRepository.lock()
+
+            actual = merge_deltas(AdStats.recount(), ExchangeStats.recount())
+            stored = CounterRepository.snapshot()
+
+            drift = {
+                key: (stored.get(key, 0), actual.get(key, 0))
+                for key in stored.keys() | actual.keys()
+                if stored.get(key, 0) != actual.get(key, 0)
+            }
+
+            if drift and not dry_run:
+                CounterRepository.overwrite(
+                    {key: value for key, (_, value) in drift.items()}
+                )
+
+        return drift
@@ -0,0 +1,31 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def get_namespace_version(namespace: str) -> int:
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # seeding from the clock keeps an evicted counter from reusing old keys
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_namespace_version(namespace: str) -> None:
+    """Invalidate every key of the namespace in O(1) by moving to a new version."""
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def versioned_key(namespace: str, *parts) -> str:
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"{namespace}:{get_namespace_version(namespace)}:{digest}"
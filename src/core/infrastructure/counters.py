@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from django.db import connection
+
+from src.core.infrastructure.database.models import StatCounter
+
+# (scope, key, bucket), e.g. ("user_ads", "<user id>", "active")
+CounterKey = tuple[str, str, str]
+
+UPSERT_SQL = """
+    INSERT INTO stat_counter (scope, key, bucket, value, updated_at)
+    VALUES {rows}
+    ON CONFLICT (scope, key, bucket)
+    DO UPDATE SET value = {value}, updated_at = EXCLUDED.updated_at
+"""
+
+
+def merge_deltas(*deltas: Mapping[CounterKey, int]) -> dict[CounterKey, int]:
+    merged: dict[CounterKey, int] = {}
+    for delta in deltas:
+        for key, value in delta.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+@dataclass
+class CounterRepository:
+    @staticmethod
+    def increment(deltas: Mapping[CounterKey, int]) -> None:
+        CounterRepository._upsert(
+            {key: value for key, value in deltas.items() if value},
+            value="stat_counter.value + EXCLUDED.value",
+        )
+
+    @staticmethod
+    def overwrite(values: Mapping[CounterKey, int]) -> None:
+        CounterRepository._upsert(values, value="EXCLUDED.value")
+
+    @staticmethod
+    def get(*scopes: str, key: Optional[str] = None) -> dict[CounterKey, int]:
+        counters = StatCounter.objects.filter(scope__in=scopes)
+        if key is not None:
+            counters = counters.filter(key=key)
+
+        return {
+            (scope, counter_key, bucket): value
+            for scope, counter_key, bucket, value in counters.values_list(
+                "scope", "key", "bucket", "value"
+            )
+        }
+
+    @staticmethod
+    def snapshot() -> dict[CounterKey, int]:
+        return {
+            (scope, key, bucket): value
+            for scope, key, bucket, value in StatCounter.objects.values_list(
+                "scope", "key", "bucket", "value"
+            )
+        }
+
+    @staticmethod
+    def lock() -> None:
+        """
+        Block counter writers until the surrounding transaction ends. Writers
+        bump counters in the same transaction as their data change, so a
+        recount taken under this lock cannot miss or double count one.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("LOCK TABLE stat_counter IN SHARE ROW EXCLUSIVE MODE")
+
+    @staticmethod
+    def _upsert(values: Mapping[CounterKey, int], value: str) -> None:
+        if not values:
+            return
+
+        # a fixed row order keeps concurrent upserts from deadlocking
+        keys = sorted(values)
+        params = []
+        for key in keys:
+            params.extend((*key, values[key]))
+
+        rows = ", ".join(["(%s, %s, %s, %s, now())"] * len(keys))
+        with connection.cursor() as cursor:
+            cursor.execute(UPSERT_SQL.format(rows=rows, value=value), params)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from src.core.application.services.stats_service import StatsService
+
+
+class Command(BaseCommand):
+    help = "Recount ad and exchange counters and repair the ones that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing the corrected values",
+        )
+
+    def handle(self, *args, **options):
+        drift = StatsService.reconcile(dry_run=options["dry_run"])
+
+        for (scope, key, bucket), (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"{scope} {key} {bucket}: {stored} -> {actual}")
+
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drift)} drifted counters"))
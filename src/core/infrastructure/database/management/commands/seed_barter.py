@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
+from src.core.application.services.stats_service import StatsService
+from src.core.infrastructure.database import seed
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, ads and exchanges for scale testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ads", type=int, default=100_000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            help=f"Defaults to one user per {seed.ADS_PER_USER} ads",
+        )
+        parser.add_argument(
+            "--exchanges",
+            type=int,
+            help=f"Defaults to {seed.EXCHANGES_PER_AD} exchanges per ad",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--until",
+            type=datetime.fromisoformat,
+            help="Newest timestamp to generate, defaults to the start of today (UTC); "
+            "the same seed and date give the same rows",
+        )
+        parser.add_argument("--batch-size", type=int, default=50_000)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help=f"First remove users named {seed.PREFIX}* and everything they own",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        if options["clear"]:
+            seed.clear()
+            self.stdout.write("Removed previously seeded rows")
+
+        plan_options = {"seed": options["seed"], "batch_size": options["batch_size"]}
+        if options["until"]:
+            until = options["until"]
+            plan_options["until"] = until if until.tzinfo else until.replace(tzinfo=timezone.utc)
+
+        plan = seed.SeedPlan.for_ads(
+            options["ads"], users=options["users"], exchanges=options["exchanges"], **plan_options
+        )
+
+        try:
+            counts = seed.generate(plan, progress=self.stdout.write)
+        except ValueError as error:
+            raise CommandError(error)
+
+        InboxRepository.rebuild()
+        StatsService.reconcile()
+        seed.analyze()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {counts['users']} users, {counts['ads']} ads and "
+            f"{counts['exchanges']} exchanges in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:46
+
+from django.db import migrations, models
+
+
+BACKFILL_SQL = """
+    INSERT INTO stat_counter (scope, key, bucket, value, updated_at)
+    SELECT 'user_ads', user_id::text, status, count(*), now()
+    FROM ad GROUP BY user_id, status
+    UNION ALL
+    SELECT 'category_ads', category, status, count(*), now()
+    FROM ad GROUP BY category, status
+    UNION ALL
+    SELECT 'condition_ads', condition, status, count(*), now()
+    FROM ad GROUP BY condition, status
+    UNION ALL
+    SELECT
+        'user_exchanges', owner.user_id::text,
+        CASE WHEN e.status = 'pending' THEN 'pending' ELSE 'completed' END,
+        count(*), now()
+    FROM exchange e
+    JOIN ad sa ON sa.id = e.ad_sender_id
+    JOIN ad ra ON ra.id = e.ad_receiver_id
+    CROSS JOIN LATERAL (
+        VALUES (sa.user_id, 'sent'), (ra.user_id, 'received')
+    ) AS owner (user_id, direction)
+    WHERE owner.direction = 'sent' OR sa.user_id <> ra.user_id
+    GROUP BY 2, 3
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+        ('ad', '0002_initial'),
+        ('exchange', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=32)),
+                ('key', models.CharField(max_length=64)),
+                ('bucket', models.CharField(max_length=20)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Counter',
+                'verbose_name_plural': 'Counters',
+                'db_table': 'stat_counter',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key', 'bucket'), name='stat_counter_scope_key_bucket_uniq')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -27,4 +27,23 @@ class User(AbstractUser, TimedBaseModel):
         app_label = 'user'
         db_table = 'user'
         verbose_name = 'User'
-        verbose_name_plural = 'Users'
\ No newline at end of file
+        verbose_name_plural = 'Users'
+
+class StatCounter(models.Model):
+    scope = models.CharField(max_length=32)
+    key = models.CharField(max_length=64)
+    bucket = models.CharField(max_length=20)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'user'
+        db_table = 'stat_counter'
+        verbose_name = 'Counter'
+        verbose_name_plural = 'Counters'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'key', 'bucket'],
+                name='stat_counter_scope_key_bucket_uniq',
+            ),
+        ]
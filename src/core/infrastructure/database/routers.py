@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+
+# Set once the current request (or command) has written, and for requests
+# that arrive while the client is still inside its pin window.
+_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+_wrote: ContextVar[bool] = ContextVar("primary_wrote", default=False)
+
+
+def pin_primary() -> None:
+    _pinned.set(True)
+    _wrote.set(True)
+
+
+def has_written() -> bool:
+    return _wrote.get()
+
+
+@contextmanager
+def request_scope(pinned: bool = False):
+    """Start with a clean pin state and restore the previous one on exit."""
+    pinned_token = _pinned.set(pinned)
+    wrote_token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
+
+
+def read_db() -> str:
+    """
+    Alias for a read that tolerates replication lag. Stays on the primary once
+    this request has written, for clients pinned after a recent write, and
+    inside transactions.
+    """
+    if (
+        REPLICA_DB_ALIAS not in settings.DATABASES
+        or _pinned.get()
+        or connections[DEFAULT_DB_ALIAS].in_atomic_block
+    ):
+        return DEFAULT_DB_ALIAS
+    return REPLICA_DB_ALIAS
+
+
+class PrimaryReplicaRouter:
+    """
+    Everything goes to the primary unless a repository explicitly asks for
+    ``read_db()``. Any write pins the rest of the request to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,309 @@
+"""
+Synthetic users, ads and exchanges for scale testing, streamed into
+PostgreSQL with COPY.
+
+The data is deterministic for a given seed and ``until`` date, down to the
+primary keys, which are uuid7 values built from each row's own timestamp.
+Distributions follow what a live barter site looks like: a few users own
+most of the ads, popular ads attract most proposals, categories and
+statuses are mixed by fixed weights. Accepted proposals only ever join two
+traded ads, pending ones two active ads.
+
+Seeded users are named ``PREFIX<n>``; ``clear`` removes them and everything
+they own. The inbox projection and stat counters are not written here and
+must be rebuilt afterwards.
+"""
+import io
+import random
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate
+from typing import Callable, Iterable, Optional
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+PREFIX = "seed_"
+PASSWORD = "seed-password"
+
+ADS_PER_USER = 10
+EXCHANGES_PER_AD = 0.5
+ZIPF_EXPONENT = 0.9
+
+CATEGORY_WEIGHTS = {
+    "electronics": 22,
+    "clothes": 18,
+    "home": 14,
+    "books": 12,
+    "other": 11,
+    "toys": 10,
+    "games": 9,
+    "cars": 4,
+}
+CONDITION_WEIGHTS = {"used": 70, "new": 30}
+STATUS_WEIGHTS = {"active": 80, "traded": 12, "archived": 8}
+PENDING_SHARE = 0.65
+
+WORDS = [
+    "vintage", "camera", "bicycle", "guitar", "lamp", "novel", "jacket",
+    "console", "puzzle", "sofa", "kettle", "drone", "poster", "sneakers",
+    "telescope", "board", "laptop", "watch", "helmet", "tent",
+]
+COMMENTS = [
+    "Interested in a trade?",
+    "Would you swap for this?",
+    "Happy to add something small on top.",
+    r"\N",
+]
+
+YEAR = timedelta(days=365).total_seconds()
+
+USER_COLUMNS = (
+    "id", "password", "is_superuser", "username", "first_name", "last_name",
+    "email", "is_staff", "is_active", "date_joined", "created_at", "updated_at",
+)
+AD_COLUMNS = (
+    "id", "user_id", "title", "description", "category", "condition", "status",
+    "created_at", "updated_at",
+)
+EXCHANGE_COLUMNS = (
+    "id", "ad_sender_id", "ad_receiver_id", "comment", "status", "created_at", "updated_at",
+)
+
+CLEAR_SQL = """
+    CREATE TEMP TABLE seeded_users ON COMMIT DROP AS
+    SELECT id FROM "user" WHERE username LIKE %(pattern)s;
+    CREATE TEMP TABLE seeded_ads ON COMMIT DROP AS
+    SELECT id FROM ad WHERE user_id IN (SELECT id FROM seeded_users);
+    DELETE FROM exchange_inbox WHERE user_id IN (SELECT id FROM seeded_users);
+    DELETE FROM exchange
+    WHERE ad_sender_id IN (SELECT id FROM seeded_ads)
+       OR ad_receiver_id IN (SELECT id FROM seeded_ads);
+    DELETE FROM ad WHERE id IN (SELECT id FROM seeded_ads);
+    DELETE FROM "user" WHERE id IN (SELECT id FROM seeded_users);
+"""
+
+
+def _start_of_today() -> datetime:
+    return datetime.now(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    users: int
+    ads: int
+    exchanges: int
+    seed: int = 42
+    until: datetime = field(default_factory=_start_of_today)
+    batch_size: int = 50_000
+
+    @classmethod
+    def for_ads(
+        cls,
+        ads: int,
+        users: Optional[int] = None,
+        exchanges: Optional[int] = None,
+        **options,
+    ) -> "SeedPlan":
+        """Derive users and exchanges from the ad count unless given."""
+        if users is None:
+            users = max(ads // ADS_PER_USER, 2) if ads else 0
+        if exchanges is None:
+            exchanges = int(ads * EXCHANGES_PER_AD)
+        return cls(users=users, ads=ads, exchanges=exchanges, **options)
+
+
+@dataclass
+class _Ads:
+    """What exchanges need to know about the seeded ads, kept compact."""
+    ids: list[str]
+    owners: array
+    created: array
+    statuses: list[str]
+
+
+def generate(plan: SeedPlan, progress: Callable[[str], None] = lambda message: None) -> dict[str, int]:
+    """Write the plan's rows in one transaction and return how many were written."""
+    if plan.ads and not plan.users:
+        raise ValueError("Ads need at least one user to own them")
+
+    rng = random.Random(plan.seed)
+    until = plan.until.timestamp()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        user_ids = _copy_users(cursor, rng, plan, until)
+        progress(f"Copied {len(user_ids)} users")
+
+        ads = _copy_ads(cursor, rng, plan, until, user_ids)
+        progress(f"Copied {len(ads.ids)} ads")
+
+        exchanges = _copy_exchanges(cursor, rng, plan, until, ads)
+        progress(f"Copied {exchanges} exchanges")
+
+    return {"users": len(user_ids), "ads": len(ads.ids), "exchanges": exchanges}
+
+
+def clear() -> None:
+    """Remove every seeded user together with their ads, exchanges and inbox entries."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(CLEAR_SQL, {"pattern": PREFIX.replace("_", r"\_") + "%"})
+
+
+def analyze() -> None:
+    with connection.cursor() as cursor:
+        for table in ('"user"', "ad", "exchange", "exchange_inbox"):
+            cursor.execute(f"ANALYZE {table}")
+
+
+def _copy_users(cursor, rng: random.Random, plan: SeedPlan, until: float) -> list[str]:
+    password = make_password(PASSWORD, salt=f"seed{plan.seed:012d}")
+    ids = []
+
+    def rows():
+        for n in range(plan.users):
+            joined = until - YEAR * (1 + rng.random())
+            user_id = _uuid7(rng, joined)
+            ids.append(user_id)
+            timestamp = _timestamp(joined)
+            yield (
+                f"{user_id}\t{password}\tf\t{PREFIX}{n}\t\t\t{PREFIX}{n}@example.com"
+                f"\tf\tt\t{timestamp}\t{timestamp}\t{timestamp}"
+            )
+
+    _copy(cursor, '"user"', USER_COLUMNS, rows(), plan.batch_size)
+    return ids
+
+
+def _copy_ads(
+    cursor, rng: random.Random, plan: SeedPlan, until: float, user_ids: list[str]
+) -> _Ads:
+    ads = _Ads(
+        ids=[],
+        owners=array("l", _skewed(rng, len(user_ids), plan.ads)),
+        created=array("d"),
+        statuses=_weighted(rng, STATUS_WEIGHTS, plan.ads),
+    )
+    categories = _weighted(rng, CATEGORY_WEIGHTS, plan.ads)
+    conditions = _weighted(rng, CONDITION_WEIGHTS, plan.ads)
+    words = rng.choices(WORDS, k=2 * plan.ads)
+
+    def rows():
+        for n in range(plan.ads):
+            created = until - YEAR * rng.random()
+            ad_id = _uuid7(rng, created)
+            ads.ids.append(ad_id)
+            ads.created.append(created)
+            first, second = words[2 * n], words[2 * n + 1]
+            timestamp = _timestamp(created)
+            yield (
+                f"{ad_id}\t{user_ids[ads.owners[n]]}\t{first.capitalize()} {second} {n}"
+                f"\tA {first} {second} in good shape, open to trades."
+                f"\t{categories[n]}\t{conditions[n]}\t{ads.statuses[n]}\t{timestamp}\t{timestamp}"
+            )
+
+    _copy(cursor, "ad", AD_COLUMNS, rows(), plan.batch_size)
+    return ads
+
+
+def _copy_exchanges(cursor, rng: random.Random, plan: SeedPlan, until: float, ads: _Ads) -> int:
+    traded = [n for n, status in enumerate(ads.statuses) if status == "traded"]
+    active = [n for n, status in enumerate(ads.statuses) if status == "active"]
+    rng.shuffle(traded)
+
+    # every traded ad went away in one accepted proposal
+    accepted = [
+        (sender, receiver)
+        for sender, receiver in zip(traded[::2], traded[1::2])
+        if ads.owners[sender] != ads.owners[receiver]
+    ][: plan.exchanges]
+
+    remaining = plan.exchanges - len(accepted) if active else 0
+    receivers = [active[n] for n in _skewed(rng, len(active), remaining)]
+    senders = rng.choices(active, k=remaining) if remaining else []
+
+    written = 0
+
+    def rows():
+        nonlocal written
+        pairs = [(pair, "accepted") for pair in accepted] + [
+            (pair, None) for pair in zip(senders, receivers)
+        ]
+        for (sender, receiver), status in pairs:
+            if ads.owners[sender] == ads.owners[receiver]:
+                continue
+            if status is None:
+                status = "pending" if rng.random() < PENDING_SHARE else "rejected"
+
+            newest = max(ads.created[sender], ads.created[receiver])
+            created = newest + (until - newest) * rng.random()
+            timestamp = _timestamp(created)
+            written += 1
+            yield (
+                f"{_uuid7(rng, created)}\t{ads.ids[sender]}\t{ads.ids[receiver]}"
+                f"\t{rng.choice(COMMENTS)}\t{status}\t{timestamp}\t{timestamp}"
+            )
+
+    _copy(cursor, "exchange", EXCHANGE_COLUMNS, rows(), plan.batch_size)
+    return written
+
+
+def _copy(cursor, table: str, columns: Iterable[str], lines: Iterable[str], batch_size: int) -> None:
+    """
+    Stream COPY text lines in chunks of ``batch_size``. The generated values
+    never contain tabs, newlines or backslashes, so nothing needs escaping;
+    ``\\N`` is NULL.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    chunk = []
+
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= batch_size:
+            _copy_lines(cursor, sql, chunk)
+            chunk = []
+
+    if chunk:
+        _copy_lines(cursor, sql, chunk)
+
+
+def _copy_lines(cursor, sql: str, lines: list[str]) -> None:
+    data = "\n".join(lines) + "\n"
+    if hasattr(cursor, "copy_expert"):
+        # psycopg2
+        cursor.copy_expert(sql, io.StringIO(data))
+    else:
+        with cursor.copy(sql) as copy:
+            copy.write(data)
+
+
+def _weighted(rng: random.Random, weights: dict[str, int], count: int) -> list[str]:
+    return rng.choices(list(weights), weights=list(weights.values()), k=count)
+
+
+def _skewed(rng: random.Random, population: int, count: int) -> list[int]:
+    """``count`` indexes below ``population``, Zipf-distributed: index 0 is the most popular."""
+    if not count:
+        return []
+    cum_weights = list(accumulate(1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(population)))
+    total = cum_weights[-1]
+    return [bisect_right(cum_weights, rng.random() * total) for _ in range(count)]
+
+
+def _uuid7(rng: random.Random, timestamp: float) -> str:
+    """A uuid7 for ``timestamp`` whose random bits come from ``rng``."""
+    random_bits = rng.getrandbits(74)
+    value = (
+        int(timestamp * 1000) << 80
+        | 0x7 << 76
+        | (random_bits >> 62) << 64
+        | 0b10 << 62
+        | random_bits & (1 << 62) - 1
+    )
+    digits = f"{value:032x}"
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def _timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, dt_timezone.utc).isoformat()
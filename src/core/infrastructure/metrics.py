@@ -0,0 +1,196 @@
+"""
+Request instrumentation: per-request query count, DB time and template time,
+aggregated into Prometheus histograms labelled by URL name.
+
+The registry lives in process memory, so every worker reports only the
+requests it served; scrape each worker to see the whole deployment.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter as Tally
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# SQL kept per request for the over-budget log; counting goes on past it.
+MAX_RECORDED_QUERIES = 500
+
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    db_time: float = 0.0
+    template_time: float = 0.0
+    queries: list[tuple[str, float]] = field(default_factory=list)
+    _template_depth: int = 0
+
+    def slowest_queries(self, limit: int = 5) -> list[tuple[str, float]]:
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+
+    def repeated_queries(self, limit: int = 5) -> list[tuple[str, int]]:
+        """Statements run more than once, the usual sign of an N+1 loop."""
+        counts = Tally(sql for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common(limit) if count > 1]
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def track_request():
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper charging each query to the request being tracked."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.query_count += 1
+        stats.db_time += elapsed
+        if len(stats.queries) < MAX_RECORDED_QUERIES:
+            stats.queries.append((sql, elapsed))
+
+
+def install_query_recorder(connection) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def time_template():
+    """Time a template render; renders nested inside another count once."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+
+    stats._template_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats._template_depth -= 1
+        if not stats._template_depth:
+            stats.template_time += time.perf_counter() - started
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict[str, tuple[list[int], list[float]]] = {}
+
+    def observe(self, view: str, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                view, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {view: (list(counts), total[0]) for view, (counts, total) in self._series.items()}
+
+        for view, (counts, total) in sorted(series.items()):
+            label = f'view="{_escape(view)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values: dict[str, int] = {}
+
+    def inc(self, view: str) -> None:
+        with self._lock:
+            self._values[view] = self._values.get(view, 0) + 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for view, value in sorted(values.items()):
+            lines.append(f'{self.name}{{view="{_escape(view)}"}} {value}')
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+REQUEST_DURATION = Histogram(
+    "barter_request_duration_seconds", "Total request latency.", LATENCY_BUCKETS
+)
+DB_QUERIES = Histogram(
+    "barter_request_db_queries", "SQL queries executed per request.", QUERY_BUCKETS
+)
+DB_DURATION = Histogram(
+    "barter_request_db_duration_seconds", "Time spent in SQL per request.", LATENCY_BUCKETS
+)
+TEMPLATE_DURATION = Histogram(
+    "barter_request_template_duration_seconds",
+    "Time spent rendering templates per request.",
+    LATENCY_BUCKETS,
+)
+OVER_BUDGET = Counter(
+    "barter_requests_over_budget_total", "Requests that exceeded a configured budget."
+)
+
+METRICS = (REQUEST_DURATION, DB_QUERIES, DB_DURATION, TEMPLATE_DURATION, OVER_BUDGET)
+
+
+def observe(view: str, stats: RequestStats, total: float) -> None:
+    REQUEST_DURATION.observe(view, total)
+    DB_QUERIES.observe(view, stats.query_count)
+    DB_DURATION.observe(view, stats.db_time)
+    TEMPLATE_DURATION.observe(view, stats.template_time)
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def reset_metrics() -> None:
+    for metric in METRICS:
+        metric.clear()
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Q, QuerySet
+from uuid6 import UUID
+
+
+def seek(
+    queryset: QuerySet,
+    created_at: Optional[datetime] = None,
+    pk: Optional[UUID] = None,
+    backwards: bool = False,
+    pk_field: str = "id",
+) -> QuerySet:
+    """
+    Keyset pagination over ``(-created_at, -<pk_field>)``. Without a position
+    the queryset is only put into the stable order; ``backwards`` walks towards
+    newer rows and returns them oldest first.
+    """
+    if created_at is not None and pk is not None:
+        lookup = "gt" if backwards else "lt"
+        queryset = queryset.filter(
+            Q(**{f"created_at__{lookup}": created_at})
+            | Q(created_at=created_at, **{f"{pk_field}__{lookup}": pk})
+        )
+
+    if backwards:
+        return queryset.order_by("created_at", pk_field)
+    return queryset.order_by("-created_at", f"-{pk_field}")
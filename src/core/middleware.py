@@ -1,20 +1,190 @@
 import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from django.shortcuts import redirect, render
 from django.contrib import messages
+from django.db import connections
+from django.db.backends.signals import connection_created
 from django.http import HttpResponseForbidden
 from src.core.application.exceptions import PermissionDeniedError
+from src.core.infrastructure.database import routers
+from src.core.infrastructure import metrics
 from src.core.infrastructure.exceptions import NotFoundError
 
 logger = logging.getLogger(__name__)
 
+PIN_COOKIE_NAME = "primary_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+UNRESOLVED_VIEW = "<unresolved>"
+SQL_LOG_LENGTH = 500
+
+
+def _record_queries(sender, connection, **kwargs):
+    metrics.install_query_recorder(connection)
+
+
+class InstrumentationMiddleware:
+    """
+    Measures query count, DB time, template time and total latency per URL
+    name into the metrics registry, and logs requests over the configured
+    budgets together with their slowest and most repeated SQL.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(_record_queries, dispatch_uid="instrumentation")
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        options = settings.INSTRUMENTATION
+        if not options["ENABLED"]:
+            return self.get_response(request)
+
+        # connections opened before the signal was hooked up
+        for connection in connections.all(initialized_only=True):
+            metrics.install_query_recorder(connection)
+
+        with metrics.track_request() as stats:
+            response = self.get_response(request)
+            total = time.perf_counter() - stats.started
+
+        self.finish(request, stats, total, options)
+        return response
+
+    async def __acall__(self, request):
+        options = settings.INSTRUMENTATION
+        if not options["ENABLED"]:
+            return await self.get_response(request)
+
+        # Connections are thread-local and the ORM runs in sync_to_async's
+        # thread, so the connection_created hook is what covers them here.
+        with metrics.track_request() as stats:
+            response = await self.get_response(request)
+            total = time.perf_counter() - stats.started
+
+        self.finish(request, stats, total, options)
+        return response
+
+    def finish(self, request, stats, total, options):
+        view = (
+            request.resolver_match.view_name
+            if request.resolver_match
+            else UNRESOLVED_VIEW
+        )
+        if view != "metrics":
+            metrics.observe(view, stats, total)
+            self.check_budgets(request, view, stats, total, options)
+
+    @staticmethod
+    def check_budgets(request, view, stats, total, options):
+        exceeded = []
+        if options["MAX_QUERIES"] and stats.query_count > options["MAX_QUERIES"]:
+            exceeded.append(f"{stats.query_count} queries > {options['MAX_QUERIES']}")
+        if options["MAX_DB_MS"] and stats.db_time * 1000 > options["MAX_DB_MS"]:
+            exceeded.append(f"{stats.db_time * 1000:.0f} ms in SQL > {options['MAX_DB_MS']} ms")
+        if options["MAX_TOTAL_MS"] and total * 1000 > options["MAX_TOTAL_MS"]:
+            exceeded.append(f"{total * 1000:.0f} ms total > {options['MAX_TOTAL_MS']} ms")
+        if not exceeded:
+            return
+
+        metrics.OVER_BUDGET.inc(view)
+
+        lines = [
+            f"{duration * 1000:8.1f} ms  {sql[:SQL_LOG_LENGTH]}"
+            for sql, duration in stats.slowest_queries()
+        ]
+        lines += [
+            f"{count:6d} x    {sql[:SQL_LOG_LENGTH]}"
+            for sql, count in stats.repeated_queries()
+        ]
+        logger.warning(
+            "%s %s (%s) over budget: %s%s",
+            request.method,
+            request.get_full_path(),
+            view,
+            "; ".join(exceeded),
+            "".join(f"\n{line}" for line in lines),
+        )
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keeps read-your-own-writes across redirects: a request that wrote marks
+    its client with a short-lived cookie, and requests carrying it (or
+    unsafe requests) read from the primary only.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        with routers.request_scope(pinned=self.is_pinned(request)):
+            response = self.get_response(request)
+            self.pin_if_written(response)
+        return response
+
+    async def __acall__(self, request):
+        # sync_to_async copies context changes back, so writes made by the
+        # ORM in its worker thread are visible to has_written() here.
+        with routers.request_scope(pinned=self.is_pinned(request)):
+            response = await self.get_response(request)
+            self.pin_if_written(response)
+        return response
+
+    @staticmethod
+    def is_pinned(request):
+        return (
+            request.method not in SAFE_METHODS
+            or PIN_COOKIE_NAME in request.COOKIES
+        )
+
+    @staticmethod
+    def pin_if_written(response):
+        if routers.has_written():
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
 
 class ExceptionMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
         return self.get_response(request)
 
+    async def __acall__(self, request):
+        # process_exception stays sync; the handler adapts it in async mode
+        return await self.get_response(request)
+
     def process_exception(self, request, exception):
         logger.exception(f"Exception occurred: {exception}")
 
@@ -0,0 +1,83 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.mixins import AccessMixin
+from django.contrib.auth.views import redirect_to_login
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET/HEAD with 304 Not Modified when the client already holds the
+    current representation. Views provide cheap validators through
+    ``get_validators``, computed before and independently of rendering.
+
+    Pages differ per visitor (navigation, owner controls, CSRF tokens), so the
+    ETag always covers the client identity on top of the view's own parts.
+    """
+
+    def get_validators(
+        self, request, *args, **kwargs
+    ) -> tuple[tuple, Optional[datetime]]:
+        """Return ``(etag_parts, last_modified)``; empty parts disable the ETag."""
+        return (), None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        parts, last_modified = self.get_validators(request, *args, **kwargs)
+
+        etag = None
+        if parts:
+            etag = self.make_etag(
+                *parts,
+                request.user.pk,
+                request.COOKIES.get(settings.CSRF_COOKIE_NAME),
+            )
+
+        timestamp = None
+        if last_modified is not None:
+            timestamp = timegm(last_modified.utctimetuple())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            if etag and not response.has_header("ETag"):
+                response.headers["ETag"] = etag
+            if timestamp and not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(timestamp)
+            # stored copies must be revalidated, which is what makes the 304 cheap
+            patch_cache_control(response, no_cache=True)
+
+        return response
+
+    @staticmethod
+    def make_etag(*parts) -> str:
+        return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    ``LoginRequiredMixin`` for views with async handlers. The user is loaded
+    through the async session API and pinned on the request, so templates
+    reading ``request.user`` never hit the database from the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return redirect_to_login(
+                request.get_full_path(),
+                self.get_login_url(),
+                self.get_redirect_field_name(),
+            )
+        return await super().dispatch(request, *args, **kwargs)
@@ -1,4 +1,8 @@
+import hmac
+
 from .forms import CustomUserCreationForm
+from django.conf import settings
+from django.http import HttpResponse
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.views import View
@@ -7,6 +11,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from src.core.infrastructure.database.models import User
 from src.apps.ads.application.services.ad_service import AdService
 from src.apps.exchanges.application.services.exchange_service import ExchangeService
+from src.core.application.services.stats_service import StatsService
+from src.core.infrastructure.metrics import render_metrics
 
 
 class UserCreationFormWithBootstrap(CustomUserCreationForm):
@@ -39,20 +45,44 @@ class ProfileView(LoginRequiredMixin, View):
 
         ad_service = AdService()
 
-        user_ads = ad_service.get_user_ads(user.id)
+        user_ads = ad_service.get_user_ads(user.id, limit=6)
+        stats = StatsService.get_user_stats(user.id)
 
         exchange_service = ExchangeService()
-        exchanges = exchange_service.get_all_user_proposals_data(user.id)
+        exchanges = exchange_service.get_recent_user_proposals(user.id)
 
-        pending_exchanges = [ex for ex in exchanges if ex.status == "pending"]
-        completed_exchanges = [ex for ex in exchanges if ex.status != "pending"]
+        pending_exchanges = exchanges["pending"]
+        completed_exchanges = exchanges["completed"]
 
         context = {
             "user_profile": user,
             "is_owner": user.id == request.user.id,
-            "user_ads": user_ads[:6],
-            "total_ads": len(user_ads),
+            "user_ads": user_ads,
+            "total_ads": stats["total_ads"],
             "pending_exchanges": pending_exchanges,
             "completed_exchanges": completed_exchanges,
         }
         return render(request, "auth/profile.html", context)
+
+
+class MetricsView(View):
+    """Request histograms of this process in the Prometheus text format."""
+
+    def get(self, request):
+        if not self.is_allowed(request):
+            return HttpResponse(status=401 if request.user.is_anonymous else 403)
+
+        return HttpResponse(
+            render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    @staticmethod
+    def is_allowed(request) -> bool:
+        """Staff sessions, or scrapers presenting ``METRICS_TOKEN`` when one is set."""
+        if request.user.is_staff:
+            return True
+        token = settings.INSTRUMENTATION["METRICS_TOKEN"]
+        if not token:
+            return False
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        return hmac.compare_digest(supplied.encode(), token.encode())
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     #first_party
     'apps.ads.infrastructure.django_conf.apps.AdsConfig',
@@ -55,6 +56,7 @@ MIGRATION_MODULES = {
 }
 
 MIDDLEWARE = [
+    'src.core.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +65,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
+    'src.core.middleware.ReplicaPinningMiddleware',
     'src.core.middleware.ExceptionMiddleware',
 ]
 
@@ -70,7 +73,7 @@ ROOT_URLCONF = 'src.core.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'src.core.presentation.templates.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'src/templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -93,6 +96,12 @@ LOGGING['handlers']['console']['level'] = env("LOG_LEVEL")
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections are kept for DB_CONN_MAX_AGE seconds and checked before reuse.
+# DB_POOL hands them to a psycopg 3 pool instead (the "pool" extra), which
+# also covers ASGI, where per-thread persistent connections are not reused;
+# Django requires CONN_MAX_AGE = 0 in that mode.
+DB_POOL = env.bool('DB_POOL', default=False)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -101,9 +110,65 @@ DATABASES = {
         'PASSWORD': env('POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST'),
         'PORT': env('POSTGRES_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL else env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+        'OPTIONS': {
+            'pool': {
+                'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+                'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+                'timeout': env.float('DB_POOL_TIMEOUT', default=10.0),
+            },
+        } if DB_POOL else {},
     },
 }
 
+# Listing, search and inbox reads may go to a streaming replica when
+# POSTGRES_REPLICA_HOST is set; everything else stays on the primary.
+# Clients that wrote are kept on the primary for REPLICA_PIN_SECONDS.
+if env('POSTGRES_REPLICA_HOST', default=None):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': env('POSTGRES_REPLICA_DB', default=DATABASES['default']['NAME']),
+        'HOST': env('POSTGRES_REPLICA_HOST'),
+        'PORT': env('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': {**DATABASES['default']['OPTIONS']},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['src.core.infrastructure.database.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+AD_CACHE = {
+    'ENABLED': env.bool('AD_CACHE_ENABLED', default=True),
+    'LOCAL_MAXSIZE': env.int('AD_CACHE_LOCAL_MAXSIZE', default=1024),
+    'LOCAL_TTL': env.int('AD_CACHE_LOCAL_TTL', default=5),
+    'TIMEOUT': env.int('AD_CACHE_TIMEOUT', default=300),
+    'PAGE_TIMEOUT': env.int('AD_CACHE_PAGE_TIMEOUT', default=60),
+}
+
+AD_IMAGES = {
+    'ASYNC': env.bool('AD_IMAGES_ASYNC', default=True),
+    'WORKERS': env.int('AD_IMAGES_WORKERS', default=2),
+}
+
+# Per-request budgets; requests over any of them are logged with their SQL.
+# 0 disables a budget. Histograms are served at /metrics/ to staff sessions
+# and, when METRICS_TOKEN is set, to scrapers sending it as a bearer token.
+INSTRUMENTATION = {
+    'ENABLED': env.bool('INSTRUMENTATION_ENABLED', default=True),
+    'MAX_QUERIES': env.int('BUDGET_MAX_QUERIES', default=25),
+    'MAX_DB_MS': env.int('BUDGET_MAX_DB_MS', default=200),
+    'MAX_TOTAL_MS': env.int('BUDGET_MAX_TOTAL_MS', default=500),
+    'METRICS_TOKEN': env('METRICS_TOKEN', default=''),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
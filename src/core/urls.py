@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
 from src.apps.ads.presentation import views as ad_views
-from src.core.presentation.views import RegisterView, ProfileView
+from src.core.presentation.views import MetricsView, RegisterView, ProfileView
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -15,6 +15,7 @@ urlpatterns = [
     path('logout/', auth_views.LogoutView.as_view(next_page='/'), name='logout'),
     path('register/', RegisterView.as_view(), name='register'),
     path('profile/<str:username>/', ProfileView.as_view(), name='profile'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG:
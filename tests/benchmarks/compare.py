@@ -0,0 +1,62 @@
+"""
+Compare two benchmark reports written by ``harness.write_report``:
+
+    python -m tests.benchmarks.compare bench_results/abc123-10k.json bench_results/def456-10k.json
+
+Exits with status 1 when a scenario's p95 latency grew by more than
+``--threshold`` or its queries per request went up.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> tuple[dict, dict]:
+    with open(path) as file:
+        report = json.load(file)
+    return report, {scenario["name"]: scenario for scenario in report["scenarios"]}
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    base_report, base = load(args.base)
+    head_report, head = load(args.head)
+    if base_report["scale"] != head_report["scale"]:
+        print(f"warning: comparing scale {base_report['scale']} with {head_report['scale']}")
+
+    print(f"{base_report['commit']} -> {head_report['commit']}")
+    print(f"{'scenario':<22}{'p95 ms':>25}{'queries':>16}{'req/s':>21}")
+
+    regressions = []
+    for name in sorted(base.keys() & head.keys()):
+        b, h = base[name], head[name]
+        p95 = change(b["p95_ms"], h["p95_ms"])
+        print(
+            f"{name:<22}"
+            f"{b['p95_ms']:>8.1f} -> {h['p95_ms']:>7.1f} {p95:+5.0%}"
+            f"{b['mean_queries']:>8.1f} -> {h['mean_queries']:>4.1f}"
+            f"{b['throughput_rps']:>9.1f} -> {h['throughput_rps']:>7.1f}"
+        )
+        if p95 > args.threshold or h["mean_queries"] > b["mean_queries"]:
+            regressions.append(name)
+
+    for name in sorted(base.keys() ^ head.keys()):
+        print(f"{name:<22} only in {'base' if name in base else 'head'}")
+
+    if regressions:
+        print(f"regressed: {', '.join(sorted(regressions))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Benchmark datasets at fixed scales, written by the ``seed_barter`` generator.
+The inbox projection and the stat counters are rebuilt afterwards, exactly
+as the management command does.
+"""
+from dataclasses import dataclass
+
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
+from src.core.application.services.stats_service import StatsService
+from src.core.infrastructure.database import seed as seeding
+
+PREFIX = seeding.PREFIX
+WORDS = seeding.WORDS
+
+# The scale is the number of ads; users and exchanges follow from it.
+SCALES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    scale: str
+    plan: seeding.SeedPlan
+
+    @classmethod
+    def for_scale(cls, scale: str) -> "Dataset":
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale {scale!r}, expected one of {list(SCALES)}")
+        return cls(scale=scale, plan=seeding.SeedPlan.for_ads(SCALES[scale]))
+
+    @property
+    def users(self) -> int:
+        return self.plan.users
+
+    @property
+    def ads(self) -> int:
+        return self.plan.ads
+
+    @property
+    def exchanges(self) -> int:
+        return self.plan.exchanges
+
+
+def seed(dataset: Dataset) -> Dataset:
+    seeding.generate(dataset.plan)
+    _rebuild()
+    return dataset
+
+
+def clear() -> None:
+    seeding.clear()
+    _rebuild()
+
+
+def _rebuild() -> None:
+    InboxRepository.rebuild()
+    StatsService.reconcile()
+    seeding.analyze()
@@ -0,0 +1,170 @@
+"""
+Runs scripted request scenarios through the Django test client and reports
+latency percentiles, queries per request and throughput.
+
+Reports are JSON files named after the commit and scale, so two runs can be
+compared with ``python -m tests.benchmarks.compare``.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Sequence
+
+import django
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+RESULTS_DIR = Path(os.environ.get("BENCH_RESULTS_DIR", "bench_results"))
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", 1))
+
+# One scripted step: sends a request with the given client and returns it.
+Step = Callable[[Client], object]
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    name: str
+    requests: int
+    concurrency: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_queries: float
+    max_queries: int
+    throughput_rps: float
+
+
+def get(url: str, expected: int = 200) -> Step:
+    def step(client: Client):
+        response = client.get(url)
+        assert response.status_code == expected, (url, response.status_code)
+        return response
+    return step
+
+
+def post(url: str, data: dict, expected: int = 302) -> Step:
+    def step(client: Client):
+        response = client.post(url, data)
+        assert response.status_code == expected, (url, response.status_code)
+        return response
+    return step
+
+
+def percentile(values: Sequence[float], q: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run_scenario(
+    name: str, client: Client, steps: Sequence[Step], warmup: int = 0
+) -> ScenarioResult:
+    """
+    Run ``steps`` in order, the first ``warmup`` of them unmeasured. With
+    BENCH_CONCURRENCY > 1 the measured steps are spread over that many
+    threads, each with its own connection and a copy of the client's cookies.
+    """
+    for step in steps[:warmup]:
+        step(client)
+    steps = steps[warmup:]
+
+    chunks = [steps[i::CONCURRENCY] for i in range(CONCURRENCY)]
+    started = time.perf_counter()
+    if CONCURRENCY == 1:
+        samples = _measure(client, steps)
+    else:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+            samples = [
+                sample
+                for chunk_samples in executor.map(
+                    lambda chunk: _measure_in_thread(client, chunk), chunks
+                )
+                for sample in chunk_samples
+            ]
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _ in samples]
+    queries = [count for _, count in samples]
+    return ScenarioResult(
+        name=name,
+        requests=len(samples),
+        concurrency=CONCURRENCY,
+        p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 95) * 1000, 3),
+        p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        mean_queries=round(statistics.fmean(queries), 2),
+        max_queries=max(queries),
+        throughput_rps=round(len(samples) / elapsed, 2),
+    )
+
+
+def _measure(client: Client, steps: Sequence[Step]) -> list[tuple[float, int]]:
+    samples = []
+    for step in steps:
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            step(client)
+            latency = time.perf_counter() - started
+        samples.append((latency, len(queries)))
+        # The test client skips the request_finished cleanup a server runs,
+        # so CONN_MAX_AGE and pool check-in would otherwise never apply
+        close_old_connections()
+    return samples
+
+
+def _measure_in_thread(template: Client, steps: Sequence[Step]) -> list[tuple[float, int]]:
+    client = Client()
+    for key, morsel in template.cookies.items():
+        client.cookies[key] = morsel.value
+    try:
+        return _measure(client, steps)
+    finally:
+        connection.close()
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(scale: str, results: Sequence[ScenarioResult]) -> Path:
+    report = {
+        "commit": commit(),
+        "scale": scale,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "postgres": connection.pg_version,
+        "scenarios": [asdict(result) for result in results],
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{report['commit']}-{scale}.json"
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def format_table(results: Sequence[ScenarioResult]) -> str:
+    lines = [
+        f"{'scenario':<22}{'reqs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'queries':>9}{'req/s':>10}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.name:<22}{r.requests:>6}{r.p50_ms:>10.1f}{r.p95_ms:>10.1f}"
+            f"{r.p99_ms:>10.1f}{r.mean_queries:>9.1f}{r.throughput_rps:>10.1f}"
+        )
+    return "\n".join(lines)
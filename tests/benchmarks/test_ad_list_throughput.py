@@ -0,0 +1,85 @@
+import importlib.util
+import os
+import time
+
+import pytest
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from src.apps.ads.infrastructure.database.models import Ad
+from src.core.infrastructure.database.models import User
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+ADS = 2_000
+REQUESTS = 300
+POOL = {"min_size": 2, "max_size": 4, "timeout": 10}
+
+
+@pytest.fixture(scope="module")
+def seeded_ads():
+    owner = User.objects.create(username="bench_lister", password="!")
+    Ad.objects.bulk_create(
+        Ad(
+            user=owner,
+            title=f"Bench listing {n}",
+            description="Benchmark listing",
+            category="books",
+            condition="used",
+            status="active",
+        )
+        for n in range(ADS)
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE ad")
+
+    yield
+
+    owner.delete()
+
+
+def requests_per_second(close_each: bool) -> float:
+    """
+    The test client keeps Django from closing connections at request end, so
+    the close that CONN_MAX_AGE = 0 implies (or a pool checkin) is done here.
+    """
+    client = Client()
+    urls = [
+        reverse("ad_list") + f"?page={n % 20 + 1}&category=books" for n in range(REQUESTS)
+    ]
+
+    started = time.perf_counter()
+    for url in urls:
+        assert client.get(url).status_code == 200
+        if close_each:
+            connection.close()
+    return REQUESTS / (time.perf_counter() - started)
+
+
+@override_settings(AD_CACHE={"ENABLED": False})
+def test_ad_list_connection_reuse(seeded_ads):
+    results = {
+        "new connection per request": requests_per_second(close_each=True),
+        "persistent connection": requests_per_second(close_each=False),
+    }
+
+    if importlib.util.find_spec("psycopg_pool") and connection.vendor == "postgresql":
+        options = connection.settings_dict["OPTIONS"]
+        connection.close()
+        options["pool"] = POOL
+        try:
+            results["psycopg pool"] = requests_per_second(close_each=True)
+        finally:
+            connection.close()
+            connection.close_pool()
+            del options["pool"]
+
+    print(f"\nAdListView, {REQUESTS} requests over {ADS} ads:")
+    for mode, rate in results.items():
+        print(f"  {mode:<28} {rate:8.1f} req/s")
+
+    assert results["persistent connection"] > results["new connection per request"]
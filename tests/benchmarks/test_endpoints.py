@@ -0,0 +1,146 @@
+import os
+import random
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from src.apps.ads.infrastructure.database.models import Ad
+from src.apps.exchanges.infrastructure.database.models import Exchange
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
+from src.core.infrastructure.database.models import User
+from tests.benchmarks import generators, harness
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+SCALE = os.environ.get("BENCH_SCALE", "10k")
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", 200))
+WARMUP = 20
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    data = generators.seed(generators.Dataset.for_scale(SCALE))
+    yield data
+    generators.clear()
+
+
+@pytest.fixture(scope="module")
+def report(dataset):
+    results = []
+    yield results
+    if results:
+        path = harness.write_report(dataset.scale, results)
+        print(f"\n{dataset.scale}: {dataset.users} users, {dataset.ads} ads, "
+              f"{dataset.exchanges} exchanges -> {path}")
+        print(harness.format_table(results))
+
+
+@pytest.fixture(autouse=True)
+def page_cache():
+    # the rendered-page cache would turn repeated URLs into cache reads
+    if os.environ.get("BENCH_CACHE"):
+        yield
+        return
+    with override_settings(AD_CACHE={**settings.AD_CACHE, "ENABLED": False}):
+        yield
+
+
+@pytest.fixture
+def rng():
+    return random.Random(42)
+
+
+def sample_ids(queryset, count: int) -> list:
+    return list(queryset.order_by("?").values_list("id", flat=True)[:count])
+
+
+def busiest_trader() -> User:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT user_id FROM exchange_inbox
+            GROUP BY user_id ORDER BY count(*) DESC LIMIT 1
+            """
+        )
+        return User.objects.get(id=cursor.fetchone()[0])
+
+
+def test_ad_list_search(dataset, report, rng):
+    steps = [
+        harness.get(
+            reverse("ad_list")
+            + f"?search={rng.choice(generators.WORDS)}&page={rng.randint(1, 3)}"
+        )
+        for _ in range(WARMUP + REQUESTS)
+    ]
+    report.append(harness.run_scenario("ad_list_search", Client(), steps, WARMUP))
+
+
+def test_ad_list_paging(dataset, report, rng):
+    categories = ["", "books", "electronics"]
+    steps = [
+        harness.get(
+            reverse("ad_list")
+            + f"?page={rng.randint(1, 50)}&category={rng.choice(categories)}"
+        )
+        for _ in range(WARMUP + REQUESTS)
+    ]
+    report.append(harness.run_scenario("ad_list_paging", Client(), steps, WARMUP))
+
+
+def test_ad_detail(dataset, report):
+    ad_ids = sample_ids(Ad.objects.filter(user__username__startswith=generators.PREFIX),
+                        WARMUP + REQUESTS)
+    steps = [harness.get(reverse("ad_detail", args=[ad_id])) for ad_id in ad_ids]
+    report.append(harness.run_scenario("ad_detail", Client(), steps, WARMUP))
+
+
+def test_exchange_list(dataset, report, rng):
+    client = Client()
+    client.force_login(busiest_trader())
+    statuses = ["", "pending", "rejected"]
+    steps = [
+        harness.get(reverse("exchange_list") + f"?status={rng.choice(statuses)}")
+        for _ in range(WARMUP + REQUESTS)
+    ]
+    report.append(harness.run_scenario("exchange_list", client, steps, WARMUP))
+
+
+def test_accept_flow(dataset, report):
+    """
+    Each accept needs a pending proposal between two active ads that no other
+    accept touches, so fresh pairs are written between two seeded traders.
+    """
+    sender, receiver = User.objects.filter(
+        username__startswith=generators.PREFIX
+    ).order_by("username")[:2]
+    count = WARMUP + REQUESTS
+
+    def items(owner):
+        return Ad.objects.bulk_create(
+            Ad(user=owner, title=f"Accept flow item {n}", description="Accept flow")
+            for n in range(count)
+        )
+
+    exchanges = Exchange.objects.bulk_create(
+        Exchange(ad_sender=offered, ad_receiver=wanted, status="pending")
+        for offered, wanted in zip(items(sender), items(receiver))
+    )
+    InboxRepository.rebuild(user_id=receiver.id)
+
+    client = Client()
+    client.force_login(receiver)
+    steps = [
+        harness.post(reverse("exchange_update", args=[exchange.id]), {"status": "accepted"})
+        for exchange in exchanges
+    ]
+    report.append(harness.run_scenario("accept_flow", client, steps, WARMUP))
+
+    assert Exchange.objects.filter(
+        id__in=[exchange.id for exchange in exchanges], status="accepted"
+    ).count() == count
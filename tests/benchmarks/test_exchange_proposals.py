@@ -0,0 +1,107 @@
+import os
+import random
+import statistics
+import time
+
+import pytest
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.ads.infrastructure.database.models import Ad
+from src.apps.exchanges import domain as exchange_domain
+from src.apps.exchanges.infrastructure.database.models import Exchange
+from src.apps.exchanges.infrastructure.repository.exchange_repo import ExchangeRepository
+from src.core.infrastructure.database.models import User
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+EXCHANGES = 100_000
+USERS = 500
+ADS_PER_USER = 4
+ROUNDS = 5
+
+
+def legacy_find_user_proposals(user_id):
+    # the pre-UNION implementation, kept here as the baseline
+    user_ads = Ad.objects.filter(user_id=user_id).values_list("id", flat=True)
+    proposal_models = Exchange.objects.filter(
+        Q(ad_sender_id__in=user_ads) | Q(ad_receiver_id__in=user_ads)
+    )
+    # the old mapper read ad_sender.id / ad_receiver.id, loading both ads per row
+    return [
+        exchange_domain.Exchange(
+            id=model.id,
+            ad_sender_id=model.ad_sender.id,
+            ad_receiver_id=model.ad_receiver.id,
+            comment=model.comment,
+            created_at=model.created_at,
+            status=exchange_domain.ExchangeStatus(model.status),
+        )
+        for model in proposal_models
+    ]
+
+
+@pytest.fixture(scope="module")
+def seeded_exchanges():
+    rng = random.Random(42)
+
+    users = User.objects.bulk_create(
+        User(username=f"bench_{i}", email=f"bench_{i}@example.com", password="!")
+        for i in range(USERS)
+    )
+    ads = Ad.objects.bulk_create(
+        Ad(
+            user=user,
+            title=f"Bench item {user.username} {n}",
+            description="Benchmark item",
+            category="electronics",
+            condition="used",
+            status="active",
+        )
+        for user in users
+        for n in range(ADS_PER_USER)
+    )
+
+    batch = []
+    for _ in range(EXCHANGES):
+        sender, receiver = rng.sample(ads, 2)
+        batch.append(Exchange(ad_sender=sender, ad_receiver=receiver, status="pending"))
+    Exchange.objects.bulk_create(batch, batch_size=5_000)
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE ad")
+        cursor.execute("ANALYZE exchange")
+
+    yield users[0]
+
+    User.objects.filter(username__startswith="bench_").delete()
+
+
+def measure(fn, user_id):
+    timings = []
+    for _ in range(ROUNDS):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            result = fn(user_id)
+            timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings), len(queries)
+
+
+def test_find_user_proposals_union_vs_legacy(seeded_exchanges):
+    user_id = seeded_exchanges.id
+
+    legacy, legacy_time, legacy_queries = measure(legacy_find_user_proposals, user_id)
+    union, union_time, union_queries = measure(ExchangeRepository.find_user_proposals, user_id)
+
+    print(
+        f"\nfind_user_proposals over {EXCHANGES} exchanges, {len(union)} rows: "
+        f"legacy {legacy_time * 1000:.1f} ms / {legacy_queries} queries, "
+        f"union {union_time * 1000:.1f} ms / {union_queries} queries"
+    )
+
+    assert {e.id for e in union} == {e.id for e in legacy}
+    assert union_queries == 1
+    assert union_time < legacy_time
@@ -11,12 +11,13 @@ django.setup()
 
 
 from django.db import connection
+from django.contrib.admin.models import LogEntry
 from django.contrib.auth.models import Permission, Group, ContentType
 from django.contrib.sessions.models import Session
-from src.apps.ads.infrastructure.database.models import Ad
-from src.apps.exchanges.infrastructure.database.models import Exchange
+from src.apps.ads.infrastructure.database.models import Ad, StoredImage
+from src.apps.exchanges.infrastructure.database.models import Exchange, ExchangeInbox
 from src.apps.ads.infrastructure.repository.ad_repo import AdRepository
-from src.core.infrastructure.database.models import User
+from src.core.infrastructure.database.models import StatCounter, User
 from src.apps.ads.application.services.ad_service import AdService
 from src.apps.exchanges import domain as exchange_domain
 from src.apps.ads import domain as ad_domain
@@ -27,7 +28,10 @@ from django.test import Client
 
 @pytest.fixture(scope='session', autouse=True)
 def create_test_db():
-    models = [User, Permission, Group, Session, ContentType, Ad, Exchange]
+    models = [User, Permission, Group, Session, ContentType, LogEntry, Ad, StoredImage, Exchange, ExchangeInbox, StatCounter]
+
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
 
     with connection.schema_editor() as schema_editor:
         for model in models:
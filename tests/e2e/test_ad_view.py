@@ -1,4 +1,6 @@
 from uuid6 import UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from src.apps.ads import domain as ad_domain
 
@@ -74,6 +76,36 @@ def test_ad_list_view_with_filters(client, ad_repo, user):
     assert b"Book Item" not in response.content
 
 
+def test_ad_list_view_caches_results(client, ad_repo, user):
+    url = reverse('ad_list') + '?search=fragment'
+    assert b"Fragment Item" not in client.get(url).content
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert not any('"ad"' in query["sql"] for query in queries)
+
+    ad_repo.create(ad_domain.Ad(
+        user_id=user.id,
+        title="Fragment Item",
+        owner_username=user.username,
+        description="Cached fragment description",
+    ))
+
+    assert b"Fragment Item" in client.get(url).content
+
+
+def test_user_ad_list_view_owner_bypasses_cache(authenticated_client, user):
+    url = reverse('user_ad_list', args=[user.username])
+    authenticated_client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.get(url)
+    assert response.status_code == 200
+    assert b"+ Add New Item" in response.content
+    assert any('"ad"' in query["sql"] for query in queries)
+
+
 def test_ad_detail_view(client, test_user_ad):
     url = reverse('ad_detail', args=[test_user_ad.id])
     response = client.get(url)
@@ -83,6 +115,69 @@ def test_ad_detail_view(client, test_user_ad):
     assert b"This is a test ad for edge-to-edge testing" in response.content
 
 
+def test_ad_detail_view_conditional_get(client, ad_service, test_user_ad):
+    url = reverse('ad_detail', args=[test_user_ad.id])
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.content == b""
+
+    ad_service.update_ad_status(test_user_ad.id, ad_domain.ItemStatus.ARCHIVED)
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_ad_detail_view_ignores_stale_cache(client, ad_repo, ad_service, test_user_ad):
+    url = reverse('ad_detail', args=[test_user_ad.id])
+    stale = ad_repo.find_by_id(test_user_ad.id)
+
+    ad_service.update_ad_status(test_user_ad.id, ad_domain.ItemStatus.ARCHIVED)
+    # another process's local tier still holding the old row
+    ad_repo.cache.set(stale)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert b">archived</span>" in response.content
+
+
+def test_ad_detail_view_serves_current_cached_copy(client, test_user_ad):
+    url = reverse('ad_detail', args=[test_user_ad.id])
+    client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert b"Test Ad" in response.content
+    ad_queries = [query["sql"] for query in queries if '"ad"' in query["sql"]]
+    assert len(ad_queries) == 1
+    assert 'MAX("ad"."updated_at")' in ad_queries[0]
+
+
+def test_ad_list_view_conditional_get(client, ad_repo, user):
+    url = reverse('ad_list') + '?category=toys'
+    etag = client.get(url).headers["ETag"]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    created = ad_repo.create(ad_domain.Ad(
+        user_id=user.id,
+        title="Conditional Item",
+        owner_username=user.username,
+        description="Changes the listing validator",
+    ))
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+    etag = response.headers["ETag"]
+    ad_repo.delete(created.id)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
 def test_ad_detail_view_not_found(client):
     non_existent_id = UUID('00000000-0000-0000-0000-000000000999')
     url = reverse('ad_detail', args=[non_existent_id])
@@ -268,3 +363,11 @@ def test_complete_ad_journey(authenticated_client, user, ad_repo):
 
     detail_response = authenticated_client.get(detail_url)
     assert detail_response.status_code == 404
+
+
+def test_ad_suggest_view(client, test_user_ad):
+    url = reverse('ad_suggest')
+    response = client.get(url, {'q': 'Test Add'})
+
+    assert response.status_code == 200
+    assert "Test Ad" in response.json()["suggestions"]
@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from src.core.infrastructure import metrics
+from src.core.infrastructure.database.models import User
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def budgets(**overrides):
+    return override_settings(INSTRUMENTATION={**settings.INSTRUMENTATION, **overrides})
+
+
+def test_metrics_aggregate_per_url_name(authenticated_client, user):
+    profile_url = reverse('profile', args=[user.username])
+    authenticated_client.get(profile_url)
+    authenticated_client.get(profile_url)
+
+    with budgets(METRICS_TOKEN='scrape-token'):
+        response = authenticated_client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-token'
+        )
+    body = response.content.decode()
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    assert 'barter_request_duration_seconds_count{view="profile"} 2' in body
+    assert 'barter_request_db_queries_bucket{view="profile",le="0"} 0' in body
+    assert 'barter_request_template_duration_seconds_count{view="profile"} 2' in body
+    assert 'view="metrics"' not in body
+
+
+def test_request_over_budget_is_logged_with_sql(authenticated_client, user, caplog):
+    with budgets(MAX_QUERIES=1), caplog.at_level(logging.WARNING, logger='src.core.middleware'):
+        authenticated_client.get(reverse('profile', args=[user.username]))
+
+    assert 'over budget' in caplog.text
+    assert 'queries > 1' in caplog.text
+    assert 'SELECT' in caplog.text
+    assert 'barter_requests_over_budget_total{view="profile"} 1' in metrics.render_metrics()
+
+
+def test_metrics_token(client):
+    with budgets(METRICS_TOKEN='scrape-token'):
+        assert client.get(reverse('metrics')).status_code == 401
+        response = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-token')
+        assert response.status_code == 200
+        assert client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong-token'
+        ).status_code == 401
+
+
+def test_metrics_denied_by_default(client):
+    with budgets(METRICS_TOKEN=''):
+        assert client.get(reverse('metrics')).status_code == 401
+        assert client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ').status_code == 401
+
+
+def test_metrics_denied_to_non_staff(authenticated_client):
+    with budgets(METRICS_TOKEN=''):
+        assert authenticated_client.get(reverse('metrics')).status_code == 403
+
+
+def test_metrics_served_to_staff(client):
+    staff = User.objects.create_user(username='metrics_staff', password='password', is_staff=True)
+    client.force_login(staff)
+    try:
+        with budgets(METRICS_TOKEN=''):
+            assert client.get(reverse('metrics')).status_code == 200
+    finally:
+        staff.delete()
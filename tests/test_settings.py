@@ -12,6 +12,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'src.apps.ads.infrastructure.django_conf.apps.AdsConfig',
     'src.apps.exchanges.infrastructure.django_conf.apps.ExchangesConfig',
@@ -20,7 +21,13 @@ INSTALLED_APPS = [
 
 AUTH_USER_MODEL = 'user.User'
 
+AD_IMAGES = {
+    'ASYNC': False,
+}
+
 
+# Connection reuse follows the same DB_CONN_MAX_AGE and DB_POOL switches as
+# production, so benchmarks can compare them; tests default to no reuse.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -29,9 +36,19 @@ DATABASES = {
         'PASSWORD': env('POSTGRES_TEST_PASSWORD'),
         'HOST': env('POSTGRES_TEST_HOST'),
         'PORT': env('POSTGRES_TEST_PORT'),
+        'CONN_MAX_AGE': 0 if DB_POOL else env.int('DB_CONN_MAX_AGE', default=0),
+        'OPTIONS': DATABASES['default']['OPTIONS'],
     },
 }
 
+# A second, independent database on the same server stands in for the
+# replica, so routing is observable: rows written to the primary are not there.
+if env('POSTGRES_TEST_REPLICA_DB', default=None):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': env('POSTGRES_TEST_REPLICA_DB'),
+    }
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -1,9 +1,16 @@
 import pytest
+from asgiref.sync import async_to_sync
 from uuid6 import UUID
 from django.contrib.auth import get_user_model
+from django.db import DataError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 
 from src.apps.ads.infrastructure.database.models import Ad
 from src.apps.ads import domain as ad_domain
+from src.apps.ads.infrastructure.repository import count
+from src.apps.ads.infrastructure.repository.cache import LocalAdCache
+from src.apps.ads.infrastructure.repository.count import AdCounter, CountResult
+from src.core.infrastructure.exceptions import NotFoundError
 
 
 def test_save_and_get_ad(user, ad_repo):
@@ -270,4 +277,285 @@ def test_repo_search(user, ad_repo):
 
     assert all(ad.category == ad_domain.ItemCategory.ELECTRONICS for ad in specific_results)
     assert all(ad.condition == ad_domain.ItemCondition.USED for ad in specific_results)
-    assert all(ad.status == ad_domain.ItemStatus.ACTIVE for ad in specific_results)
\ No newline at end of file
+    assert all(ad.status == ad_domain.ItemStatus.ACTIVE for ad in specific_results)
+
+def test_repo_search_modes(user, ad_repo):
+    ad_repo.create(ad_domain.Ad(
+        user_id=user.id,
+        title="Mechanical Keyboard",
+        owner_username=user.username,
+        description="Keyboard with brown switches",
+        category=ad_domain.ItemCategory.ELECTRONICS,
+        condition=ad_domain.ItemCondition.USED,
+        status=ad_domain.ItemStatus.ACTIVE
+    ))
+
+    ad_repo.create(ad_domain.Ad(
+        user_id=user.id,
+        title="Desk Lamp",
+        owner_username=user.username,
+        description="Lamp that fits next to a mechanical keyboard",
+        category=ad_domain.ItemCategory.HOME,
+        condition=ad_domain.ItemCondition.NEW,
+        status=ad_domain.ItemStatus.ACTIVE
+    ))
+
+    ranked_results = list(ad_repo.search(
+        category=None,
+        condition=None,
+        status=None,
+        keyword="mechanical keyboard",
+        search_mode=ad_domain.SearchMode.RANKED.value,
+    ))
+
+    titles = [ad.title for ad in ranked_results]
+    assert "Mechanical Keyboard" in titles
+    assert "Desk Lamp" in titles
+    assert titles.index("Mechanical Keyboard") < titles.index("Desk Lamp")
+
+    prefix_results = ad_repo.search(
+        category=None,
+        condition=None,
+        status=None,
+        keyword="keyb",
+        search_mode=ad_domain.SearchMode.PREFIX.value,
+    )
+
+    assert "Mechanical Keyboard" in [ad.title for ad in prefix_results]
+
+    phrase_results = ad_repo.search(
+        category=None,
+        condition=None,
+        status=None,
+        keyword="brown switches",
+        search_mode=ad_domain.SearchMode.PHRASE.value,
+    )
+
+    assert [ad.title for ad in phrase_results] == ["Mechanical Keyboard"]
+
+    reversed_phrase_results = ad_repo.search(
+        category=None,
+        condition=None,
+        status=None,
+        keyword="switches brown",
+        search_mode=ad_domain.SearchMode.PHRASE.value,
+    )
+
+    assert "Mechanical Keyboard" not in [ad.title for ad in reversed_phrase_results]
+
+
+def test_repo_fuzzy_search_and_suggestions(user, ad_repo):
+    ad_repo.create(ad_domain.Ad(
+        user_id=user.id,
+        title="Vintage Typewriter",
+        owner_username=user.username,
+        description="Works fine, new ribbon",
+        category=ad_domain.ItemCategory.OTHER,
+        condition=ad_domain.ItemCondition.USED,
+        status=ad_domain.ItemStatus.ACTIVE
+    ))
+
+    fuzzy_results = ad_repo.search(
+        category=None,
+        condition=None,
+        status=None,
+        keyword="typewritter",
+        search_mode=ad_domain.SearchMode.FUZZY.value,
+    )
+
+    assert "Vintage Typewriter" in [ad.title for ad in fuzzy_results]
+
+    suggestions = ad_repo.suggest_titles("typewritter")
+
+    assert "Vintage Typewriter" in suggestions
+    assert len(suggestions) == len(set(suggestions))
+
+
+def test_ad_counter_exact_and_invalidated_on_write(user, ad_repo):
+    owner = get_user_model().objects.create_user(username="countuser", password="password")
+    filter_key = ("countuser",)
+
+    def owner_ads():
+        return ad_repo.search(
+            category=None, condition=None, status=None, keyword=None, user_id=owner.id
+        )
+
+    assert AdCounter.count(owner_ads(), filter_key) == CountResult(0)
+
+    ad_repo.create(ad_domain.Ad(
+        user_id=owner.id,
+        title="Counted Ad",
+        owner_username=owner.username,
+        description="Counted exactly",
+    ))
+
+    assert AdCounter.count(owner_ads(), filter_key) == CountResult(1)
+
+
+def test_ad_counter_estimates_large_results(user, ad_repo, monkeypatch):
+    for index in range(3):
+        ad_repo.create(ad_domain.Ad(
+            user_id=user.id,
+            title=f"Estimated Ad {index}",
+            owner_username=user.username,
+            description="Counted by the planner",
+        ))
+
+    monkeypatch.setattr(count, "EXACT_COUNT_LIMIT", 1)
+
+    result = AdCounter.count(
+        ad_repo.search(category=None, condition=None, status=None, keyword=None),
+        filter_key=("estimate",),
+    )
+
+    assert result.approximate
+    assert result.value >= 2
+
+
+def test_find_by_id_served_from_cache(test_user_ad, ad_repo):
+    ad_repo.find_by_id(test_user_ad.id)
+
+    with CaptureQueriesContext(connection) as queries:
+        cached_ad = ad_repo.find_by_id(test_user_ad.id)
+
+    assert cached_ad.title == test_user_ad.title
+    assert len(queries) == 0
+
+    with CaptureQueriesContext(connection) as queries:
+        ad_repo.find_by_id(test_user_ad.id, use_cache=False)
+
+    assert len(queries) == 1
+
+
+def test_async_find_by_id_and_user_ads(test_user_ad, ad_repo):
+    ad_repo.cache.delete(test_user_ad.id)
+
+    ad = async_to_sync(ad_repo.afind_by_id)(test_user_ad.id, use_cache=False)
+    user_ads = async_to_sync(ad_repo.afind_user_ads)(test_user_ad.user_id)
+
+    assert ad.title == test_user_ad.title
+    assert ad.owner_username == test_user_ad.owner_username
+    assert test_user_ad.id in [user_ad.id for user_ad in user_ads]
+    assert async_to_sync(ad_repo.afind_by_id)(UUID('00000000-0000-0000-0000-000000000999')) is None
+
+    # the async read fills the cache like the sync one
+    with CaptureQueriesContext(connection) as queries:
+        assert async_to_sync(ad_repo.afind_by_id)(test_user_ad.id).id == test_user_ad.id
+    assert len(queries) == 0
+
+
+def test_cache_invalidated_on_update_and_delete(test_user_ad, ad_repo):
+    ad = ad_repo.find_by_id(test_user_ad.id)
+    ad.title = "Renamed Ad"
+
+    # mutating a returned entity must not leak into the cache
+    assert ad_repo.find_by_id(test_user_ad.id).title == "Test Ad"
+
+    ad_repo.update(ad)
+    assert ad_repo.find_by_id(test_user_ad.id).title == "Renamed Ad"
+
+    ad_repo.delete(test_user_ad.id)
+    assert ad_repo.find_by_id(test_user_ad.id) is None
+
+
+def test_last_modified_cached_until_write(test_user_ad, ad_repo):
+    last_modified = ad_repo.last_modified(user_id=test_user_ad.user_id)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert ad_repo.last_modified(user_id=test_user_ad.user_id) == last_modified
+    assert len(queries) == 0
+
+    ad = ad_repo.find_by_id(test_user_ad.id, use_cache=False)
+    ad.title = "Touched Ad"
+    updated_ad = ad_repo.update(ad, fields=("title",))
+
+    assert ad_repo.last_modified(user_id=test_user_ad.user_id) == updated_ad.updated_at
+
+
+def test_lock_for_update_locks_only_the_ad_row(test_user_ad, ad_repo):
+    with transaction.atomic():
+        with CaptureQueriesContext(connection) as queries:
+            ad = ad_repo.lock_for_update(test_user_ad.id)
+
+        assert ad.owner_username == test_user_ad.owner_username
+        assert len(queries) == 1
+        assert 'FOR UPDATE OF "ad"' in queries[0]["sql"]
+
+        assert ad_repo.lock_for_update(UUID('00000000-0000-0000-0000-000000000999')) is None
+
+
+def test_update_with_fields_leaves_other_columns(test_user_ad, ad_repo):
+    ad = ad_repo.find_by_id(test_user_ad.id, use_cache=False)
+    # rendered by the image worker after ``ad`` was read
+    Ad.objects.filter(id=ad.id).update(thumbnail_url="https://example.com/thumb.jpg")
+
+    ad.title = "Renamed Ad"
+    updated_ad = ad_repo.update(ad, fields=("title",))
+
+    stored_ad = ad_repo.find_by_id(ad.id, use_cache=False)
+    assert stored_ad.title == "Renamed Ad"
+    assert stored_ad.thumbnail_url == "https://example.com/thumb.jpg"
+    assert stored_ad.updated_at == updated_ad.updated_at
+
+
+def test_update_missing_ad_raises_not_found(user, ad_repo):
+    ad = ad_domain.Ad(user_id=user.id, title="Never saved", description="")
+
+    with pytest.raises(NotFoundError):
+        ad_repo.update(ad)
+
+
+def test_update_propagates_database_errors(test_user_ad, ad_repo):
+    ad = ad_repo.find_by_id(test_user_ad.id, use_cache=False)
+    ad.title = "x" * 201
+
+    with pytest.raises(DataError), transaction.atomic():
+        ad_repo.update(ad)
+
+
+def test_local_ad_cache_evicts_and_expires(user):
+    local_cache = LocalAdCache(maxsize=2, ttl=60)
+    ads = [
+        ad_domain.Ad(user_id=user.id, title=f"Cached {index}", description="")
+        for index in range(3)
+    ]
+
+    for ad in ads:
+        local_cache.set(ad)
+
+    assert local_cache.get(ads[0].id) is None
+    assert local_cache.get(ads[2].id).title == "Cached 2"
+
+    expired_cache = LocalAdCache(maxsize=2, ttl=0)
+    expired_cache.set(ads[0])
+    assert expired_cache.get(ads[0].id) is None
+
+
+def test_writes_cost_a_single_query(user, ad_repo):
+    ad = ad_domain.Ad(
+        user_id=user.id,
+        title="Single Trip Ad",
+        owner_username=user.username,
+        description="Written without a re-read",
+        category=ad_domain.ItemCategory.GAMES,
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        created_ad = ad_repo.create(ad)
+
+    assert len(queries) == 1
+    assert created_ad.owner_username == user.username
+    assert created_ad.category == ad_domain.ItemCategory.GAMES
+
+    created_ad.title = "Single Trip Ad Renamed"
+
+    with CaptureQueriesContext(connection) as queries:
+        updated_ad = ad_repo.update(created_ad)
+
+    assert len(queries) == 1
+    assert updated_ad.updated_at >= created_ad.created_at
+
+    stored_ad = ad_repo.find_by_id(created_ad.id, use_cache=False)
+    assert stored_ad.title == "Single Trip Ad Renamed"
+    assert stored_ad.created_at == created_ad.created_at
+    assert stored_ad.updated_at == updated_ad.updated_at
@@ -1,6 +1,12 @@
+import pytest
+from asgiref.sync import async_to_sync
 from uuid import UUID
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from src.apps.ads import domain as ad_domain
 from src.apps.exchanges import domain as exchange_domain
+from src.core.infrastructure.exceptions import NotFoundError
 
 
 def test_exchange_repo_create_and_find(exchange_repo, ad_repo, user):
@@ -54,6 +60,21 @@ def test_exchange_repo_find_nonexistent(exchange_repo):
     assert result is None
 
 
+def test_exchange_repo_async_reads(exchange_repo, sample_exchange, test_user_ad):
+    exchange = async_to_sync(exchange_repo.afind_by_id)(sample_exchange.id)
+    assert exchange.id == sample_exchange.id
+    assert exchange.status == sample_exchange.status
+
+    proposals = async_to_sync(exchange_repo.afind_user_proposals)(test_user_ad.user_id)
+    assert [p.id for p in proposals] == [
+        p.id for p in exchange_repo.find_user_proposals(test_user_ad.user_id)
+    ]
+    assert sample_exchange.id in [p.id for p in proposals]
+
+    non_existent_id = UUID('00000000-0000-0000-0000-000000000999')
+    assert async_to_sync(exchange_repo.afind_by_id)(non_existent_id) is None
+
+
 def test_exchange_repo_delete_nonexistent(exchange_repo):
     non_existent_id = UUID('00000000-0000-0000-0000-000000000999')
     result = exchange_repo.delete(non_existent_id)
@@ -136,4 +157,28 @@ def test_exchange_repo_update_status(exchange_repo, ad_repo, user):
     assert updated_exchange.status == exchange_domain.ExchangeStatus.ACCEPTED
 
     found_exchange = exchange_repo.find_by_id(saved_exchange.id)
-    assert found_exchange.status == exchange_domain.ExchangeStatus.ACCEPTED
\ No newline at end of file
+    assert found_exchange.status == exchange_domain.ExchangeStatus.ACCEPTED
+
+def test_exchange_repo_update_status_single_query(exchange_repo, sample_exchange):
+    sample_exchange.status = exchange_domain.ExchangeStatus.REJECTED
+
+    with CaptureQueriesContext(connection) as queries:
+        updated_exchange = exchange_repo.update_status(sample_exchange)
+
+    assert len(queries) == 1
+    assert updated_exchange.status == exchange_domain.ExchangeStatus.REJECTED
+
+    found_exchange = exchange_repo.find_by_id(sample_exchange.id)
+    assert found_exchange.status == exchange_domain.ExchangeStatus.REJECTED
+    assert found_exchange.created_at == sample_exchange.created_at
+
+
+def test_exchange_repo_update_status_nonexistent(exchange_repo):
+    exchange = exchange_domain.Exchange(
+        id=UUID('00000000-0000-0000-0000-000000000999'),
+        ad_sender_id=UUID('00000000-0000-0000-0000-000000000001'),
+        ad_receiver_id=UUID('00000000-0000-0000-0000-000000000002'),
+    )
+
+    with pytest.raises(NotFoundError):
+        exchange_repo.update_status(exchange)
@@ -0,0 +1,93 @@
+import pytest
+from uuid6 import uuid7
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.ads import domain as ad_domain
+from src.apps.ads.application.dto.ad import UpdateAdDTO
+from src.apps.exchanges import domain as exchange_domain
+from src.apps.exchanges.application.dto.exchange import UpdateExchangeStatusDTO
+from src.apps.exchanges.infrastructure.database.models import ExchangeInbox
+from src.apps.exchanges.infrastructure.repository.inbox_repo import InboxRepository
+from src.core.infrastructure.database.models import User
+
+
+@pytest.fixture
+def trade(ad_repo, exchange_repo):
+    sender, receiver = (
+        User.objects.create_user(username=f"inbox_{uuid7().hex[-12:]}", password="password")
+        for _ in range(2)
+    )
+    sender_ad = ad_repo.create(ad_domain.Ad(
+        user_id=sender.id,
+        title="Inbox Sender Ad",
+        owner_username=sender.username,
+        description="Offered item",
+    ))
+    receiver_ad = ad_repo.create(ad_domain.Ad(
+        user_id=receiver.id,
+        title="Inbox Receiver Ad",
+        owner_username=receiver.username,
+        description="Wanted item",
+    ))
+    exchange = exchange_repo.create(exchange_domain.Exchange(
+        ad_sender_id=sender_ad.id,
+        ad_receiver_id=receiver_ad.id,
+        comment="Inbox proposal"
+    ))
+    return sender, receiver, receiver_ad, exchange
+
+
+def test_inbox_entries_written_with_exchange(trade):
+    sender, receiver, _, exchange = trade
+
+    sent = InboxRepository.filter(sender.id, direction="sent")
+    received = InboxRepository.filter(receiver.id, direction="received")
+
+    assert [e.id for e in sent] == [exchange.id]
+    assert [e.id for e in received] == [exchange.id]
+    assert sent[0].sender_item == "Inbox Sender Ad"
+    assert sent[0].receiver_item == "Inbox Receiver Ad"
+    assert sent[0].receiver_username == receiver.username
+    assert InboxRepository.filter(sender.id, direction="received") == []
+
+
+def test_inbox_listing_is_one_query(trade):
+    sender, _, _, exchange = trade
+
+    with CaptureQueriesContext(connection) as queries:
+        entries = InboxRepository.filter(sender.id, statuses=["pending"])
+
+    assert len(queries) == 1
+    assert [e.id for e in entries] == [exchange.id]
+
+
+def test_inbox_follows_status_and_title_changes(trade, ad_service, exchange_service):
+    _, receiver, receiver_ad, exchange = trade
+
+    exchange_service.update_proposal_status(UpdateExchangeStatusDTO(
+        exchange_id=exchange.id,
+        user_id=receiver.id,
+        status=exchange_domain.ExchangeStatus.REJECTED
+    ))
+    ad_service.update_ad(UpdateAdDTO(
+        ad_id=receiver_ad.id,
+        user_id=receiver.id,
+        title="Renamed Receiver Ad"
+    ))
+
+    entry = InboxRepository.filter(receiver.id)[0]
+    assert entry.status == exchange_domain.ExchangeStatus.REJECTED.value
+    assert entry.receiver_item == "Renamed Receiver Ad"
+
+
+def test_inbox_rebuild(trade):
+    sender, _, _, exchange = trade
+
+    ExchangeInbox.objects.filter(exchange_id=exchange.id).delete()
+    assert InboxRepository.filter(sender.id) == []
+
+    InboxRepository.rebuild(user_id=sender.id)
+
+    assert [e.id for e in InboxRepository.filter(sender.id)] == [exchange.id]
+    assert ExchangeInbox.objects.filter(exchange_id=exchange.id).count() == 2
@@ -0,0 +1,140 @@
+import pytest
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.ads import domain as ad_domain
+from src.apps.ads.infrastructure.repository.ad_repo import AdRepository
+from src.apps.exchanges.infrastructure.database.models import Exchange
+from src.core.infrastructure.database import seed
+from src.core.infrastructure.database.models import User
+
+PLAN_ADS = 10_000
+
+
+@pytest.fixture(scope="module")
+def planned_ads():
+    """
+    Seeded, analyzed rows so the plans are the ones default planner
+    settings pick at a realistic size; on a near-empty table a seq scan
+    wins everywhere. VACUUM also flushes the GIN pending lists the COPY
+    filled, which the planner would otherwise price into every GIN scan.
+    """
+    seed.generate(seed.SeedPlan.for_ads(PLAN_ADS))
+    with connection.cursor() as cursor:
+        for table in ("ad", "exchange", '"user"'):
+            cursor.execute(f"VACUUM ANALYZE {table}")
+
+    # the first seeded user owns the most ads
+    yield User.objects.get(username=f"{seed.PREFIX}0")
+
+    seed.clear()
+
+
+def explain_repository_call(call):
+    """Plan of the single query ``call`` runs."""
+    with CaptureQueriesContext(connection) as captured:
+        call()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {captured[0]['sql']}")
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+def assert_uses_index(queryset, index, table="ad"):
+    assert_plan_uses_index(queryset.explain(), index, table)
+
+
+def assert_plan_uses_index(plan, index, table="ad"):
+    assert f"Seq Scan on {table} " not in plan, plan
+    assert index in plan, plan
+
+
+def test_active_listing_uses_index(planned_ads):
+    queryset = AdRepository.search(
+        keyword=None,
+        category=None,
+        condition=None,
+        status=ad_domain.ItemStatus.ACTIVE.value,
+    )
+
+    assert_uses_index(AdRepository.seek(queryset)[:12], "ad_active_created_idx")
+
+
+def test_category_listing_uses_index(planned_ads):
+    queryset = AdRepository.search(
+        keyword=None,
+        category=ad_domain.ItemCategory.BOOKS.value,
+        condition=None,
+        status=ad_domain.ItemStatus.TRADED.value,
+    )
+
+    assert_uses_index(queryset[:12], "ad_status_category_created_idx")
+
+
+def test_user_ads_use_index(planned_ads):
+    queryset = AdRepository.search(
+        keyword=None, category=None, condition=None, status=None, user_id=planned_ads.id
+    )
+
+    assert_uses_index(queryset[:12], "ad_user_created_idx")
+
+
+def test_keyword_search_uses_index(planned_ads):
+    queryset = AdRepository.search(
+        keyword="telescope",
+        category=None,
+        condition=None,
+        status=ad_domain.ItemStatus.ACTIVE.value,
+    )
+
+    assert_uses_index(queryset[:12], "ad_search_vector_gin")
+
+
+def test_fuzzy_search_uses_index(planned_ads):
+    queryset = AdRepository.search(
+        keyword="telescpoe",
+        category=None,
+        condition=None,
+        status=ad_domain.ItemStatus.ACTIVE.value,
+        search_mode=str(ad_domain.SearchMode.FUZZY),
+    )
+
+    assert_uses_index(queryset[:12], "ad_title_trgm_gin")
+
+
+def test_user_last_modified_uses_covering_index(planned_ads):
+    plan = explain_repository_call(
+        lambda: AdRepository.last_modified(user_id=planned_ads.id, use_cache=False)
+    )
+
+    assert_plan_uses_index(plan, "Index Only Scan Backward using ad_user_updated_idx")
+
+
+def test_ad_last_modified_uses_covering_index(planned_ads):
+    ad = AdRepository.find_user_ads(user_id=planned_ads.id, limit=1)[0]
+    plan = explain_repository_call(
+        lambda: AdRepository.last_modified(ad_id=ad.id, use_cache=False)
+    )
+
+    assert_plan_uses_index(plan, "Index Only Scan using ad_id_updated_covering_idx")
+
+
+def test_exchange_direction_queries_use_index(planned_ads):
+    def busiest(column):
+        return (
+            Exchange.objects.values(column)
+            .annotate(proposals=Count("id"))
+            .order_by("-proposals")
+            .values_list(column, flat=True)
+            .first()
+        )
+
+    received = Exchange.objects.filter(
+        ad_receiver_id=busiest("ad_receiver_id"), status="pending"
+    ).order_by("-created_at")
+    sent = Exchange.objects.filter(
+        ad_sender_id=busiest("ad_sender_id"), status="pending"
+    ).order_by("-created_at")
+
+    assert_uses_index(received, "exchange_receiver_status_idx", table="exchange")
+    assert_uses_index(sent, "exchange_sender_status_idx", table="exchange")
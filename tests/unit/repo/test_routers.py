@@ -0,0 +1,124 @@
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from uuid6 import uuid7
+
+from src.apps.ads import domain
+from src.apps.ads.infrastructure.database.models import Ad
+from src.core.infrastructure.database import routers
+from src.core.infrastructure.database.models import User
+from src.core.middleware import PIN_COOKIE_NAME, ReplicaPinningMiddleware
+
+
+@pytest.fixture
+def replica_alias(monkeypatch):
+    if routers.REPLICA_DB_ALIAS not in settings.DATABASES:
+        monkeypatch.setitem(
+            settings.DATABASES, routers.REPLICA_DB_ALIAS, settings.DATABASES["default"]
+        )
+    monkeypatch.setattr(settings, "REPLICA_PIN_SECONDS", 0)
+
+
+def new_user():
+    return User.objects.create_user(username=f"router_{uuid7().hex[-12:]}", password="password")
+
+
+def test_reads_leave_replica_after_write(replica_alias):
+    with routers.request_scope():
+        assert routers.read_db() == routers.REPLICA_DB_ALIAS
+
+        new_user()
+
+        assert routers.has_written()
+        assert routers.read_db() == "default"
+
+    with routers.request_scope(pinned=True):
+        assert routers.read_db() == "default"
+
+    # other clients keep reading the replica
+    with routers.request_scope():
+        assert routers.read_db() == routers.REPLICA_DB_ALIAS
+
+
+def test_reads_stay_on_primary_in_transactions(replica_alias):
+    with routers.request_scope():
+        with transaction.atomic():
+            assert routers.read_db() == "default"
+
+
+def test_middleware_pins_clients_that_wrote(replica_alias):
+    def write(request):
+        new_user()
+        return HttpResponse()
+
+    factory = RequestFactory()
+
+    response = ReplicaPinningMiddleware(write)(factory.post("/"))
+    assert PIN_COOKIE_NAME in response.cookies
+
+    response = ReplicaPinningMiddleware(lambda request: HttpResponse())(factory.get("/"))
+    assert PIN_COOKIE_NAME not in response.cookies
+
+
+def test_async_middleware_pins_clients_that_wrote(replica_alias):
+    async def write(request):
+        await sync_to_async(new_user)()
+        return HttpResponse()
+
+    async def read(request):
+        return HttpResponse()
+
+    factory = RequestFactory()
+
+    # async_to_sync keeps the ORM call on this thread and its test transaction
+    response = async_to_sync(ReplicaPinningMiddleware(write))(factory.post("/"))
+    assert PIN_COOKIE_NAME in response.cookies
+
+    response = async_to_sync(ReplicaPinningMiddleware(read))(factory.get("/"))
+    assert PIN_COOKIE_NAME not in response.cookies
+
+
+@pytest.fixture(scope="module")
+def replica_tables():
+    if routers.REPLICA_DB_ALIAS not in settings.DATABASES:
+        pytest.skip("POSTGRES_TEST_REPLICA_DB is not set")
+
+    replica = connections[routers.REPLICA_DB_ALIAS]
+    with replica.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with replica.schema_editor() as schema_editor:
+        schema_editor.create_model(User)
+        schema_editor.create_model(Ad)
+
+    yield
+
+    with replica.schema_editor() as schema_editor:
+        schema_editor.delete_model(Ad)
+        schema_editor.delete_model(User)
+
+
+def test_search_reads_replica_until_request_writes(replica_tables, ad_repo, monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_PIN_SECONDS", 0)
+    owner = new_user()
+
+    def create_ad(title):
+        return ad_repo.create(domain.Ad(
+            user_id=owner.id,
+            title=title,
+            owner_username=owner.username,
+            description="Replicated item",
+        ))
+
+    create_ad("Primary only")
+
+    with routers.request_scope():
+        # the stand-in replica never receives the primary's rows
+        assert list(ad_repo.search("", "", "", "", user_id=owner.id)) == []
+
+        created = create_ad("Read your own write")
+
+        titles = {ad.title for ad in ad_repo.search("", "", "", "", user_id=owner.id)}
+        assert titles == {"Primary only", created.title}
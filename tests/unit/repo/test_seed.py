@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.apps.ads.infrastructure.database.models import Ad
+from src.apps.exchanges.infrastructure.database.models import Exchange
+from src.core.infrastructure.database import seed
+from src.core.infrastructure.database.models import User
+
+
+@pytest.fixture
+def plan():
+    return seed.SeedPlan.for_ads(300, until=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def seeded(plan):
+    counts = seed.generate(plan)
+    yield counts
+    seed.clear()
+
+
+def seeded_ads():
+    return Ad.objects.filter(user__username__startswith=seed.PREFIX)
+
+
+def test_seed_writes_the_plan(plan, seeded):
+    assert seeded["users"] == plan.users == 30
+    assert seeded["ads"] == seeded_ads().count() == 300
+    assert Exchange.objects.filter(ad_sender__in=seeded_ads()).count() == seeded["exchanges"]
+
+    user = User.objects.get(username=f"{seed.PREFIX}0")
+    assert user.check_password(seed.PASSWORD)
+
+
+def test_seed_is_deterministic(plan, seeded):
+    ids = set(seeded_ads().values_list("id", flat=True))
+
+    seed.clear()
+    assert not seeded_ads().exists()
+    seed.generate(plan)
+
+    assert set(seeded_ads().values_list("id", flat=True)) == ids
+
+
+def test_seeded_exchanges_are_consistent(seeded):
+    exchanges = Exchange.objects.filter(ad_sender__in=seeded_ads()).select_related(
+        "ad_sender", "ad_receiver"
+    )
+
+    for exchange in exchanges:
+        assert exchange.ad_sender.user_id != exchange.ad_receiver.user_id
+        expected = "traded" if exchange.status == "accepted" else "active"
+        assert exchange.ad_sender.status == exchange.ad_receiver.status == expected
+        assert exchange.created_at >= max(exchange.ad_sender.created_at, exchange.ad_receiver.created_at)
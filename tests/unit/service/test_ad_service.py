@@ -1,11 +1,29 @@
 import pytest
+from io import BytesIO
 from uuid6 import UUID
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from src.apps.ads import domain as ad_domain
 from src.apps.ads.application.dto.ad import CreateAdDTO, UpdateAdDTO, AdFilterDTO
+from src.apps.ads.application.services.ad_service import MAX_OFFSET_PAGE
+from src.apps.ads.application.helpers import create_image_url
+from src.apps.ads.infrastructure.images.pipeline import ImagePipeline
+from src.apps.ads.infrastructure.images.storage import (
+    THUMBNAIL_SIZE,
+    storage_path,
+    thumbnail_paths,
+)
+from src.apps.ads.infrastructure.database.models import StoredImage
+from src.apps.ads.infrastructure.repository.image_repo import ImageRepository
 
 from src.core.application.exceptions import PermissionDeniedError
 from src.core.infrastructure.exceptions import NotFoundError
+from src.core.infrastructure.database.models import User
 
 
 def test_create_ad(user, ad_service):
@@ -30,6 +48,112 @@ def test_create_ad(user, ad_service):
     assert created_ad.status == ad_domain.ItemStatus.ACTIVE
 
 
+def test_create_ad_renders_thumbnails(user, ad_service, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = BytesIO()
+    Image.new("RGB", (2400, 1800), "red").save(buffer, "JPEG")
+    upload = SimpleUploadedFile("photo.JPG", buffer.getvalue(), content_type="image/jpeg")
+
+    with override_settings(MEDIA_ROOT=tmp_path, AD_IMAGES={"ASYNC": False}):
+        created_ad = ad_service.create_ad(CreateAdDTO(
+            user_id=user.id,
+            title="Photo Ad",
+            description="Has an uploaded photo",
+            image_url=create_image_url(upload),
+        ))
+        ad = ad_service.get_ad(created_ad.id)
+
+    assert ad.thumbnail_url is not None
+    assert ad.preview_url == ad.thumbnail_url
+    assert (tmp_path / storage_path(ad.thumbnail_webp_url)).exists()
+    with Image.open(tmp_path / storage_path(ad.thumbnail_url)) as thumbnail:
+        assert max(thumbnail.size) <= THUMBNAIL_SIZE[0]
+
+
+def test_update_ad_with_same_image_keeps_thumbnail(user, ad_service, tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = BytesIO()
+    Image.new("RGB", (640, 480), "green").save(buffer, "JPEG")
+
+    with override_settings(MEDIA_ROOT=tmp_path, AD_IMAGES={"ASYNC": False}):
+        created_ad = ad_service.create_ad(CreateAdDTO(
+            user_id=user.id,
+            title="Reuploaded Photo Ad",
+            description="Gets the same photo again",
+            image_url=create_image_url(SimpleUploadedFile("photo.jpg", buffer.getvalue())),
+        ))
+        thumbnail_url = ad_service.get_ad(created_ad.id).thumbnail_url
+
+        submitted = []
+        monkeypatch.setattr(ImagePipeline, "submit", lambda *args: submitted.append(args))
+        updated_ad = ad_service.update_ad(UpdateAdDTO(
+            ad_id=created_ad.id,
+            user_id=user.id,
+            image_url=create_image_url(SimpleUploadedFile("again.jpg", buffer.getvalue())),
+        ))
+
+    assert thumbnail_url is not None
+    assert updated_ad.thumbnail_url == thumbnail_url
+    assert ad_service.get_ad(created_ad.id, use_cache=False).thumbnail_url == thumbnail_url
+    assert submitted == []
+
+
+def test_create_image_url_deduplicates_content(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        first = create_image_url(SimpleUploadedFile("one.jpg", b"same bytes"))
+        second = create_image_url(SimpleUploadedFile("two.jpg", b"same bytes"))
+        other = create_image_url(SimpleUploadedFile("three.jpg", b"other bytes"))
+
+    assert first == second
+    assert other != first
+    assert len([path for path in (tmp_path / "ad_images").rglob("*") if path.is_file()]) == 2
+
+
+def test_create_image_url_names_files_by_decoded_format(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = BytesIO()
+    Image.new("RGB", (8, 8), "blue").save(buffer, "PNG")
+
+    with override_settings(MEDIA_ROOT=tmp_path):
+        jpeg = create_image_url(SimpleUploadedFile("one.jpeg", b"same bytes"))
+        jpg = create_image_url(SimpleUploadedFile("two.JPG", b"same bytes"))
+        png = create_image_url(SimpleUploadedFile("misnamed.jpg", buffer.getvalue()))
+
+    assert jpeg == jpg
+    assert jpeg.endswith(".jpg")
+    assert png.endswith(".png")
+
+
+def test_thumbnails_are_keyed_on_the_stored_name():
+    png = thumbnail_paths("ad_images/ab/cd/abcd.png")
+    gif = thumbnail_paths("ad_images/ab/cd/abcd.gif")
+
+    assert not set(png) & set(gif)
+
+
+def test_collect_images_keeps_referenced(user, ad_service, tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        kept_url = create_image_url(SimpleUploadedFile("kept.jpg", b"kept image"))
+        replaced_url = create_image_url(SimpleUploadedFile("replaced.jpg", b"replaced image"))
+        ad = ad_service.create_ad(CreateAdDTO(
+            user_id=user.id,
+            title="Collected Ad",
+            description="Image gets replaced",
+            image_url=replaced_url,
+        ))
+        ad_service.update_ad(UpdateAdDTO(ad_id=ad.id, user_id=user.id, image_url=kept_url))
+
+        assert StoredImage.objects.get(path=storage_path(kept_url)).ref_count == 1
+        assert StoredImage.objects.get(path=storage_path(replaced_url)).ref_count == 0
+
+        collected = ImageRepository.collect(older_than=timezone.now())
+
+        assert storage_path(replaced_url) in collected
+        assert storage_path(kept_url) not in collected
+        assert not default_storage.exists(storage_path(replaced_url))
+        assert default_storage.exists(storage_path(kept_url))
+
+
 def test_update_ad(user, ad_service, ad_repo):
     ad = ad_domain.Ad(
         user_id=user.id,
@@ -114,17 +238,17 @@ def test_update_ad_status(user, ad_service, ad_repo):
     assert updated_ad.title == "Test Ad"
 
 def test_delete_ad(user, ad_service, ad_repo):
-    ad = ad_domain.Ad(
+    ad_dto = CreateAdDTO(
         user_id=user.id,
+        username=user.username,
         title="Hello",
-        owner_username=user.username,
         description="Test description you",
         image_url="https://example.com/test.jpg",
-        category=ad_domain.ItemCategory.CLOTHES,
-        condition=ad_domain.ItemCondition.USED,
-        status=ad_domain.ItemStatus.ACTIVE
+        category=ad_domain.ItemCategory.CLOTHES.value,
+        condition=ad_domain.ItemCondition.USED.value,
+        status=ad_domain.ItemStatus.ACTIVE.value
     )
-    saved_ad = ad_service.create_ad(ad)
+    saved_ad = ad_service.create_ad(ad_dto)
 
     result = ad_service.delete_ad(saved_ad.id, user.id)
 
@@ -263,4 +387,158 @@ def test_list_ads_with_filters(user, ad_service, ad_repo):
         page_size=10
     )
     keyword_results = ad_service.list_ads(filter_keyword)
-    assert any("iPhone" in ad.title for ad in keyword_results)
\ No newline at end of file
+    assert any("iPhone" in ad.title for ad in keyword_results)
+
+def test_list_ads_cursor_pagination(ad_service, ad_repo):
+    owner = User.objects.create_user(username="cursoruser", password="password")
+
+    for index in range(5):
+        ad_repo.create(ad_domain.Ad(
+            user_id=owner.id,
+            title=f"Cursor Ad {index}",
+            owner_username=owner.username,
+            description="Paged with a cursor",
+            category=ad_domain.ItemCategory.OTHER,
+            condition=ad_domain.ItemCondition.USED,
+            status=ad_domain.ItemStatus.ACTIVE
+        ))
+
+    first_page = ad_service.list_ads(AdFilterDTO(page_size=2, user_id=owner.id))
+
+    assert first_page["page"] == 1
+    assert first_page["has_next"]
+    assert first_page["previous_cursor"] is None
+
+    seen = [ad.id for ad in first_page["ads"]]
+    result = first_page
+    while result["next_cursor"]:
+        result = ad_service.list_ads(
+            AdFilterDTO(page_size=2, user_id=owner.id, cursor=result["next_cursor"])
+        )
+        assert result["page"] is None
+        seen.extend(ad.id for ad in result["ads"])
+
+    expected = [ad.id for ad in ad_repo.find_user_ads(owner.id)]
+    expected.sort(reverse=True)
+    assert seen == expected
+
+    back = ad_service.list_ads(
+        AdFilterDTO(page_size=2, user_id=owner.id, cursor=result["previous_cursor"])
+    )
+    assert [ad.id for ad in back["ads"]] == expected[2:4]
+    assert back["has_next"]
+
+
+def test_list_ads_offset_page_cap_only_applies_to_keyset_modes(ad_service, ad_repo):
+    owner = User.objects.create_user(username="deeppageuser", password="password")
+    pages = MAX_OFFSET_PAGE + 2
+
+    for index in range(pages):
+        ad_repo.create(ad_domain.Ad(
+            user_id=owner.id,
+            title=f"Deep lamp {index}",
+            owner_username=owner.username,
+            description="Paged past the offset cap",
+            category=ad_domain.ItemCategory.HOME,
+            condition=ad_domain.ItemCondition.USED,
+            status=ad_domain.ItemStatus.ACTIVE
+        ))
+
+    # ranked search has no cursor links, so every page stays reachable by number
+    ranked = ad_service.list_ads(
+        AdFilterDTO(keyword="lamp", user_id=owner.id, page=pages, page_size=1)
+    )
+    assert ranked["page"] == pages
+    assert ranked["last_page"] == pages
+    assert len(ranked["ads"]) == 1
+    assert not ranked["has_next"]
+
+    listing = ad_service.list_ads(
+        AdFilterDTO(user_id=owner.id, page=pages, page_size=1)
+    )
+    assert listing["page"] == MAX_OFFSET_PAGE
+    assert listing["last_page"] == MAX_OFFSET_PAGE
+    assert listing["next_cursor"]
+
+
+def test_list_ads_ignores_malformed_cursor(user, ad_service, test_user_ad):
+    result = ad_service.list_ads(
+        AdFilterDTO(page_size=2, user_id=user.id, cursor="not-a-cursor")
+    )
+
+    assert result["page"] == 1
+
+
+def test_list_ads_query_budget(ad_service, ad_repo):
+    owner = User.objects.create_user(username="budgetuser", password="password")
+
+    for index in range(12):
+        ad_repo.create(ad_domain.Ad(
+            user_id=owner.id,
+            title=f"Budget Ad {index}",
+            owner_username=owner.username,
+            description="Listed without per-row owner lookups",
+        ))
+
+    with CaptureQueriesContext(connection) as queries:
+        result = ad_service.list_ads(AdFilterDTO(page_size=12, user_id=owner.id))
+        usernames = {ad.username for ad in result["ads"]}
+
+    assert len(result["ads"]) == 12
+    assert usernames == {"budgetuser"}
+    assert len(queries) <= 2
+
+
+def test_get_user_ads_single_query(ad_service, ad_repo):
+    owner = User.objects.create_user(username="singlequeryuser", password="password")
+
+    for index in range(3):
+        ad_repo.create(ad_domain.Ad(
+            user_id=owner.id,
+            title=f"Owned Ad {index}",
+            owner_username=owner.username,
+            description="Loaded with its owner",
+        ))
+
+    with CaptureQueriesContext(connection) as queries:
+        ads = ad_service.get_user_ads(owner.id)
+
+    assert {ad.username for ad in ads} == {"singlequeryuser"}
+    assert len(queries) == 1
+
+
+def test_list_ads_facets_single_query(ad_service, ad_repo):
+    owner = User.objects.create_user(username="facetuser", password="password")
+
+    for category, condition, status in (
+        (ad_domain.ItemCategory.BOOKS, ad_domain.ItemCondition.NEW, ad_domain.ItemStatus.ACTIVE),
+        (ad_domain.ItemCategory.BOOKS, ad_domain.ItemCondition.USED, ad_domain.ItemStatus.ACTIVE),
+        (ad_domain.ItemCategory.GAMES, ad_domain.ItemCondition.USED, ad_domain.ItemStatus.TRADED),
+    ):
+        ad_repo.create(ad_domain.Ad(
+            user_id=owner.id,
+            title="Faceted Ad",
+            owner_username=owner.username,
+            description="Counted per facet",
+            category=category,
+            condition=condition,
+            status=status,
+        ))
+
+    facet_filter = AdFilterDTO(user_id=owner.id, category="books", with_facets=True)
+
+    with CaptureQueriesContext(connection) as queries:
+        facets = ad_service.get_facets(facet_filter)
+
+    assert len(queries) == 1
+    assert facets["category"]["books"] == 2
+    assert facets["category"]["games"] == 1
+    assert facets["category"]["electronics"] == 0
+    assert facets["condition"] == {"new": 1, "used": 2}
+    assert facets["status"]["traded"] == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        assert ad_service.get_facets(facet_filter) == facets
+    assert len(queries) == 0
+
+    assert ad_service.list_ads(facet_filter)["facets"] == facets
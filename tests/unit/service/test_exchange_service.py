@@ -1,9 +1,11 @@
 from uuid6 import UUID
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from src.apps.ads import domain as ad_domain
 from src.apps.exchanges import domain as exchange_domain
-from src.apps.exchanges.application.dto.exchange import CreateExchangeDTO, UpdateExchangeStatusDTO
+from src.apps.exchanges.application.dto.exchange import CreateExchangeDTO, UpdateExchangeStatusDTO, ExchangeFilterDTO
 from src.core.application.exceptions import PermissionDeniedError
 
 from src.core.infrastructure.database.models import User
@@ -420,4 +422,125 @@ def test_get_proposals_by_ad_id(user, exchange_service, exchange_repo, ad_repo):
 
     receiver_proposals = exchange_service.get_proposals_by_receiver_ad_id(saved_ad1.id)
     assert len(receiver_proposals) == 1
-    assert receiver_proposals[0].comment == "Exchange 2 to 1"
\ No newline at end of file
+    assert receiver_proposals[0].comment == "Exchange 2 to 1"
+
+def test_accept_proposal_rejects_competing_in_constant_queries(
+    user, second_user, test_user_ad, second_user_ad, sample_exchange, ad_repo, exchange_service, exchange_repo
+):
+    other_ad = ad_repo.create(ad_domain.Ad(
+        user_id=user.id,
+        title="Another Offer",
+        owner_username=user.username,
+        description="Competing offer",
+        image_url="https://example.com/other.jpg",
+        category=ad_domain.ItemCategory.ELECTRONICS,
+        condition=ad_domain.ItemCondition.NEW,
+        status=ad_domain.ItemStatus.ACTIVE
+    ))
+    competing = exchange_repo.create(exchange_domain.Exchange(
+        ad_sender_id=other_ad.id,
+        ad_receiver_id=second_user_ad.id,
+        comment="Competing proposal"
+    ))
+
+    update_dto = UpdateExchangeStatusDTO(
+        exchange_id=sample_exchange.id,
+        user_id=second_user.id,
+        status=exchange_domain.ExchangeStatus.ACCEPTED
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        updated_exchange = exchange_service.update_proposal_status(update_dto)
+
+    assert updated_exchange.status == exchange_domain.ExchangeStatus.ACCEPTED.value
+    # Django logs BEGIN and COMMIT alongside the statements
+    statements = [query for query in queries if query["sql"] not in ("BEGIN", "COMMIT")]
+    assert len(statements) <= 8
+    assert exchange_repo.find_by_id(competing.id).status == exchange_domain.ExchangeStatus.REJECTED
+    assert ad_repo.find_by_id(other_ad.id).status == ad_domain.ItemStatus.ACTIVE
+    assert ad_repo.find_by_id(test_user_ad.id).status == ad_domain.ItemStatus.TRADED
+
+
+def test_update_resolved_proposal_denied(second_user, sample_exchange, exchange_service):
+    reject_dto = UpdateExchangeStatusDTO(
+        exchange_id=sample_exchange.id,
+        user_id=second_user.id,
+        status=exchange_domain.ExchangeStatus.REJECTED
+    )
+    exchange_service.update_proposal_status(reject_dto)
+
+    accept_dto = UpdateExchangeStatusDTO(
+        exchange_id=sample_exchange.id,
+        user_id=second_user.id,
+        status=exchange_domain.ExchangeStatus.ACCEPTED
+    )
+    with pytest.raises(PermissionDeniedError):
+        exchange_service.update_proposal_status(accept_dto)
+
+
+def test_list_user_proposals_filters_in_one_query(ad_repo, exchange_repo, exchange_service):
+    trader = User.objects.create_user(username="list_trader", password="password")
+    partner = User.objects.create_user(username="list_partner", password="password")
+    own_ad, other_ad = (
+        ad_repo.create(ad_domain.Ad(
+            user_id=owner.id,
+            title=f"{owner.username} item",
+            owner_username=owner.username,
+            description="Listed exchange item",
+        ))
+        for owner in (trader, partner)
+    )
+
+    exchange_repo.create(exchange_domain.Exchange(
+        ad_sender_id=own_ad.id,
+        ad_receiver_id=other_ad.id,
+        comment="Sent pending"
+    ))
+    exchange_repo.create(exchange_domain.Exchange(
+        ad_sender_id=own_ad.id,
+        ad_receiver_id=other_ad.id,
+        comment="Sent accepted",
+        status=exchange_domain.ExchangeStatus.ACCEPTED
+    ))
+    exchange_repo.create(exchange_domain.Exchange(
+        ad_sender_id=other_ad.id,
+        ad_receiver_id=own_ad.id,
+        comment="Received pending"
+    ))
+
+    with CaptureQueriesContext(connection) as queries:
+        sent = exchange_service.list_user_proposals(
+            ExchangeFilterDTO(user_id=trader.id, direction="sent", status="pending")
+        )
+
+    assert len(queries) == 1
+    assert [e.comment for e in sent["exchanges"]] == ["Sent pending"]
+    assert sent["exchanges"][0].sender_user_id == trader.id
+
+    received = exchange_service.list_user_proposals(
+        ExchangeFilterDTO(user_id=trader.id, direction="received")
+    )
+    assert [e.comment for e in received["exchanges"]] == ["Received pending"]
+
+
+def test_list_user_proposals_cursor_pages(user, test_user_ad, second_user_ad, exchange_repo, exchange_service):
+    for i in range(5):
+        exchange_repo.create(exchange_domain.Exchange(
+            ad_sender_id=test_user_ad.id,
+            ad_receiver_id=second_user_ad.id,
+            comment=f"Proposal {i}"
+        ))
+
+    first = exchange_service.list_user_proposals(ExchangeFilterDTO(user_id=user.id, page_size=2))
+    assert first["has_next"] and not first["has_previous"]
+
+    second = exchange_service.list_user_proposals(
+        ExchangeFilterDTO(user_id=user.id, page_size=2, cursor=first["next_cursor"])
+    )
+    assert second["has_previous"]
+    assert not {e.id for e in first["exchanges"]} & {e.id for e in second["exchanges"]}
+
+    back = exchange_service.list_user_proposals(
+        ExchangeFilterDTO(user_id=user.id, page_size=2, cursor=second["previous_cursor"])
+    )
+    assert [e.id for e in back["exchanges"]] == [e.id for e in first["exchanges"]]
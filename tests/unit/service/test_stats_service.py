@@ -0,0 +1,81 @@
+import pytest
+
+from src.apps.ads import domain as ad_domain
+from src.apps.ads.application.dto.ad import CreateAdDTO
+from src.apps.ads.infrastructure.repository.stats import USER_ADS
+from src.apps.exchanges import domain as exchange_domain
+from src.apps.exchanges.application.dto.exchange import CreateExchangeDTO, UpdateExchangeStatusDTO
+from src.core.application.services.stats_service import StatsService
+from src.core.infrastructure.database.models import User
+
+
+@pytest.fixture
+def stats_service():
+    return StatsService()
+
+
+def create_trader(username, ad_service):
+    trader = User.objects.create_user(username=username, password="password")
+    ad = ad_service.create_ad(CreateAdDTO(
+        user_id=trader.id,
+        title=f"{username} item",
+        description="Counted item",
+        category=ad_domain.ItemCategory.BOOKS.value,
+    ))
+    return trader, ad
+
+
+def test_ad_counters_follow_writes(ad_service, stats_service):
+    trader, ad = create_trader("stats_owner", ad_service)
+    ad_service.create_ad(CreateAdDTO(user_id=trader.id, title="Second item", description="Counted item"))
+
+    stats = stats_service.get_user_stats(trader.id)
+    assert stats["total_ads"] == 2
+    assert stats["ads_by_status"]["active"] == 2
+
+    ad_service.update_ad_status(ad.id, ad_domain.ItemStatus.ARCHIVED)
+    stats = stats_service.get_user_stats(trader.id)
+    assert stats["ads_by_status"] == {"active": 1, "traded": 0, "archived": 1}
+
+    ad_service.delete_ad(ad.id, trader.id)
+    assert stats_service.get_user_stats(trader.id)["total_ads"] == 1
+
+
+def test_exchange_counters_follow_accept(ad_service, exchange_service, stats_service):
+    sender, sender_ad = create_trader("stats_sender", ad_service)
+    receiver, receiver_ad = create_trader("stats_receiver", ad_service)
+    books_before = stats_service.get_facets("traded")["category"]["books"]
+
+    exchange = exchange_service.create_proposal(CreateExchangeDTO(
+        ad_sender_id=sender_ad.id,
+        ad_receiver_id=receiver_ad.id,
+        user_id=sender.id,
+    ))
+    assert stats_service.get_user_stats(receiver.id)["pending_exchanges"] == 1
+
+    exchange_service.update_proposal_status(UpdateExchangeStatusDTO(
+        exchange_id=exchange.id,
+        user_id=receiver.id,
+        status=exchange_domain.ExchangeStatus.ACCEPTED
+    ))
+
+    for trader in (sender, receiver):
+        stats = stats_service.get_user_stats(trader.id)
+        assert stats["pending_exchanges"] == 0
+        assert stats["completed_exchanges"] == 1
+        assert stats["ads_by_status"]["traded"] == 1
+
+    assert stats_service.get_facets("traded")["category"]["books"] == books_before + 2
+
+
+def test_reconcile_repairs_drift(user, test_user_ad, stats_service):
+    # ads written through the repository bypass the counters
+    key = (USER_ADS, str(user.id), "active")
+
+    drift = stats_service.reconcile(dry_run=True)
+    assert key in drift
+
+    stats_service.reconcile()
+
+    assert key not in stats_service.reconcile(dry_run=True)
+    assert stats_service.get_user_stats(user.id)["ads_by_status"]["active"] == drift[key][1]